@@ -0,0 +1,99 @@
+"""
+Per-user analyze_trends vs CohortEngine.analyze_trends_batch.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_cohort_trends --users 10000 --days 365
+
+Builds a throwaway SQLite database so mentee.db is never touched.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from flask import Flask
+from mentee import db
+from mentee.models import User, JournalEntry
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.cohort_engine import CohortEngine
+
+
+def build_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(users, days, chunk=50000):
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=days)
+    db.session.execute(User.__table__.insert(), [
+        {"id": uid, "email": f"athlete{uid}@bench.local", "name": f"Athlete {uid}"}
+        for uid in range(1, users + 1)
+    ])
+
+    batch = []
+    for uid in range(1, users + 1):
+        base = rng.uniform(4, 8)
+        for d in range(days):
+            # ~10% of days skipped, ~3% logged without a score
+            if rng.random() < 0.10:
+                continue
+            score = None if rng.random() < 0.03 else max(1, min(10, round(rng.gauss(base, 1.5))))
+            batch.append({"user_id": uid, "date": (start + timedelta(days=d)).isoformat(),
+                          "mood": "calm", "performance_score": score})
+            if len(batch) >= chunk:
+                db.session.execute(JournalEntry.__table__.insert(), batch)
+                batch.clear()
+    if batch:
+        db.session.execute(JournalEntry.__table__.insert(), batch)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--per-user-sample', type=int, default=None,
+                        help='Time the per-user path on N users and extrapolate (default: all users)')
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+    app = build_app(path)
+    try:
+        with app.app_context():
+            db.create_all()
+            t0 = time.perf_counter()
+            seed(args.users, args.days)
+            print(f"Seeded {args.users} users x {args.days} days in {time.perf_counter() - t0:.1f}s")
+
+            user_ids = list(range(1, args.users + 1))
+            sample = user_ids[:args.per_user_sample] if args.per_user_sample else user_ids
+
+            t0 = time.perf_counter()
+            per_user = {uid: PerformanceEngine.analyze_trends(uid) for uid in sample}
+            loop_s = (time.perf_counter() - t0) * len(user_ids) / len(sample)
+
+            t0 = time.perf_counter()
+            batch = CohortEngine.analyze_trends_batch(user_ids)
+            batch_s = time.perf_counter() - t0
+
+            mismatches = [uid for uid in sample if per_user[uid] != batch[uid]]
+            label = "" if len(sample) == len(user_ids) else f" (extrapolated from {len(sample)})"
+            print(f"per-user loop : {loop_s:8.2f}s{label}")
+            print(f"batch         : {batch_s:8.2f}s")
+            print(f"speedup       : {loop_s / batch_s:8.1f}x")
+            print(f"parity        : {len(sample) - len(mismatches)}/{len(sample)} identical reports")
+            if mismatches:
+                print(f"  first mismatch user {mismatches[0]}: {per_user[mismatches[0]]} != {batch[mismatches[0]]}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Concurrent end-to-end load over the journal and drill endpoints.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_load --users 200 --days 365 --concurrency 8 --requests 250
+    python -m benchmarks.bench_load --save-baseline benchmarks/baselines/load.json
+    python -m benchmarks.bench_load --compare benchmarks/baselines/load.json
+
+Seeds a throwaway SQLite database with benchmarks.synthetic, logs one test
+client per worker thread in as a different athlete, then replays a weighted
+mix of calendar / get entry / save entry / insights / drills hub / drill save
+requests. Reports p50/p95/p99 latency, throughput and SQL statements per
+request for each endpoint. Compare runs only against baselines taken with
+the same arguments on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from config import Config
+from mentee import create_app, db
+from mentee.services.schema_engine import SchemaEngine
+from benchmarks.synthetic import generate, SYNTHETIC_PASSWORD, EMAIL_DOMAIN, DRILLS
+
+# endpoint -> weight in the request mix
+MIX = {
+    "calendar_range": 25,
+    "get_entry": 25,
+    "save_entry": 15,
+    "insights": 15,
+    "drills_hub": 10,
+    "drill_save": 10,
+}
+
+
+class _SqlCounter:
+    """Counts cursor executions per thread (each worker drives its own requests)."""
+
+    def __init__(self, engine):
+        self.local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.local.n = getattr(self.local, 'n', 0) + 1
+
+    def take(self) -> int:
+        n = getattr(self.local, 'n', 0)
+        self.local.n = 0
+        return n
+
+
+def _request(client, name, rng, days):
+    day = (datetime.utcnow().date() - timedelta(days=rng.randrange(days))).isoformat()
+    if name == "calendar_range":
+        year = day[:4]
+        return client.get(f'/dashboard/api/journal/calendar/range?from={year}-01-01&to={year}-12-31')
+    if name == "get_entry":
+        return client.get(f'/dashboard/api/journal/{day}')
+    if name == "save_entry":
+        return client.post('/dashboard/api/journal', json={
+            "date": day, "mood": rng.choice(('fire', 'happy', 'calm', 'neutral', 'stressed')),
+            "score": rng.randint(1, 10), "micro_win": f"Load test win {rng.random():.6f}",
+            "reflection": "Stayed with the process under synthetic pressure.", "brain_dump_mode": False})
+    if name == "insights":
+        return client.get('/dashboard/api/performance-insights')
+    if name == "drills_hub":
+        return client.get('/dashboard/drills')
+    if name == "drill_save":
+        trials = rng.randint(20, 60)
+        return client.post('/dashboard/api/drills/save', json={
+            "drill_id": rng.choice(DRILLS), "score": rng.randint(200, 1500), "accuracy": round(rng.random(), 3),
+            "level": rng.randint(1, 10), "duration": rng.randint(30, 180),
+            "samples": {"reaction_ms": [round(rng.uniform(180, 650), 1) for _ in range(trials)],
+                        "hits": [rng.random() < 0.8 for _ in range(trials)]}})
+    raise ValueError(name)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def run(users, days, concurrency, requests, seed, warmup):
+    fd, path = tempfile.mkstemp(suffix='.db')
+    os.close(fd)
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        PAGE_CACHE_WARM = False
+
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            SchemaEngine.upgrade()
+            t0 = time.perf_counter()
+            seeded = generate(users, days, seed=seed)
+            seed_s = time.perf_counter() - t0
+            counter = _SqlCounter(db.engine)
+
+        samples = defaultdict(list)   # endpoint -> [(ms, sql, status)]
+        lock = threading.Lock()
+        start_gate = threading.Barrier(concurrency + 1)
+
+        def worker(idx):
+            rng = random.Random(seed * 1000 + idx)
+            client = app.test_client()
+            email = f"athlete{idx % users}.{seeded['tag']}@{EMAIL_DOMAIN}"
+            client.post('/auth/login', data={"email": email, "password": SYNTHETIC_PASSWORD})
+            names, weights = list(MIX), list(MIX.values())
+            for _ in range(warmup):
+                _request(client, rng.choices(names, weights)[0], rng, days)
+            counter.take()
+            start_gate.wait()
+
+            local = defaultdict(list)
+            for _ in range(requests):
+                name = rng.choices(names, weights)[0]
+                t = time.perf_counter()
+                response = _request(client, name, rng, days)
+                local[name].append(((time.perf_counter() - t) * 1000, counter.take(), response.status_code))
+            with lock:
+                for name, rows in local.items():
+                    samples[name].extend(rows)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        start_gate.wait()
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - t0
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    endpoints = {}
+    for name in MIX:
+        rows = samples.get(name, [])
+        latencies = sorted(r[0] for r in rows)
+        endpoints[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if r[2] >= 400),
+            "p50_ms": round(_percentile(latencies, 50), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "p99_ms": round(_percentile(latencies, 99), 3),
+            "sql_per_request": round(statistics.mean(r[1] for r in rows), 2) if rows else 0.0,
+            "rps": round(len(rows) / wall, 1),
+        }
+    total = sum(e["requests"] for e in endpoints.values())
+    return {
+        "meta": {"users": users, "days": days, "concurrency": concurrency, "requests_per_worker": requests,
+                 "seed": seed, "rows_seeded": sum(seeded[k] for k in ("journal_entries", "drill_sessions")),
+                 "seed_seconds": round(seed_s, 2), "python": platform.python_version(),
+                 "machine": platform.machine(), "recorded_at": datetime.utcnow().isoformat(timespec='seconds')},
+        "total": {"requests": total, "wall_seconds": round(wall, 3), "rps": round(total / wall, 1),
+                  "errors": sum(e["errors"] for e in endpoints.values())},
+        "endpoints": endpoints,
+    }
+
+
+def _delta(new, old):
+    if not old:
+        return "     n/a"
+    return f"{100 * (new - old) / old:+7.1f}%"
+
+
+def report(result, baseline=None):
+    meta, total = result["meta"], result["total"]
+    print(f"{meta['users']} users x {meta['days']} days ({meta['rows_seeded']:,} rows), "
+          f"{meta['concurrency']} workers x {meta['requests_per_worker']} requests")
+    print(f"{'endpoint':<16} {'n':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'sql/req':>8} {'rps':>8}")
+    for name, e in result["endpoints"].items():
+        print(f"{name:<16} {e['requests']:>6} {e['errors']:>4} {e['p50_ms']:>9.2f} {e['p95_ms']:>9.2f} "
+              f"{e['p99_ms']:>9.2f} {e['sql_per_request']:>8.2f} {e['rps']:>8.1f}")
+        if baseline and name in baseline["endpoints"]:
+            b = baseline["endpoints"][name]
+            print(f"{'  vs baseline':<28} {_delta(e['p50_ms'], b['p50_ms']):>9} {_delta(e['p95_ms'], b['p95_ms']):>9} "
+                  f"{_delta(e['p99_ms'], b['p99_ms']):>9} {_delta(e['sql_per_request'], b['sql_per_request']):>8} "
+                  f"{_delta(e['rps'], b['rps']):>8}")
+    print(f"{'total':<16} {total['requests']:>6} {total['errors']:>4} {'':>29} {'':>8} {total['rps']:>8.1f}")
+    if baseline:
+        print(f"{'  vs baseline':<67} {_delta(total['rps'], baseline['total']['rps']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=250, help='Timed requests per worker')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per worker')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    args = parser.parse_args()
+
+    result = run(args.users, args.days, args.concurrency, args.requests, args.seed, args.warmup)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        if {k: baseline["meta"].get(k) for k in ("users", "days", "concurrency", "requests_per_worker")} != \
+                {k: result["meta"][k] for k in ("users", "days", "concurrency", "requests_per_worker")}:
+            print("⚠️  Baseline was recorded with different arguments; deltas are not comparable.")
+    report(result, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.save_baseline) or '.', exist_ok=True)
+        with open(args.save_baseline, 'w') as fh:
+            json.dump(result, fh, indent=2)
+            fh.write('\n')
+        print(f"✅ Baseline saved to {args.save_baseline}")
+
+
+if __name__ == '__main__':
+    main()
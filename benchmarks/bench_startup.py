@@ -0,0 +1,58 @@
+"""
+Worker boot cost: import time, create_app() and time-to-first-request.
+
+Usage (from the repo root):
+    python -m benchmarks.bench_startup --runs 7
+
+Each run is a fresh interpreter (like a gunicorn worker boot) that times
+`import mentee`, `create_app()`, then the first GET of every --url through
+the test client. Reports the median and worst run in milliseconds.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import mentee
+t1 = time.perf_counter()
+app = mentee.create_app()
+t2 = time.perf_counter()
+client = app.test_client()
+timings = {"import": t1 - t0, "create_app": t2 - t1}
+for url in sys.argv[1:]:
+    t = time.perf_counter()
+    status = client.get(url).status_code
+    timings[f"first GET {url} ({status})"] = time.perf_counter() - t
+timings["total"] = time.perf_counter() - t0
+print(json.dumps(timings))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--url', action='append', dest='urls',
+                        help='URL to request after boot (repeatable; default: / and /dashboard/articles)')
+    args = parser.parse_args()
+    urls = args.urls or ['/', '/dashboard/articles']
+
+    # One untimed run so every run sees warm .pyc files and OS page cache
+    subprocess.run([sys.executable, '-c', CHILD, *urls], check=True, capture_output=True)
+
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, '-c', CHILD, *urls], check=True, capture_output=True, text=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'phase':<40} {'median ms':>10} {'max ms':>10}")
+    for phase in runs[0]:
+        values = [r[phase] * 1000 for r in runs]
+        print(f"{phase:<40} {statistics.median(values):10.1f} {max(values):10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Synthetic athletes: N users x M days of journal entries, drill sessions and identities.
+
+Usage (from the repo root, against the configured DATABASE_URL):
+    python init_db.py
+    python -m benchmarks.synthetic --users 1000 --days 365
+
+Every user logs in with password SYNTHETIC_PASSWORD. Distributions are seeded
+(--seed) so two runs with the same arguments produce the same rows:
+  - journaling habit: a per-user two-state Markov chain, so streaks and lapses cluster
+  - scores: per-user baseline + slow random walk + daily noise, clipped to 1-10
+  - moods follow the score; ~3% of entries are logged without a score
+  - drills: 1-3 favourite drills per user, Poisson sessions/day, log-shaped skill curve
+  - identities: ~80% of users, 1-3 traits
+Rows go in with Core bulk inserts; rollups and personal bests are rebuilt afterwards.
+"""
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+from mentee import db
+from mentee.models import User, UserIdentity, JournalEntry, DrillSession
+from mentee.services.journal_engine import _TRAIT_PROMPTS
+from mentee.services.rollup_engine import RollupEngine
+from mentee.services.leaderboard_engine import LeaderboardEngine
+
+SYNTHETIC_PASSWORD = 'synthetic'
+EMAIL_DOMAIN = 'synthetic.local'
+
+DRILLS = ('reaction', 'memory', 'vision', 'focus', 'pattern', 'decision')
+ARCHETYPES = ('The Relentless Architect', 'The Calm Assassin', 'The Comeback Engine', 'The Silent Grinder')
+MOOD_BY_SCORE = ((9, 'fire'), (7, 'happy'), (6, 'calm'), (4, 'neutral'), (0, 'stressed'))
+WINS = ('Held my breathing pattern on the last set', 'Stayed on process after the early miss',
+        'Won the first exchange cleanly', 'Finished the visualisation block', 'Kept my routine under time pressure')
+REFLECTIONS = ('Rushed the transition again when tired.', 'Self-talk slipped after the second mistake.',
+               'Need a reset cue before high-pressure points.', 'Sleep was short and focus faded late.',
+               'Good composure, but decision speed dropped in the final minutes.')
+
+
+def _mood(score, rng):
+    if score is None or rng.random() < 0.15:
+        return rng.choice(JournalEntry.MOODS)
+    return next(mood for floor, mood in MOOD_BY_SCORE if score >= floor)
+
+
+def _poisson(lam, rng):
+    # Knuth; lambdas here stay small
+    limit, k, p = math.exp(-lam), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _flush(table, rows):
+    if rows:
+        db.session.execute(table.insert(), rows)
+        rows.clear()
+
+
+def generate(users: int, days: int, seed: int = 42, chunk: int = 20000, end_date=None) -> dict:
+    """Inserts the synthetic cohort in the current app context. Returns row counts and user ids."""
+    rng = random.Random(seed)
+    end = end_date or datetime.utcnow().date()
+    start = end - timedelta(days=days - 1)
+    tag = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    password = generate_password_hash(SYNTHETIC_PASSWORD)
+
+    db.session.execute(User.__table__.insert(), [
+        {"email": f"athlete{i}.{tag}@{EMAIL_DOMAIN}", "name": f"Athlete {i}", "password": password}
+        for i in range(users)
+    ])
+    user_ids = [uid for (uid,) in db.session.query(User.id)
+                .filter(User.email.like(f"%.{tag}@{EMAIL_DOMAIN}")).order_by(User.id)]
+
+    traits = list(_TRAIT_PROMPTS)
+    identities, entries, sessions = [], [], []
+    counts = {"users": len(user_ids), "identities": 0, "journal_entries": 0, "drill_sessions": 0}
+
+    for uid in user_ids:
+        if rng.random() < 0.8:
+            identities.append({"user_id": uid, "archetype_name": rng.choice(ARCHETYPES),
+                               "core_traits": rng.sample(traits, rng.randint(1, len(traits))),
+                               "created_at": datetime.combine(start, datetime.min.time())})
+
+        # Habit chain: P(log | logged yesterday) > P(log | skipped yesterday)
+        stay = rng.uniform(0.6, 0.97)
+        restart = rng.uniform(0.1, 0.5)
+        baseline, drift = rng.gauss(6.5, 1.2), 0.0
+        favourites = rng.sample(DRILLS, rng.randint(1, 3))
+        drill_rate = rng.uniform(0.1, 1.5)
+        skill = {d: rng.uniform(200, 600) for d in favourites}
+        practiced = dict.fromkeys(favourites, 0)
+        copy_paster = rng.random() < 0.1
+        logged = rng.random() < 0.5
+
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            logged = rng.random() < (stay if logged else restart)
+            drift = max(-2.5, min(2.5, drift + rng.gauss(0, 0.15)))
+
+            if logged:
+                score = None if rng.random() < 0.03 else \
+                    max(1, min(10, round(baseline + drift + rng.gauss(0, 1.3))))
+                win, reflection = (WINS[0], REFLECTIONS[0]) if copy_paster else \
+                    (rng.choice(WINS), rng.choice(REFLECTIONS))
+                entries.append({
+                    "user_id": uid, "date": day.isoformat(), "mood": _mood(score, rng),
+                    "performance_score": score, "is_gap_day": False,
+                    "content": {"micro_win": win, "reflection": reflection, "brain_dump_mode": rng.random() < 0.05},
+                    "updated_at": datetime.combine(day, datetime.min.time())
+                                  + timedelta(hours=rng.uniform(18, 23.9)),
+                })
+
+            for _ in range(_poisson(drill_rate, rng)):
+                drill = rng.choice(favourites)
+                practiced[drill] += 1
+                level = 1 + int(math.log1p(practiced[drill]) * 1.5)
+                sessions.append({
+                    "user_id": uid, "drill_id": drill,
+                    "score": max(0, round(skill[drill] * (1 + 0.25 * math.log1p(practiced[drill]))
+                                          + rng.gauss(0, 60))),
+                    "accuracy": round(min(1.0, max(0.2, rng.gauss(0.75 + 0.02 * level, 0.08))), 3),
+                    "level_reached": level,
+                    "duration_seconds": rng.randint(45, 180),
+                    "meta_data": {"source": "synthetic"},
+                    "timestamp": datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.uniform(6, 22)),
+                })
+
+            if len(entries) >= chunk:
+                counts["journal_entries"] += len(entries)
+                _flush(JournalEntry.__table__, entries)
+            if len(sessions) >= chunk:
+                counts["drill_sessions"] += len(sessions)
+                _flush(DrillSession.__table__, sessions)
+
+    counts["identities"] = len(identities)
+    counts["journal_entries"] += len(entries)
+    counts["drill_sessions"] += len(sessions)
+    _flush(UserIdentity.__table__, identities)
+    _flush(JournalEntry.__table__, entries)
+    _flush(DrillSession.__table__, sessions)
+    db.session.commit()
+
+    # Derived tables the endpoints read from
+    RollupEngine.rebuild()
+    LeaderboardEngine.rebuild()
+    return {**counts, "user_ids": user_ids, "tag": tag}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from mentee import create_app
+    app = create_app()
+    with app.app_context():
+        print(f"--- Generating {args.users} users x {args.days} days into {db.engine.url} ---")
+        t0 = time.perf_counter()
+        result = generate(args.users, args.days, seed=args.seed)
+        elapsed = time.perf_counter() - t0
+        rows = sum(v for k, v in result.items() if isinstance(v, int))
+        for key in ("users", "identities", "journal_entries", "drill_sessions"):
+            print(f"   {key:<16} {result[key]:>10,}")
+        print(f"✅ SUCCESS: {rows:,} rows in {elapsed:.1f}s. "
+              f"Log in as athlete0.{result['tag']}@{EMAIL_DOMAIN} / {SYNTHETIC_PASSWORD}")
+
+
+if __name__ == '__main__':
+    main()
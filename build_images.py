@@ -0,0 +1,40 @@
+import os
+from mentee import create_app
+from mentee.services.library_content import LibraryContent
+from mentee.services.image_pipeline import image_pipeline
+
+# Usage: python build_images.py
+# Pre-renders every artwork derivative so no visitor pays the first-request resize.
+app = create_app()
+
+# Width a typical 2x-DPR browser picks from each page's `sizes` attribute
+PAGE_WIDTHS = {
+    "Library grid (/dashboard/articles)": 960,
+    "Article view (/dashboard/articles/read/<id>)": 1280,
+}
+
+
+def derivative_size(rel_path, ext, width):
+    name = dict(image_pipeline.variants(rel_path, ext)).get(width)
+    name = name or image_pipeline.variants(rel_path, ext)[-1][1]
+    return os.path.getsize(image_pipeline.render(name))
+
+
+with app.test_request_context():
+    sources = sorted(set(image_pipeline.sources()))
+    print(f"--- Rendering derivatives for {len(sources)} images into {image_pipeline.cache_dir} ---")
+    names = image_pipeline.build(sources)
+    print(f"✅ {len(names)} derivatives ready.")
+
+    print("\n--- Bytes per page (original PNG vs served derivative) ---")
+    images = [a["image"] for a in LibraryContent.articles()]
+    for page, width in PAGE_WIDTHS.items():
+        # The grid loads every card image; an article page loads one
+        on_page = images if "grid" in page else images[:1]
+        original = sum(os.path.getsize(os.path.join(app.static_folder, p)) for p in on_page)
+        webp = sum(derivative_size(p, "webp", width) for p in on_page)
+        jpg = sum(derivative_size(p, "jpg", width) for p in on_page)
+        print(f"{page}")
+        print(f"   original {original / 1024:9.0f} KB")
+        print(f"   webp@{width} {webp / 1024:8.0f} KB  (saves {100 * (1 - webp / original):.1f}%)")
+        print(f"   jpeg@{width} {jpg / 1024:8.0f} KB  (saves {100 * (1 - jpg / original):.1f}%)")
@@ -1,8 +1,41 @@
 import os
 
+
+def _database_url():
+    url = os.environ.get('DATABASE_URL') or 'sqlite:///mentee.db'
+    # Heroku-style URLs use the scheme SQLAlchemy dropped in 1.4
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
 class Config:
     # Key for securing cookies (keep this secret in production!)
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-for-mentee'
-    # SQLite database location
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///mentee.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    # SQLite database location (relative paths land in instance/)
+    SQLALCHEMY_DATABASE_URI = _database_url()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Engine profile: 'auto' picks from the URL scheme, or force 'sqlite' / 'server'
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'auto')
+    # sqlite profile
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    # server profile (PostgreSQL/MySQL)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+
+    # Prometheus scrape endpoint (see mentee/services/request_metrics.py)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # required to read /metrics
+
+    # Nightly jobs (see mentee/services/job_scheduler.py); or run `python run_jobs.py` from cron
+    JOBS_ENABLED = os.environ.get('JOBS_ENABLED', '0') == '1'
+    JOBS_RUN_AT = os.environ.get('JOBS_RUN_AT', '03:00')
+    JOBS_TOKEN = os.environ.get('JOBS_TOKEN')      # required to read /jobs/status
+
+    # Opt-in request profiler (see mentee/services/request_profiler.py)
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '0') == '1'
+    PROFILER_SAMPLE_RATE = float(os.environ.get('PROFILER_SAMPLE_RATE', 0.0))
+    PROFILER_TOKEN = os.environ.get('PROFILER_TOKEN')
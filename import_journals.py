@@ -0,0 +1,38 @@
+import argparse
+import json
+from mentee import create_app
+from mentee.models import User
+from mentee.services.journal_import import ImportEngine
+
+# Usage: python import_journals.py athlete@team.com history.ndjson [--format csv]
+parser = argparse.ArgumentParser(description="Bulk-import journal history for one athlete.")
+parser.add_argument('user', help="User id or email")
+parser.add_argument('path', help="NDJSON or CSV file")
+parser.add_argument('--format', choices=['ndjson', 'csv'], help="Defaults to the file extension")
+parser.add_argument('--chunk-size', type=int, default=ImportEngine.CHUNK_SIZE)
+args = parser.parse_args()
+
+fmt = args.format or ('csv' if args.path.lower().endswith('.csv') else 'ndjson')
+
+app = create_app()
+
+with app.app_context():
+    user = User.query.get(int(args.user)) if args.user.isdigit() else User.query.filter_by(email=args.user).first()
+    if not user:
+        raise SystemExit(f"❌ No user matching '{args.user}'")
+
+    print(f"--- Importing {args.path} ({fmt}) for {user.email} ---")
+    with open(args.path, 'rb') as fh:
+        records = ImportEngine.parse(ImportEngine.text_stream(fh), fmt)
+        report = ImportEngine.import_entries(user.id, records, chunk_size=args.chunk_size)
+
+    print(f"Read {report['rows_read']} rows, wrote {report['rows_written']} "
+          f"in {report['seconds']}s ({report['rows_per_second']} rows/s)")
+    if report['stream_error']:
+        print(f"⚠️  Stopped after line {report['stream_error']['after_line']}: {report['stream_error']['error']}")
+    if report['error_count']:
+        print(f"⚠️  {report['error_count']} rows rejected:")
+        for err in report['errors']:
+            print("   " + json.dumps(err))
+    else:
+        print("✅ SUCCESS: No rejected rows.")
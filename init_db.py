@@ -0,0 +1,14 @@
+from mentee import create_app, db
+from mentee.services.schema_engine import SchemaEngine
+
+# Usage: python init_db.py
+# Creates or upgrades the schema (tables, new columns, indexes). Safe to re-run.
+# Run once per deploy before starting workers; create_app no longer touches DDL.
+app = create_app()
+
+with app.app_context():
+    print(f"--- Upgrading schema at {db.engine.url} ---")
+    actions = SchemaEngine.upgrade()
+    for action in actions:
+        print(f"   {action}")
+    print(f"✅ SUCCESS: {len(actions)} change(s) applied." if actions else "✅ SUCCESS: Schema already up to date.")
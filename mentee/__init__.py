@@ -6,29 +6,52 @@ from flask_login import LoginManager
 db = SQLAlchemy()
 login_manager = LoginManager()
 
-def create_app():
+def create_app(config_object='config.Config'):
     app = Flask(__name__)
     
     # --- CONFIGURATION ---
-    # In production, change this to a secure random string
-    app.config['SECRET_KEY'] = 'dev-secret-key-mental-gym'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///mentee.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # config.py reads SECRET_KEY / DATABASE_URL / pool settings from the environment
+    app.config.from_object(config_object)
 
     # --- INIT EXTENSIONS ---
-    db.init_app(app)
+    # The engine profile tunes pool/pragmas for the URL's backend and then runs db.init_app
+    from .services.db_profile import db_profile
+    db_profile.init_app(app)
     login_manager.init_app(app)
+    # Latency / SQL histograms and /metrics; needs the engine from db_profile
+    from .services.request_metrics import request_metrics
+    request_metrics.init_app(app)
+    from .services.request_profiler import request_profiler
+    request_profiler.init_app(app)
+    
+    from .services.drill_queue import drill_queue
+    drill_queue.init_app(app)
+    from .services.autosave_queue import autosave_queue
+    autosave_queue.init_app(app)
+    from .services.job_scheduler import job_scheduler
+    job_scheduler.init_app(app)
+    from .services.password_pool import password_hasher
+    password_hasher.init_app(app)
+    from .services.image_pipeline import image_pipeline
+    image_pipeline.init_app(app)
+    from .services.asset_manifest import asset_manifest
+    asset_manifest.init_app(app)
+    from .services.page_cache import page_cache
+    page_cache.init_app(app)
     
     # Configure Login Behavior
     login_manager.login_view = 'auth.login'  # Where to send non-logged-in users
     login_manager.login_message_category = 'info'
 
     # --- USER LOADER ---
-    # This tells Flask-Login how to find a specific user from the ID stored in the session
-    from .models import User
+    # This tells Flask-Login how to find a specific user from the ID stored in the session.
+    # Served from a per-process snapshot cache (identity eager-loaded) to skip the DB on warm users.
+    from .services.user_cache import user_cache
+    user_cache.init_app(app)
+
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return user_cache.get(int(user_id))
 
     # --- REGISTER BLUEPRINTS ---
     from .blueprints.main import main as main_blueprint
@@ -40,8 +63,11 @@ def create_app():
     from .blueprints.dashboard import dashboard as dashboard_blueprint
     app.register_blueprint(dashboard_blueprint, url_prefix='/dashboard')
 
-    # --- CREATE DATABASE ---
-    with app.app_context():
-        db.create_all()
+    # --- DATABASE SCHEMA ---
+    # Not created here: every worker boot would race on DDL. Run `python init_db.py` once per deploy.
+
+    # --- WARM PAGE CACHE ---
+    # Pre-render the public pages off the boot path so anonymous traffic never waits on Jinja
+    page_cache.warm_in_background()
 
     return app
\ No newline at end of file
@@ -1,7 +1,7 @@
 from flask import Blueprint, render_template, redirect, url_for, request, flash
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import login_user, logout_user, login_required
 from mentee.models import User, db
+from mentee.services.password_pool import password_hasher, HashPoolSaturated
 
 auth = Blueprint('auth', __name__)
 
@@ -14,8 +14,14 @@ def login():
 
         user = User.query.filter_by(email=email).first()
 
-        # Check if user exists and password is correct
-        if not user or not check_password_hash(user.password, password):
+        # Check if user exists and password is correct (scrypt runs off-thread)
+        try:
+            valid = bool(user) and password_hasher.check(user.password, password)
+        except HashPoolSaturated:
+            flash('Login is busy right now. Please try again in a moment.')
+            return render_template('auth/login.html'), 503
+
+        if not valid:
             flash('Please check your login details and try again.')
             return redirect(url_for('auth.login'))
 
@@ -43,11 +49,17 @@ def signup():
             flash('Email address already exists')
             return redirect(url_for('auth.signup'))
 
+        try:
+            pwhash = password_hasher.generate(password)
+        except HashPoolSaturated:
+            flash('Sign-up is busy right now. Please try again in a moment.')
+            return render_template('auth/signup.html'), 503
+
         # Create new user
         new_user = User(
             email=email,
             name=name,
-            password=generate_password_hash(password, method='scrypt') 
+            password=pwhash
         )
 
         db.session.add(new_user)
@@ -1,234 +1,33 @@
-from flask import Blueprint, render_template, jsonify, request, abort, redirect, url_for
+from flask import Blueprint, render_template, jsonify, request, abort, redirect, url_for, current_app
 from flask_login import current_user, login_required
-from mentee.models import JournalEntry, DrillSession, UserIdentity, db
+from mentee.models import JournalEntry, DrillSession, DrillSampleSet, SyncTombstone, UserIdentity, db
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.rollup_engine import RollupEngine
+from mentee.services.streak_engine import StreakEngine
+from mentee.services.journal_import import ImportEngine
+from mentee.services.journal_search import JournalSearchEngine
+from mentee.services.sync_engine import CursorExpired, SyncEngine
+from mentee.services.journal_patch import JournalPatchEngine, VersionConflict
+from mentee.services.autosave_queue import autosave_queue
+from mentee.services.leaderboard_engine import LeaderboardEngine
+from mentee.services.drill_queue import drill_queue, write_sessions
+from mentee.services.drill_analytics import DrillAnalyticsEngine
+from mentee.services.article_index import ArticleIndex
+from mentee.services.library_content import LibraryContent
+from mentee.services.page_cache import page_cache
 from datetime import datetime
-import json
+import hashlib
+import time
 from sqlalchemy import func
+from sqlalchemy.orm.exc import StaleDataError
 
 dashboard = Blueprint('dashboard', __name__)
 
 # ==========================================
-# 1. MENTAL EDGE LIBRARY DATA (PRESERVED)
+# 1. MENTAL EDGE LIBRARY DATA
 # ==========================================
-ARTICLES_DATA = [
-    {
-        "id": "1",
-        "title": "The Vagus Nerve Masterclass",
-        "subtitle": "A complete physiological override system for high-stakes anxiety.",
-        "category": "Anti-Choking",
-        "sport": "General",
-        "type": "Deep Dive",
-        "read_time": "25 min",
-        "level": "Elite",
-        "image": "img/1.png", 
-        "badges": ["Neurobiology", "Protocol", "Polyvagal Theory"],
-        "references": [
-            "Huberman Lab: Tools for Managing Stress",
-            "Porges, S. W. (2011). The Polyvagal Theory.",
-            "Lehrer, P. M., & Gevirtz, R. (2014). Heart rate variability biofeedback."
-        ],
-        "content": {
-            "intro": "In high-pressure environments, the distinction between 'nervous' and 'choking' is purely biological...",
-            "sections": [
-                {"heading": "Part I: The Neurobiology of 'The Choke'", "body": "To defeat choking, you must understand the mechanism..."},
-                {"heading": "Part II: The Physiological Sigh (The Primary Lever)", "body": "Discovered by Stanford neurobiologists..."},
-                {"heading": "Part III: Panoramic Vision (The Secondary Lever)", "body": "Your eyes are essentially external parts of your brain..."},
-                {"heading": "Part IV: Mechanical Anchoring", "body": "Anxiety often manifests as a feeling of 'floating'..."},
-                {"heading": "Advanced Troubleshooting", "body": "**Scenario: My hands are still shaking.**..."}
-            ]
-        }
-    },
-    {
-        "id": "2",
-        "title": "The Cortical Interference Protocol",
-        "subtitle": "Why trying harder makes you play worse: The science of Reinvestment.",
-        "category": "Focus",
-        "sport": "Tennis",
-        "type": "Deep Dive",
-        "read_time": "30 min",
-        "level": "Elite",
-        "image": "img/2.png",
-        "badges": ["Theory", "Gold Standard", "Motor Learning"],
-        "references": ["Masters, R. S. W. (1992). Knowledge, knerves and know-how.", "Wulf, G. (2013). Attentional focus and motor learning."],
-        "content": {
-            "intro": "We have all seen it: The world-class shooter who airballs a free throw...",
-            "sections": [
-                {"heading": "The Theory of Reinvestment", "body": "Reinvestment Theory posits that under pressure..."},
-                {"heading": "Solution 1: The External Focus Loop", "body": "The brain cannot think about two things at once..."},
-                {"heading": "Solution 2: The Holier-Than-Thou Gaze (Quiet Eye)", "body": "In archery and shooting sports, we see 'Quiet Eye'..."},
-                {"heading": "Advanced Training: Constraint-Based Chaos", "body": "You cannot learn to avoid interference by practicing in silence..."}
-            ]
-        }
-    },
-    {
-        "id": "3",
-        "title": "The 2-Hour Recovery Algorithm",
-        "subtitle": "A structured timeline to process defeat and prevent performance slumps.",
-        "category": "Recovery",
-        "sport": "General",
-        "type": "Deep Dive",
-        "read_time": "20 min",
-        "level": "Intermediate",
-        "image": "img/3.png",
-        "badges": ["System", "Mental Health", "CBT"],
-        "references": ["Cognitive Behavioral Therapy for Sports Performance", "The Chimp Paradox - Dr. Steve Peters"],
-        "content": {
-            "intro": "In tournament play, you do not have the luxury of grieving a loss for a week...",
-            "sections": [
-                {"heading": "T+00:00 - The Decompression Phase", "body": "Goal: Physiological Reset..."},
-                {"heading": "T+00:30 - The Venting Phase (Strictly Timed)", "body": "Goal: Emotional Externalization..."},
-                {"heading": "T+01:00 - The Detective Phase", "body": "Goal: Cognitive Extraction..."},
-                {"heading": "T+02:00 - The Bookend Ritual", "body": "Goal: Psychological Closure..."}
-            ]
-        }
-    },
-    {
-        "id": "4",
-        "title": "Djokovic vs. Federer: The Smile",
-        "subtitle": "A forensic psychological analysis of the 2019 Wimbledon Final tie-break.",
-        "category": "Strategy",
-        "sport": "Tennis",
-        "type": "Breakdown",
-        "read_time": "22 min",
-        "level": "Advanced",
-        "image": "img/4.png",
-        "badges": ["Case Study", "Elite", "Analysis"],
-        "references": ["Inner Game of Tennis - Gallwey", "Match Analysis: Wimbledon 2019"],
-        "content": {
-            "context": "Wimbledon 2019. The Final. 5th Set. 12-12. Tie-break...",
-            "moments": [
-                {"time": "The Cognitive Reappraisal", "analysis": "When the crowd erupts in chants..."},
-                {"time": "The Isolation Protocol", "analysis": "Watch Djokovic between points..."},
-                {"time": "The Tempo Dictatorship", "analysis": "At 12-12, most players rush..."}
-            ],
-            "takeaway": "In your own performance, you cannot control the referee..."
-        }
-    },
-    {
-        "id": "5",
-        "title": "The Finisher's Mindset",
-        "subtitle": "Why teams choke with the lead and the psychology of closing.",
-        "category": "Confidence",
-        "sport": "Basketball",
-        "type": "Playbook",
-        "read_time": "15 min",
-        "level": "Elite",
-        "image": "img/5.png",
-        "badges": ["Framework", "Leadership"],
-        "references": ["Thinking, Fast and Slow - Kahneman", "Relentless - Tim Grover"],
-        "content": {
-            "rules": [
-                {"rule": "Promotion vs. Prevention Orientation", "desc": "Psychologically, there are two modes..."},
-                {"rule": "The Certainty Matrix", "desc": "In the first 3 quarters, you take 50/50 risks..."},
-                {"rule": "The 10-Second Flush Ritual", "desc": "You will make a mistake in the clutch..."}
-            ]
-        }
-    },
-    {
-        "id": "6",
-        "title": "Grandmaster Time Management",
-        "subtitle": "Decision making heuristics for extreme time pressure scenarios.",
-        "category": "Strategy",
-        "sport": "Chess",
-        "type": "Playbook",
-        "read_time": "18 min",
-        "level": "Elite",
-        "image": "img/6.png",
-        "badges": ["Expert Reviewed", "Cognitive Science"],
-        "references": ["Kotov: Think Like a Grandmaster", "Garry Kasparov on Decision Making"],
-        "content": {
-            "rules": [
-                {"rule": "The 20% Rule of Allocation", "desc": "In complex positions, perfection is the enemy..."},
-                {"rule": "The 'Hope Chess' Fallacy", "desc": "Under pressure, the brain seeks an easy way out..."},
-                {"rule": "The Intuition Switch (System 1 vs System 2)", "desc": "Daniel Kahneman's 'Thinking Fast and Slow' applies here..."}
-            ]
-        }
-    },
-    {
-        "id": "7",
-        "title": "The Cinema of the Mind",
-        "subtitle": "Advanced protocols for multisensory visualization and neural priming.",
-        "category": "Focus",
-        "sport": "General",
-        "type": "Deep Dive",
-        "read_time": "20 min",
-        "level": "All Levels",
-        "image": "img/7.png",
-        "badges": ["Foundational", "Performance", "Neural Priming"],
-        "references": ["Functional Equivalence Theory", "Dr. Judd Biasiotto - Psychology"],
-        "content": {
-            "intro": "Visualization is often dismissed as 'daydreaming'...",
-            "sections": [
-                {"heading": "Case Study: The Injured Gymnast", "body": "An Olympic gymnast broke her leg..."},
-                {"heading": "The 3D Framework: Functional Equivalence", "body": "For visualization to work..."},
-                {"heading": "Practical Task: The Bedtime Script", "body": "Write a script of your perfect performance..."}
-            ]
-        }
-    },
-    {
-        "id": "8",
-        "title": "Sleep Banking for Athletes",
-        "subtitle": "Optimizing circadian rhythms and recovery during tournament weeks.",
-        "category": "Recovery",
-        "sport": "General",
-        "type": "Deep Dive",
-        "read_time": "20 min",
-        "level": "Advanced",
-        "image": "img/8.png",
-        "badges": ["Science", "Physiology", "Sleep Architecture"],
-        "references": ["Matthew Walker: Why We Sleep", "Stanford Sleep & Performance Research Center"],
-        "content": {
-            "intro": "Sleep is the most potent performance-enhancing drug that is legal...",
-            "sections": [
-                {"heading": "The Science of Sleep Extension", "body": "A landmark Stanford study..."},
-                {"heading": "The Banking Strategy", "body": "You cannot 'catch up' on sleep effectively..."},
-                {"heading": "The Caffeine-Melatonin Cycle", "body": "To master sleep, you must master light and chemicals..."}
-            ]
-        }
-    },
-    {
-        "id": "9",
-        "title": "Reframing Self-Talk",
-        "subtitle": "Cognitive restructuring techniques for resilience.",
-        "category": "Confidence",
-        "sport": "General",
-        "type": "Deep Dive",
-        "read_time": "15 min",
-        "level": "Beginner",
-        "image": "img/9.png",
-        "badges": ["Psychology", "Resilience", "CBT"],
-        "references": ["Ethan Kross: Chatter", "Stoic Philosophy"],
-        "content": {
-            "intro": "Your inner voice is the most influential coach you will ever have...",
-            "sections": [
-                {"heading": "The Theory of Cognitive Distortions", "body": "Anxiety often stems from 'Cognitive Distortions'..."},
-                {"heading": "The Third-Person Shift (Solomon's Paradox)", "body": "When you talk to yourself using 'I' ..."},
-                {"heading": "Instructional vs. Motivational Self-Talk", "body": "In high-precision tasks..."}
-            ]
-        }
-    }
-]
-
-COLLECTIONS_DATA = [
-    {"id": "c1", "title": "🏆 Tournament Survival Kit", "desc": "Essential mental protocols for game day.", "bg": "linear-gradient(135deg, #0f172a 0%, #1e293b 100%)"},
-    {"id": "c2", "title": "❄️ Ice In The Veins", "desc": "Protocols to lower heart rate instantly.", "bg": "linear-gradient(135deg, #06b6d4 0%, #0f172a 100%)"},
-    {"id": "c3", "title": "🔥 Burnout Prevention", "desc": "Sustainable performance strategies.", "bg": "linear-gradient(135deg, #f43f5e 0%, #0f172a 100%)"},
-]
-
-PATHS_DATA = [
-    {"id": "p1", "title": "Anti-Choking System", "steps": "4 Modules", "icon": "🛡️", "color": "#ef4444"},
-    {"id": "p2", "title": "Confidence Rebuild", "steps": "6 Modules", "icon": "🚀", "color": "#f59e0b"},
-    {"id": "p3", "title": "Elite Focus Mastery", "steps": "5 Modules", "icon": "🎯", "color": "#3b82f6"},
-]
-
-MENTORS_DATA = [
-    {"id": 1, "name": "Dr. Sarah Jenkins", "title": "Elite Performance Psychologist", "specialties": ["Pressure", "Focus"], "price": 45, "rating": 4.9, "reviews": 124, "experience": "10+ Years", "next_slot": "Tomorrow, 10:00 AM", "is_elite": True, "image": "https://randomuser.me/api/portraits/women/44.jpg", "bio": "Former Olympic consultant helping athletes crush performance anxiety."},
-    {"id": 2, "name": "Marcus Thorne", "title": "Mental Conditioning Coach", "specialties": ["Recovery", "Confidence"], "price": 30, "rating": 4.7, "reviews": 89, "experience": "5 Years", "next_slot": "Today, 4:00 PM", "is_elite": False, "image": "https://randomuser.me/api/portraits/men/32.jpg", "bio": "Specializes in comeback mentality and injury recovery for contact sports."},
-    {"id": 3, "name": "Elena Rodriguez", "title": "Flow State Specialist", "specialties": ["Focus", "Tournament Prep"], "price": 60, "rating": 5.0, "reviews": 210, "experience": "12 Years", "next_slot": "Wed, 2:00 PM", "is_elite": True, "image": "https://randomuser.me/api/portraits/women/68.jpg", "bio": "I teach athletes how to enter 'The Zone' on command."},
-    {"id": 4, "name": "Coach David Kim", "title": "Tactical Mindset Trainer", "specialties": ["Strategy", "Pressure"], "price": 35, "rating": 4.6, "reviews": 45, "experience": "4 Years", "next_slot": "Tomorrow, 11:00 AM", "is_elite": False, "image": "https://randomuser.me/api/portraits/men/86.jpg", "bio": "Focusing on decision making speed and tactical awareness under fatigue."},
-    {"id": 5, "name": "Jessica Vance", "title": "Youth Performance Mentor", "specialties": ["Confidence", "Rising Juniors"], "price": 25, "rating": 4.8, "reviews": 67, "experience": "3 Years", "next_slot": "Today, 5:30 PM", "is_elite": False, "image": "https://randomuser.me/api/portraits/women/12.jpg", "bio": "Helping young athletes build unshakeable foundations early."},
-    {"id": 6, "name": "Alex Volkov", "title": "High-Stakes Competitor Coach", "specialties": ["Tournament Prep", "Aggression"], "price": 55, "rating": 4.9, "reviews": 150, "experience": "8 Years", "next_slot": "Fri, 9:00 AM", "is_elite": True, "image": "https://randomuser.me/api/portraits/men/46.jpg", "bio": "Turn your nerves into aggression. For combat and contact sports."}
-]
+# Articles, collections, paths and mentors live in mentee/content/library.json
+# and load on first use through LibraryContent.
 
 DRILLS_CONFIG = {
     'reaction': {'title': 'Neural Impulse', 'desc': 'Train pure reaction speed and inhibition control.', 'icon': '⚡', 'color': '#ef4444'},
@@ -239,6 +38,12 @@ DRILLS_CONFIG = {
     'decision': {'title': 'Decision Rush', 'desc': 'Make rapid, accurate binary choices under pressure.', 'icon': '⚖️', 'color': '#06b6d4'}
 }
 
+MAX_DRILL_BATCH = 500
+
+# Rendered library/mentor pages are cached for anonymous visitors; edits to the content bump the cache version
+page_cache.register_data(LibraryContent.load)
+page_cache.warm_values('dashboard.read_article', lambda: [{"article_id": a["id"]} for a in LibraryContent.articles()])
+
 # ==========================================
 # VIEW ROUTES
 # ==========================================
@@ -248,33 +53,52 @@ def index():
     return render_template('dashboard/index.html')
 
 @dashboard.route('/articles')
+@page_cache.cached
 def articles():
     return render_template('dashboard/articles.html', 
-                           articles=ARTICLES_DATA, 
-                           collections=COLLECTIONS_DATA,
-                           paths=PATHS_DATA,
+                           articles=LibraryContent.articles(), 
+                           collections=LibraryContent.collections(),
+                           paths=LibraryContent.paths(),
                            total_count=142)
 
 @dashboard.route('/articles/read/<article_id>')
+@page_cache.cached
 def read_article(article_id):
-    article = next((item for item in ARTICLES_DATA if item["id"] == article_id), None)
+    article = LibraryContent.index().get(article_id)
     if not article:
         abort(404)
-    related = [a for a in ARTICLES_DATA if a['category'] == article['category'] and a['id'] != article['id']][:3]
+    related = LibraryContent.index().related(article, 3)
     return render_template('dashboard/article_view.html', article=article, related=related)
 
+@dashboard.route('/api/articles/search')
+def search_articles():
+    """Ranked library search with category/sport/level/type facets."""
+    started = time.perf_counter()
+    filters = {f: request.args.get(f) for f in ArticleIndex.FACETS}
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+    found = LibraryContent.index().search(request.args.get('q', ''), filters, limit)
+
+    keys = ("id", "title", "subtitle", "category", "sport", "type", "level", "read_time", "image")
+    return jsonify({
+        "total": found["total"],
+        "results": [
+            {**{k: a.get(k) for k in keys}, "score": round(score, 4) if score is not None else None}
+            for a, score in found["results"]
+        ],
+        "facets": found["facets"],
+        "took_ms": round((time.perf_counter() - started) * 1000, 3)
+    })
+
 @dashboard.route('/mentors')
+@page_cache.cached
 def mentors():
-    return render_template('dashboard/mentors.html', mentors=MENTORS_DATA)
+    return render_template('dashboard/mentors.html', mentors=LibraryContent.mentors())
 
 @dashboard.route('/drills')
 @login_required
 def drills_hub():
-    stats = {}
-    for d_id in DRILLS_CONFIG.keys():
-        best = db.session.query(func.max(DrillSession.score))\
-            .filter_by(user_id=current_user.id, drill_id=d_id).scalar()
-        stats[d_id] = best if best else 0
+    bests = LeaderboardEngine.personal_bests(current_user.id)
+    stats = {d_id: bests.get(d_id, 0) for d_id in DRILLS_CONFIG.keys()}
     return render_template('dashboard/drills_hub.html', drills=DRILLS_CONFIG, stats=stats)
 
 @dashboard.route('/drills/play/<drill_id>')
@@ -283,9 +107,8 @@ def play_drill(drill_id):
     if drill_id not in DRILLS_CONFIG:
         abort(404)
     config = DRILLS_CONFIG[drill_id]
-    best = db.session.query(func.max(DrillSession.score))\
-        .filter_by(user_id=current_user.id, drill_id=drill_id).scalar()
-    return render_template('dashboard/play_drill.html', drill_id=drill_id, config=config, best_score=best if best else 0)
+    best = LeaderboardEngine.personal_best(current_user.id, drill_id)
+    return render_template('dashboard/play_drill.html', drill_id=drill_id, config=config, best_score=best)
 
 @dashboard.route('/training')
 @login_required
@@ -293,6 +116,7 @@ def training():
     return redirect(url_for('dashboard.drills_hub'))
 
 @dashboard.route('/ai-counselling')
+@page_cache.cached
 def ai_counselling():
     return render_template('dashboard/ai_counselling.html')
 
@@ -304,7 +128,14 @@ def ai_counselling():
 @login_required
 def journal():
     """Renders the New Calendar Interface"""
-    return render_template('dashboard/journal.html')
+    return render_template('dashboard/journal.html', streak=StreakEngine.summary(current_user.id),
+                           prompts=PerformanceEngine.get_identity_schema(current_user.id))
+
+@dashboard.route('/api/journal/prompts', methods=['GET'])
+@login_required
+def get_prompts():
+    """Night-closure prompts for the athlete's archetype traits."""
+    return jsonify({"prompts": PerformanceEngine.get_identity_schema(current_user.id)})
 
 @dashboard.route('/api/journal/calendar', methods=['GET'])
 @login_required
@@ -325,20 +156,107 @@ def get_calendar_data():
     
     return jsonify(data)
 
+@dashboard.route('/api/journal/calendar/range', methods=['GET'])
+@login_required
+def get_calendar_range():
+    """
+    Columnar mood/score data for up to a year of calendar cells.
+    ETag tracks the user's latest write and latest delete (tombstone), so unchanged
+    ranges revalidate with a 304 after one idx_user_updated and one idx_tombstone_user seek.
+    """
+    today = datetime.utcnow()
+    from_str = request.args.get('from') or today.strftime('%Y-01-01')
+    to_str = request.args.get('to') or today.strftime('%Y-12-31')
+    try:
+        start = datetime.strptime(from_str, '%Y-%m-%d')
+        end = datetime.strptime(to_str, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+    if end < start:
+        return jsonify({"error": "'to' is before 'from'"}), 400
+    if (end - start).days > 366:
+        return jsonify({"error": "Range is limited to one year"}), 400
+
+    last_write = db.session.query(func.max(JournalEntry.updated_at))\
+        .filter(JournalEntry.user_id == current_user.id).scalar()
+    last_delete = db.session.query(func.max(SyncTombstone.id))\
+        .filter(SyncTombstone.user_id == current_user.id).scalar()
+    etag = hashlib.sha1(
+        f"{current_user.id}|{from_str}|{to_str}|{last_write.isoformat() if last_write else '-'}|"
+        f"{last_delete or '-'}".encode()
+    ).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        rows = db.session.query(JournalEntry.date, JournalEntry.mood, JournalEntry.performance_score)\
+            .filter(JournalEntry.user_id == current_user.id,
+                    JournalEntry.date.between(from_str, to_str))\
+            .order_by(JournalEntry.date).all()
+
+        mood_codes = {m: i for i, m in enumerate(JournalEntry.MOODS)}
+        response = jsonify({
+            "from": from_str,
+            "to": to_str,
+            "moods": list(JournalEntry.MOODS),
+            "dates": [r.date for r in rows],
+            "mood": [mood_codes.get(r.mood) for r in rows],
+            "score": [r.performance_score for r in rows]
+        })
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@dashboard.route('/api/journal/search', methods=['GET'])
+@login_required
+def search_journal():
+    """Full-text search over the athlete's micro wins and reflections."""
+    if not JournalSearchEngine.available():
+        return jsonify({"error": "Journal search needs the SQLite FTS5 index"}), 501
+
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Query required"}), 400
+    date_from, date_to = request.args.get('from'), request.args.get('to')
+    try:
+        for value in (date_from, date_to):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+
+    found = JournalSearchEngine.search(
+        current_user.id, query, date_from, date_to,
+        limit=request.args.get('limit', 20, type=int), offset=request.args.get('offset', 0, type=int)
+    )
+    return jsonify({"query": query, **found})
+
 @dashboard.route('/api/journal/<date_str>', methods=['GET'])
 @login_required
 def get_entry(date_str):
-    """Fetches details for the sliding panel"""
-    entry = JournalEntry.query.filter_by(
-        user_id=current_user.id, 
-        date=date_str
-    ).first()
-
-    if entry:
-        return jsonify({"exists": True, "data": entry.to_dict()})
+    """Fetches details for the sliding panel (with any pending autosave applied)"""
+    data = autosave_queue.current(current_user.id, date_str)
+
+    if data:
+        return _versioned(jsonify({"exists": True, "data": data}), data["version"])
     
     return jsonify({"exists": False})
 
+def _versioned(response, version):
+    """Tags a journal response with the entry version clients send back as If-Match."""
+    if version is not None:
+        response.set_etag(str(version))
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _conflict(date_str):
+    """409 with the key as it stands now; call after rolling back the failed write."""
+    current = autosave_queue.current(current_user.id, date_str)
+    response = jsonify({"error": "Entry changed since your version", "current": current})
+    response.status_code = 409
+    return _versioned(response, current["version"] if current else None)
+
 @dashboard.route('/api/journal', methods=['POST'])
 @login_required
 def save_entry():
@@ -349,13 +267,20 @@ def save_entry():
         
         if not date_str:
             return jsonify({"error": "Date required"}), 400
+        try:
+            # Stored dates compare as strings, so keep them zero-padded
+            date_str = datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()
+        except (TypeError, ValueError):
+            return jsonify({"error": "Date must be YYYY-MM-DD"}), 400
 
         entry = JournalEntry.query.filter_by(
             user_id=current_user.id, 
             date=date_str
         ).first()
 
-        if not entry:
+        is_new = entry is None
+        old_score = None if is_new else entry.performance_score
+        if is_new:
             entry = JournalEntry(user_id=current_user.id, date=date_str)
             db.session.add(entry)
 
@@ -370,37 +295,286 @@ def save_entry():
             "brain_dump_mode": bool(data.get('brain_dump_mode'))
         }
         entry.updated_at = datetime.utcnow()
+        # A full save supersedes any debounced autosave for the same day
+        autosave_queue.discard(current_user.id, date_str)
+
+        # Anti-autopilot: fingerprint once, compare against the past week
+        text = " ".join(v for v in (entry.content["micro_win"], entry.content["reflection"]) if v)
+        entry.text_signature = PerformanceEngine.text_signature(text)
+        effort = PerformanceEngine.detect_autopilot(text, current_user.id,
+                                                    signature=entry.text_signature, exclude_date=date_str)
+
+        # Rollup rides the same transaction as the entry
+        RollupEngine.apply_entry(current_user.id, date_str, old_score, entry.performance_score, is_new)
         
         db.session.commit()
-        return jsonify({"status": "success", "data": entry.to_dict()})
+        return _versioned(jsonify({"status": "success", "data": entry.to_dict(), "effort": effort,
+                                   "streak": StreakEngine.summary(current_user.id)}), entry.version)
+
+    except StaleDataError:
+        db.session.rollback()
+        return _conflict(date_str)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Journal save failed for user %s", current_user.id)
+        return jsonify({"error": str(e)}), 500
+
+@dashboard.route('/api/journal/<date_str>', methods=['DELETE'])
+@login_required
+def delete_entry(date_str):
+    """Removes one entry; the sync tombstone and rollup repair ride the same commit."""
+    entry = JournalEntry.query.filter_by(user_id=current_user.id, date=date_str).first()
+    if not entry:
+        return jsonify({"error": "No entry for that date"}), 404
+
+    autosave_queue.discard(current_user.id, date_str)
+    score = entry.performance_score
+    db.session.delete(entry)
+    db.session.flush()
+    RollupEngine.remove_entry(current_user.id, date_str, score)
+    db.session.commit()
+    return jsonify({"status": "success", "deleted": date_str, "streak": StreakEngine.summary(current_user.id)})
+
+@dashboard.route('/api/journal/<date_str>', methods=['PATCH'])
+@login_required
+def patch_entry(date_str):
+    """
+    Field-level update: only the keys in the body are written.
+    If-Match carries the version from the last ETag; a stale one gets 409 with the current row.
+    ?autosave=1 debounces the write server-side and answers 202.
+    """
+    try:
+        if datetime.strptime(date_str, '%Y-%m-%d').date().isoformat() != date_str:
+            raise ValueError(date_str)
+    except ValueError:
+        return jsonify({"error": "Date must be YYYY-MM-DD"}), 400
+    try:
+        fields = JournalPatchEngine.parse(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # If-Match: the version the client edited (absent or * means last writer wins per field).
+    # A pending autosave makes its promised version the live one (see autosave_queue).
+    client_version = None
+    if request.if_match and not request.if_match.star_tag:
+        tags = request.if_match.as_set()
+        client_version = next((int(t) for t in tags if t.isdigit()), -1)
+
+    try:
+        if request.args.get('autosave') == '1':
+            pending = autosave_queue.submit(current_user.id, date_str, fields, client_version)
+            if pending is not None:
+                response = jsonify({"status": "pending", **pending,
+                                    "flush_after_ms": current_app.config['AUTOSAVE_DEBOUNCE_MS']})
+                response.status_code = 202
+                return _versioned(response, pending["version"])
+
+        # Explicit save: fold in anything still debounced for this day, then write inline
+        pending, expected = autosave_queue.take(current_user.id, date_str, client_version)
+        entry, changed, effort = JournalPatchEngine.apply(current_user.id, date_str,
+                                                          {**pending, **fields}, expected)
+        db.session.commit()
+    except (VersionConflict, StaleDataError):
+        db.session.rollback()
+        return _conflict(date_str)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception("Journal patch failed for user %s", current_user.id)
+        return jsonify({"error": str(e)}), 500
+
+    return _versioned(jsonify({"status": "success", "changed": changed, "data": entry.to_dict(),
+                               "effort": effort, "streak": StreakEngine.summary(current_user.id)}), entry.version)
+
+@dashboard.route('/api/sync', methods=['GET'])
+@login_required
+def sync_changes():
+    """
+    Delta sync for client replicas: journal entries, drill sessions and tombstones
+    changed since ?cursor= (omit it for a full sync). Follow has_more with the returned cursor.
+    """
+    try:
+        changes = SyncEngine.changes(current_user.id, request.args.get('cursor'),
+                                     limit=request.args.get('limit', SyncEngine.DEFAULT_LIMIT, type=int))
+    except CursorExpired as e:
+        return jsonify({"error": str(e)}), 410
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    response = jsonify(changes)
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+@dashboard.route('/api/journal/import', methods=['POST'])
+@login_required
+def import_entries():
+    """Streams an NDJSON/CSV body into the journal via chunked upserts."""
+    fmt = request.args.get('format')
+    if not fmt:
+        fmt = 'csv' if 'csv' in (request.mimetype or '') else 'ndjson'
 
+    try:
+        records = ImportEngine.parse(ImportEngine.text_stream(request.stream), fmt)
+        report = ImportEngine.import_entries(current_user.id, records)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         db.session.rollback()
-        print(f"JOURNAL SAVE ERROR: {e}") 
+        current_app.logger.exception("Journal import failed for user %s", current_user.id)
         return jsonify({"error": str(e)}), 500
 
+    return jsonify({"status": "partial" if report["stream_error"] else "success", "report": report})
+
 @dashboard.route('/api/performance-insights')
 @login_required
 def get_insights():
-    return jsonify({"status": "ok"})
+    """Served from the incrementally maintained rollup (single PK read)."""
+    return jsonify(RollupEngine.insights(current_user.id))
+
+@dashboard.route('/api/performance-insights/nightly')
+@login_required
+def get_trend_report():
+    """Last night's coach trend report from the trend_reports job."""
+    from mentee.services.cohort_engine import CohortEngine   # keeps pandas out of worker boot
+    report = CohortEngine.report(current_user.id)
+    if report is None:
+        return jsonify({"status": "pending", "error": "No nightly report yet"}), 404
+    return jsonify(report)
+
+@dashboard.route('/api/streaks')
+@login_required
+def get_streak():
+    """Current and longest journaling streak (single PK read)."""
+    return jsonify(StreakEngine.summary(current_user.id))
+
+@dashboard.route('/api/streaks/leaderboard')
+@login_required
+def streak_leaderboard():
+    """Top current streaks across athletes, walked off idx_rollup_streak."""
+    limit = request.args.get('limit', StreakEngine.LEADERBOARD_MAX, type=int)
+    return jsonify({
+        'leaders': StreakEngine.top_current(limit),
+        'me': StreakEngine.summary(current_user.id)
+    })
 
 # ==========================================
 # DRILLS API
 # ==========================================
 
+def _drill_row(data, user_id):
+    """Validates one drill result payload into DrillSession column values."""
+    if not isinstance(data, dict):
+        raise ValueError('Session must be an object')
+    drill_id = data.get('drill_id')
+    if drill_id not in DRILLS_CONFIG:
+        raise ValueError('Unknown drill')
+    try:
+        score = int(data.get('score'))
+    except (TypeError, ValueError):
+        raise ValueError('Score required')
+
+    # Typed here so a malformed value is a 400, not a failed bulk insert on Postgres
+    numbers = {}
+    for key, cast in (('accuracy', float), ('level', int), ('duration', int)):
+        value = data.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f'{key} must be a number')
+        try:
+            numbers[key] = cast(value) if value is not None else None
+        except (ValueError, OverflowError):
+            raise ValueError(f'{key} must be a finite number')
+    meta = data.get('meta') or {}
+    if not isinstance(meta, dict):
+        raise ValueError('meta must be an object')
+
+    return {
+        'user_id': user_id,
+        'drill_id': drill_id,
+        'score': score,
+        'accuracy': numbers['accuracy'],
+        'level_reached': numbers['level'],
+        'duration_seconds': numbers['duration'],
+        'meta_data': meta,
+        'timestamp': datetime.utcnow(),
+        'samples': DrillAnalyticsEngine.pack_samples(data.get('samples'))
+    }
+
 @dashboard.route('/api/drills/save', methods=['POST'])
 @login_required
 def save_drill_session():
-    data = request.get_json()
-    session = DrillSession(
-        user_id=current_user.id,
-        drill_id=data.get('drill_id'),
-        score=data.get('score'),
-        accuracy=data.get('accuracy'),
-        level_reached=data.get('level'),
-        duration_seconds=data.get('duration'),
-        meta_data=json.dumps(data.get('meta', {}))
-    )
+    try:
+        row = _drill_row(request.get_json(), current_user.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    samples = row.pop('samples')
+    session = DrillSession(**row)
     db.session.add(session)
+    if samples:
+        db.session.add(DrillSampleSet(session=session, user_id=current_user.id,
+                                      drill_id=row['drill_id'], **samples))
+
+    # Personal best rides the same commit as the session
+    pb, is_new_best = LeaderboardEngine.record_session(current_user.id, row['drill_id'], row['score'])
     db.session.commit()
-    return jsonify({'status': 'success', 'id': session.id})
\ No newline at end of file
+
+    return jsonify({
+        'status': 'success',
+        'id': session.id,
+        'best_score': pb.best_score,
+        'is_personal_best': is_new_best,
+        'percentile': LeaderboardEngine.percentile(row['drill_id'], pb.best_score)
+    })
+
+@dashboard.route('/api/drills/save-batch', methods=['POST'])
+@login_required
+def save_drill_sessions():
+    """
+    Accepts {"sessions": [...]}. Valid rows go to the write-behind queue (202);
+    when it is disabled or full they are bulk-written inline (200).
+    """
+    payload = request.get_json(silent=True) or {}
+    sessions = payload.get('sessions')
+    if not isinstance(sessions, list) or not sessions:
+        return jsonify({'error': 'sessions list required'}), 400
+    if len(sessions) > MAX_DRILL_BATCH:
+        return jsonify({'error': f'At most {MAX_DRILL_BATCH} sessions per request'}), 413
+
+    rows, errors = [], []
+    for i, data in enumerate(sessions):
+        try:
+            rows.append(_drill_row(data, current_user.id))
+        except ValueError as e:
+            errors.append({'index': i, 'error': str(e)})
+
+    if rows and drill_queue.enqueue(rows):
+        return jsonify({'status': 'queued', 'accepted': len(rows), 'errors': errors}), 202
+
+    if rows:
+        write_sessions(rows)
+    return jsonify({'status': 'success', 'accepted': len(rows), 'errors': errors})
+
+@dashboard.route('/api/drills/<drill_id>/analytics')
+@login_required
+def drill_analytics(drill_id):
+    """Learning curve, reaction percentiles and fatigue slope from stored trial samples."""
+    if drill_id not in DRILLS_CONFIG:
+        abort(404)
+    sessions = request.args.get('sessions', DrillAnalyticsEngine.DEFAULT_SESSIONS, type=int)
+    # Default window: served from the nightly snapshot unless sessions landed since
+    if sessions == DrillAnalyticsEngine.DEFAULT_SESSIONS:
+        report = DrillAnalyticsEngine.snapshot(current_user.id, drill_id)
+        if report is not None:
+            return jsonify(report)
+    return jsonify(DrillAnalyticsEngine.analyze(current_user.id, drill_id, sessions))
+
+@dashboard.route('/api/drills/<drill_id>/leaderboard')
+@login_required
+def drill_leaderboard(drill_id):
+    if drill_id not in DRILLS_CONFIG:
+        abort(404)
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    my_best = LeaderboardEngine.personal_best(current_user.id, drill_id)
+    return jsonify({
+        'drill_id': drill_id,
+        'leaders': LeaderboardEngine.leaderboard(drill_id, limit),
+        'me': {'best_score': my_best, **LeaderboardEngine.percentile(drill_id, my_best)} if my_best else None
+    })
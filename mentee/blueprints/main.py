@@ -1,12 +1,15 @@
 from flask import Blueprint, render_template
 from flask_login import current_user
+from mentee.services.page_cache import page_cache
 
 main = Blueprint('main', __name__)
 
 @main.route('/')
+@page_cache.cached
 def index():
     return render_template('main/index.html')
 
 @main.route('/philosophy')
+@page_cache.cached
 def philosophy():
     return render_template('main/philosophy.html')
\ No newline at end of file
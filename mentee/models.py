@@ -26,6 +26,9 @@ class UserIdentity(db.Model):
 class JournalEntry(db.Model):
     __tablename__ = 'journal_entries'
 
+    # Energy states offered by the calendar mood dock
+    MOODS = ('fire', 'happy', 'calm', 'neutral', 'stressed')
+
     # Structured Data
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -37,14 +40,20 @@ class JournalEntry(db.Model):
     
     # Content
     content = db.Column(JSON_TYPE)
+    text_signature = db.Column(db.LargeBinary)  # MinHash of content text (anti-autopilot)
     
     is_gap_day = db.Column(db.Boolean, default=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Optimistic concurrency: every ORM UPDATE checks and bumps it (served as the ETag)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
     __table_args__ = (
         db.UniqueConstraint('user_id', 'date', name='uix_user_journal_date'),
         Index('idx_user_date', 'user_id', 'date'),
+        Index('idx_user_updated', 'user_id', 'updated_at'),
     )
+    __mapper_args__ = {'version_id_col': version}
 
     def to_dict(self):
         return {
@@ -52,9 +61,30 @@ class JournalEntry(db.Model):
             "mood": self.mood,
             "score": self.performance_score,
             "content": self.content or {},
-            "updated_at": self.updated_at.isoformat()
+            "updated_at": self.updated_at.isoformat(),
+            "version": self.version
         }
 
+class JournalDraft(db.Model):
+    """
+    Debounced autosave for one journal day, shared by every worker (see autosave_queue).
+    The merged fields apply on top of entry version expected_version (0 = no row yet)
+    and will produce expected_version + 1. conflict is set when the flush found the
+    entry moved; the key's next PATCH reports it and drops the draft.
+    """
+    __tablename__ = 'journal_drafts'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.String(10), primary_key=True)
+    fields = db.Column(JSON_TYPE, nullable=False)
+    expected_version = db.Column(db.Integer, nullable=False)
+    conflict = db.Column(db.Boolean, nullable=False, default=False, server_default='0')
+    first_at = db.Column(db.DateTime, nullable=False)
+    last_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_draft_last', 'last_at'),
+    )
+
 class DrillSession(db.Model):
     __tablename__ = 'drill_sessions'
     id = db.Column(db.Integer, primary_key=True)
@@ -65,4 +95,146 @@ class DrillSession(db.Model):
     level_reached = db.Column(db.Integer)
     duration_seconds = db.Column(db.Integer)
     meta_data = db.Column(JSON_TYPE) 
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_user_drill', 'user_id', 'drill_id'),
+        Index('idx_user_session', 'user_id', 'id'),
+    )
+
+class SyncTombstone(db.Model):
+    """
+    One row per deleted journal entry / drill session, so delta-sync clients can drop
+    their local copy. Written by the ORM delete listeners in sync_engine; the
+    autoincrement id is the sync cursor.
+    """
+    __tablename__ = 'sync_tombstones'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    entity = db.Column(db.String(16), nullable=False)      # 'journal' | 'drill'
+    entity_key = db.Column(db.String(64), nullable=False)  # journal date or drill session id
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_tombstone_user', 'user_id', 'id'),
+    )
+
+class DrillSampleSet(db.Model):
+    """
+    Per-trial samples for one drill session, stored columnar:
+    reaction_ms is packed little-endian float32, hits is a packed bit array.
+    """
+    __tablename__ = 'drill_sample_sets'
+    session_id = db.Column(db.Integer, db.ForeignKey('drill_sessions.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    drill_id = db.Column(db.String(50), nullable=False)
+    n_trials = db.Column(db.Integer, nullable=False)
+    reaction_ms = db.Column(db.LargeBinary, nullable=False)
+    hits = db.Column(db.LargeBinary, nullable=False)
+
+    session = db.relationship('DrillSession', backref=db.backref('samples', uselist=False))
+
+    __table_args__ = (
+        Index('idx_samples_user_drill', 'user_id', 'drill_id', 'session_id'),
+    )
+
+class DrillPersonalBest(db.Model):
+    """
+    One row per (user, drill), maintained by save_drill_session.
+    idx_drill_best keeps each drill's bests sorted for leaderboards and percentile ranks.
+    """
+    __tablename__ = 'drill_personal_bests'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    drill_id = db.Column(db.String(50), primary_key=True)
+    best_score = db.Column(db.Integer, nullable=False)
+    sessions = db.Column(db.Integer, nullable=False, default=0)
+    achieved_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user = db.relationship('User')
+
+    __table_args__ = (
+        Index('idx_drill_best', 'drill_id', 'best_score'),
+    )
+
+class PerformanceRollup(db.Model):
+    """
+    Incrementally maintained per-user journal statistics.
+    Updated in the same transaction as the journal save, so insights are a single PK read.
+    """
+    __tablename__ = 'performance_rollups'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+
+    # Welford running stats over every non-null performance_score
+    count = db.Column(db.Integer, nullable=False, default=0)
+    mean = db.Column(db.Float, nullable=False, default=0.0)
+    m2 = db.Column(db.Float, nullable=False, default=0.0)
+
+    # Ring of the most recent entries: [[date, score], ...] newest first
+    recent_scores = db.Column(JSON_TYPE, default=list)
+
+    # Consecutive days ending at last_entry_date, and the best run ever (see StreakEngine)
+    streak_length = db.Column(db.Integer, nullable=False, default=0)
+    last_entry_date = db.Column(db.String(10))
+    longest_streak = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_rollup_streak', 'streak_length', 'last_entry_date'),
+    )
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+class DrillAnalyticsSnapshot(db.Model):
+    """
+    Nightly-precomputed DrillAnalyticsEngine.analyze report (default window) per (user, drill).
+    Fresh while no sample set newer than source_session_id exists.
+    """
+    __tablename__ = 'drill_analytics_snapshots'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    drill_id = db.Column(db.String(50), primary_key=True)
+    source_session_id = db.Column(db.Integer, nullable=False)
+    report = db.Column(JSON_TYPE, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class TrendReport(db.Model):
+    """Nightly CohortEngine trend report per user (the coach-report view of analyze_trends)."""
+    __tablename__ = 'trend_reports'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    report = db.Column(JSON_TYPE, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobRun(db.Model):
+    """
+    One nightly job execution. (job, run_date) is unique, so exactly one process
+    claims a night's run; a failed or stalled run is resumed from its job_chunks.
+    """
+    __tablename__ = 'job_runs'
+    id = db.Column(db.Integer, primary_key=True)
+    job = db.Column(db.String(50), nullable=False)
+    run_date = db.Column(db.String(10), nullable=False)  # YYYY-MM-DD (UTC night)
+    status = db.Column(db.String(16), nullable=False, default='running')  # running | done | failed
+    owner = db.Column(db.String(100))
+    chunks_total = db.Column(db.Integer, nullable=False, default=0)
+    rows_affected = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=1)
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Float)
+
+    __table_args__ = (
+        db.UniqueConstraint('job', 'run_date', name='uix_job_run_date'),
+    )
+
+class JobChunk(db.Model):
+    """A finished chunk of a JobRun; its presence is what makes a resumed run skip it."""
+    __tablename__ = 'job_chunks'
+    run_id = db.Column(db.Integer, db.ForeignKey('job_runs.id'), primary_key=True)
+    chunk = db.Column(db.Integer, primary_key=True)
+    rows_affected = db.Column(db.Integer, nullable=False, default=0)
+    duration_ms = db.Column(db.Float, nullable=False, default=0.0)
+    finished_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,136 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how i in is it its of on or that the this to was "
+    "were what when where which who why will with you your".split()
+)
+
+
+def tokenize(text: str) -> list:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class ArticleIndex:
+    """
+    Inverted index with BM25 ranking over the Mental Edge library.
+
+    Built once from the article dicts; field weights fold into term frequency
+    (title hits count more than body hits). Also carries the hash indexes the
+    library views need: id -> article, category -> articles, facet -> doc ids.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    FIELD_WEIGHTS = {"title": 3.0, "subtitle": 2.0, "badges": 2.0, "heading": 1.5, "body": 1.0}
+    FACETS = ("category", "sport", "level", "type")
+
+    def __init__(self, articles: list):
+        self.articles = list(articles)
+        self.by_id = {a["id"]: a for a in self.articles}
+        self.by_category = defaultdict(list)
+        self.facets = {f: defaultdict(set) for f in self.FACETS}
+
+        self.postings = defaultdict(dict)   # term -> {doc_idx: weighted tf}
+        self.doc_len = []
+
+        for idx, article in enumerate(self.articles):
+            self.by_category[article.get("category")].append(article)
+            for facet in self.FACETS:
+                self.facets[facet][article.get(facet)].add(idx)
+
+            length = 0.0
+            for field, text in self._fields(article):
+                weight = self.FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    self.postings[term][idx] = self.postings[term].get(idx, 0.0) + weight
+                    length += weight
+            self.doc_len.append(length)
+
+        n = len(self.articles)
+        self.avg_len = (sum(self.doc_len) / n) if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    @staticmethod
+    def _fields(article):
+        """Yields (field, text) for every searchable part; content shapes vary by article type."""
+        yield "title", article.get("title")
+        yield "subtitle", article.get("subtitle")
+        yield "badges", " ".join(article.get("badges", []))
+
+        content = article.get("content") or {}
+        for key in ("intro", "context", "takeaway"):
+            if content.get(key):
+                yield "body", content[key]
+        for section in content.get("sections", []):
+            yield "heading", section.get("heading")
+            yield "body", section.get("body")
+        for moment in content.get("moments", []):
+            yield "heading", moment.get("time")
+            yield "body", moment.get("analysis")
+        for rule in content.get("rules", []):
+            yield "heading", rule.get("rule")
+            yield "body", rule.get("desc")
+
+    # --- Lookups ---
+
+    def get(self, article_id):
+        return self.by_id.get(article_id)
+
+    def related(self, article, limit: int = 3) -> list:
+        return [a for a in self.by_category.get(article["category"], []) if a["id"] != article["id"]][:limit]
+
+    def _candidates(self, filters: dict):
+        """Intersection of the requested facet sets (None = no filtering)."""
+        allowed = None
+        for facet, value in (filters or {}).items():
+            if facet not in self.facets or not value:
+                continue
+            docs = self.facets[facet].get(value, set())
+            allowed = docs if allowed is None else allowed & docs
+        return allowed
+
+    def search(self, query: str, filters: dict = None, limit: int = 10) -> dict:
+        """
+        BM25 over the query terms, restricted to the facet filters.
+        An empty query lists the filtered library in its original order.
+        Facet counts describe the filtered result set.
+        """
+        allowed = self._candidates(filters)
+        terms = tokenize(query)
+
+        if terms:
+            scores = defaultdict(float)
+            for term in set(terms):
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = self.idf[term]
+                for idx, tf in docs.items():
+                    if allowed is not None and idx not in allowed:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * self.doc_len[idx] / self.avg_len)
+                    scores[idx] += idf * tf * (self.K1 + 1) / (tf + norm)
+            matched = scores.keys()
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        else:
+            matched = range(len(self.articles)) if allowed is None else sorted(allowed)
+            ranked = [(idx, None) for idx in list(matched)[:limit]]
+
+        facet_counts = {f: defaultdict(int) for f in self.FACETS}
+        for idx in matched:
+            for facet in self.FACETS:
+                facet_counts[facet][self.articles[idx].get(facet)] += 1
+
+        return {
+            "total": len(matched),
+            "results": [(self.articles[idx], score) for idx, score in ranked],
+            "facets": {f: dict(counts) for f, counts in facet_counts.items()}
+        }
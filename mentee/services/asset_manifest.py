@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import os
+import threading
+from flask import abort, request, url_for as flask_url_for
+
+try:
+    import brotli
+except ImportError:  # pinned in requirements.txt; without it assets are served gzip-only
+    brotli = None
+
+
+class AssetManifest:
+    """
+    Content-hashed URLs for the CSS/JS bundle with precompressed variants.
+
+    url_for('static', filename='css/style.css') in templates resolves to
+    /assets/css/style.<hash>.css, served with an immutable Cache-Control.
+    gzip and brotli bodies are compressed ahead of time, when the manifest is built
+    (once per worker boot), and kept in memory; requests never compress.
+    """
+
+    MIN_COMPRESS_BYTES = 512
+    MIMETYPES = {".css": "text/css; charset=utf-8", ".js": "application/javascript; charset=utf-8"}
+
+    def __init__(self, app=None):
+        self.app = None
+        self._by_source = {}   # "css/style.css" -> hashed name
+        self._by_hashed = {}   # hashed name -> {"source", "mtime", "etag", "identity", "gzip", "br"}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSET_FINGERPRINT', True)
+        app.config.setdefault('ASSET_DIRS', ['css', 'js'])
+        self.app = app
+        self.scan()
+        app.add_url_rule('/assets/<path:filename>', 'hashed_asset', self._serve)
+        app.jinja_env.globals['url_for'] = self.url_for
+        app.extensions['asset_manifest'] = self
+
+    # --- Manifest ---
+
+    def _fingerprint(self, rel_path: str):
+        full = os.path.join(self.app.static_folder, rel_path)
+        with open(full, 'rb') as fh:
+            body = fh.read()
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        stem, ext = os.path.splitext(rel_path)
+        hashed = f"{stem}.{digest}{ext}"
+        entry = {"source": rel_path, "mtime": os.path.getmtime(full), "etag": digest,
+                 "identity": body, "gzip": None, "br": None}
+        if len(body) >= self.MIN_COMPRESS_BYTES:
+            entry["gzip"] = gzip.compress(body, 9)
+            if brotli is not None:
+                entry["br"] = brotli.compress(body, quality=11)
+        with self._lock:
+            old = self._by_source.get(rel_path)
+            if old and old != hashed:
+                self._by_hashed.pop(old, None)
+            self._by_source[rel_path] = hashed
+            self._by_hashed[hashed] = entry
+        return hashed
+
+    def scan(self):
+        for folder in self.app.config['ASSET_DIRS']:
+            base = os.path.join(self.app.static_folder, folder)
+            for root, _, files in os.walk(base):
+                for name in files:
+                    if os.path.splitext(name)[1] in self.MIMETYPES:
+                        rel = os.path.relpath(os.path.join(root, name), self.app.static_folder)
+                        self._fingerprint(rel.replace(os.sep, '/'))
+
+    def resolve(self, filename: str):
+        """Hashed name for a static path, or None if it is not a managed asset."""
+        hashed = self._by_source.get(filename)
+        if hashed and self.app.debug:
+            # Pick up edits without a restart while developing
+            full = os.path.join(self.app.static_folder, filename)
+            if os.path.getmtime(full) != self._by_hashed[hashed]["mtime"]:
+                hashed = self._fingerprint(filename)
+        return hashed
+
+    def url_for(self, endpoint, **values):
+        """Template url_for: static CSS/JS resolve to fingerprinted URLs."""
+        if endpoint == 'static' and self.app.config['ASSET_FINGERPRINT']:
+            hashed = self.resolve(values.get('filename', ''))
+            if hashed:
+                values['filename'] = hashed
+                return flask_url_for('hashed_asset', **values)
+        return flask_url_for(endpoint, **values)
+
+    # --- Serving ---
+
+    def _serve(self, filename):
+        entry = self._by_hashed.get(filename)
+        if not entry:
+            abort(404)
+
+        encoding = None
+        accepted = request.accept_encodings
+        if entry["br"] is not None and accepted['br']:
+            encoding = 'br'
+        elif entry["gzip"] is not None and accepted['gzip']:
+            encoding = 'gzip'
+
+        body = entry[encoding] if encoding else entry["identity"]
+        response = self.app.response_class(body, mimetype=None)
+        response.headers['Content-Type'] = self.MIMETYPES[os.path.splitext(filename)[1]]
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        response.set_etag(f"{entry['etag']}-{encoding or 'id'}")
+        return response.make_conditional(request)
+
+
+asset_manifest = AssetManifest()
@@ -0,0 +1,284 @@
+import atexit
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from mentee.models import JournalDraft, JournalEntry, db
+from mentee.services.journal_patch import CONTENT_FIELDS, JournalPatchEngine, VersionConflict
+
+
+class AutosaveCoalescer:
+    """
+    Server-side debounce for journal autosaves.
+
+    PATCHes sent with ?autosave=1 are merged per (user_id, date) into one
+    journal_drafts row (later fields win) and written to journal_entries once the
+    key has been quiet for AUTOSAVE_DEBOUNCE_MS, or AUTOSAVE_MAX_DELAY_MS after its
+    first edit. A burst of keystrokes or slider moves becomes a single versioned
+    UPDATE, rollup/FTS refresh and sync change. Drafts live in the database, so
+    every worker sees the same pending edit and any worker's flusher can write it.
+
+    A draft applies on top of entry version expected_version and produces
+    expected_version + 1. That promised version is the key's live version: the 202
+    hands it to the client as its next If-Match, GET and 409 bodies serve it, and an
+    If-Match for the row underneath is stale. An explicit save folds the draft in;
+    a full POST or a delete drops it. A flush that finds the entry moved keeps the
+    draft flagged, and the key's next PATCH gets 409 with the current row.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._exit_hook = False
+        self.counters = {
+            "submitted": 0,
+            "coalesced": 0,
+            "rejected_full": 0,
+            "writes": 0,
+            "conflicts": 0,
+            "conflicts_reported": 0,
+            "flush_errors": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('AUTOSAVE_COALESCE', True)
+        app.config.setdefault('AUTOSAVE_DEBOUNCE_MS', 1500)
+        app.config.setdefault('AUTOSAVE_MAX_DELAY_MS', 10000)
+        app.config.setdefault('AUTOSAVE_MAX_PENDING', 10000)
+        self.app = app
+        self._stopping = False
+        app.extensions['autosave_queue'] = self
+
+    @property
+    def enabled(self):
+        return bool(self.app and self.app.config['AUTOSAVE_COALESCE'])
+
+    # --- Reads ---
+
+    @staticmethod
+    def _load(user_id: int, date_str: str, lock: bool = False):
+        entry = JournalEntry.query.filter_by(user_id=user_id, date=date_str).first()
+        drafts = JournalDraft.query.filter_by(user_id=user_id, date=date_str)
+        draft = (drafts.with_for_update() if lock else drafts).first()
+        return entry, draft
+
+    @staticmethod
+    def _stale(entry, draft) -> bool:
+        """The draft's flush failed, or will: the entry moved past the version it was built on."""
+        return draft.conflict or (entry.version if entry else 0) != draft.expected_version
+
+    @staticmethod
+    def view(entry, draft):
+        """The key as clients see it: the entry with a live draft applied, at its promised version."""
+        if draft is None or AutosaveCoalescer._stale(entry, draft):
+            return entry.to_dict() if entry else None
+        data = entry.to_dict() if entry else {
+            "date": draft.date, "mood": None, "score": None,
+            "content": {"micro_win": "", "reflection": "", "brain_dump_mode": False},
+        }
+        content = dict(data["content"])
+        for field, value in draft.fields.items():
+            if field in CONTENT_FIELDS:
+                content[field] = value
+            else:
+                data[field] = value
+        data.update(content=content, updated_at=draft.last_at.isoformat(),
+                    version=draft.expected_version + 1, pending=True)
+        return data
+
+    def current(self, user_id: int, date_str: str):
+        """view() for one key, or None when there is neither an entry nor a draft."""
+        return self.view(*self._load(user_id, date_str))
+
+    # --- Producer side ---
+
+    def _report_conflict(self, entry, draft):
+        """Drops a stale draft (committed, so the 409 is reported once) and raises."""
+        db.session.delete(draft)
+        db.session.commit()
+        self.counters["conflicts_reported"] += 1
+        raise VersionConflict(entry)
+
+    def submit(self, user_id: int, date_str: str, fields: dict, client_version: int = None):
+        """
+        Merges a validated diff into the key's draft and commits it.
+        client_version is the If-Match (None: last writer wins per field); it must equal
+        the live version. Returns {"pending_fields", "version"} with the version the
+        draft will produce, or None when coalescing is off or full (caller writes inline).
+        Raises VersionConflict for a stale If-Match or a draft whose flush conflicted.
+        """
+        if not self.enabled or self._stopping:
+            return None
+        for attempt in range(2):
+            now = datetime.utcnow()
+            entry, draft = self._load(user_id, date_str, lock=True)
+            if draft is not None and self._stale(entry, draft):
+                self._report_conflict(entry, draft)
+            live = draft.expected_version + 1 if draft else (entry.version if entry else 0)
+            if client_version is not None and client_version != live:
+                raise VersionConflict(entry)
+
+            if draft is None:
+                if db.session.query(func.count()).select_from(JournalDraft).scalar() >= \
+                        self.app.config['AUTOSAVE_MAX_PENDING']:
+                    db.session.rollback()
+                    self.counters["rejected_full"] += 1
+                    return None
+                draft = JournalDraft(user_id=user_id, date=date_str, fields=dict(fields),
+                                     expected_version=live, first_at=now, last_at=now)
+                db.session.add(draft)
+            else:
+                draft.fields = {**draft.fields, **fields}   # reassign: in-place JSON edits are not tracked
+                draft.last_at = now
+                self.counters["coalesced"] += 1
+            try:
+                db.session.commit()
+            except IntegrityError:
+                # Another worker created this key's draft first; merge into it
+                db.session.rollback()
+                continue
+            break
+        else:
+            raise VersionConflict(entry)
+
+        self.counters["submitted"] += 1
+        self._ensure_thread()
+        return {"pending_fields": sorted(draft.fields), "version": draft.expected_version + 1}
+
+    def take(self, user_id: int, date_str: str, client_version: int = None):
+        """
+        For an explicit save: removes the key's draft in the caller's transaction.
+        Returns (fields, expected_version) to hand to JournalPatchEngine.apply, so the
+        save writes the draft's promised version. Raises VersionConflict like submit().
+        """
+        entry, draft = self._load(user_id, date_str, lock=True)
+        if draft is None:
+            return {}, client_version
+        if self._stale(entry, draft):
+            self._report_conflict(entry, draft)
+        if client_version is not None and client_version != draft.expected_version + 1:
+            raise VersionConflict(entry)
+        fields, expected = dict(draft.fields), draft.expected_version
+        db.session.execute(delete(JournalDraft).where(JournalDraft.user_id == user_id,
+                                                      JournalDraft.date == date_str))
+        return fields, expected
+
+    def discard(self, user_id: int, date_str: str):
+        """Drops the key's draft in the caller's transaction (full save / delete)."""
+        db.session.execute(delete(JournalDraft).where(JournalDraft.user_id == user_id,
+                                                      JournalDraft.date == date_str))
+
+    # --- Consumer side ---
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            if not self._exit_hook:
+                # Only processes that submitted a draft flush on exit (not init_db.py, job runners, benchmarks)
+                atexit.register(self.shutdown)
+                self._exit_hook = True
+            self._thread = threading.Thread(target=self._run, name='autosave-coalescer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.app.config['AUTOSAVE_DEBOUNCE_MS'] / 4000)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception("Autosave flusher pass failed")
+
+    def _due(self, force: bool) -> list:
+        now = datetime.utcnow()
+        quiet = timedelta(milliseconds=self.app.config['AUTOSAVE_DEBOUNCE_MS'])
+        max_delay = timedelta(milliseconds=self.app.config['AUTOSAVE_MAX_DELAY_MS'])
+        query = db.session.query(JournalDraft.user_id, JournalDraft.date, JournalDraft.fields,
+                                 JournalDraft.expected_version, JournalDraft.last_at)\
+            .filter(JournalDraft.conflict.is_(False))
+        if not force:
+            query = query.filter(or_(JournalDraft.last_at <= now - quiet,
+                                     JournalDraft.first_at <= now - max_delay))
+        due = query.order_by(JournalDraft.last_at).all()
+        db.session.rollback()
+        return due
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Writes every draft that is due (all of them when force), one short transaction each.
+        A draft is claimed by deleting it as last seen, so a concurrent edit or another
+        worker's flusher makes this one skip it.
+        """
+        written = 0
+        started = time.perf_counter()
+        with self.app.app_context():
+            due = self._due(force)
+            if not due:
+                return 0
+            for user_id, date_str, fields, expected, seen in due:
+                key = (JournalDraft.user_id == user_id, JournalDraft.date == date_str,
+                       JournalDraft.last_at == seen)
+                try:
+                    if not db.session.execute(delete(JournalDraft).where(*key)).rowcount:
+                        db.session.rollback()
+                        continue
+                    entry, changed, _ = JournalPatchEngine.apply(user_id, date_str, fields, expected)
+                    if not changed and entry.version == expected:
+                        # The draft netted out (5 -> 6 -> 5), but the client already holds
+                        # expected + 1 as its If-Match: touch the row so the version moves
+                        entry.updated_at = datetime.utcnow()
+                    db.session.commit()
+                    written += 1
+                except (VersionConflict, StaleDataError):
+                    db.session.rollback()
+                    db.session.execute(update(JournalDraft).where(*key).values(conflict=True))
+                    db.session.commit()
+                    self.counters["conflicts"] += 1
+                    self.app.logger.warning("Autosave for user %s on %s conflicted: entry changed since version %s",
+                                            user_id, date_str, expected)
+                except Exception:
+                    db.session.rollback()
+                    self.counters["flush_errors"] += 1
+                    self.app.logger.exception("Autosave flush failed for user %s on %s", user_id, date_str)
+            db.session.remove()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.counters["writes"] += written
+        self.counters["last_flush_ms"] = round(elapsed, 2)
+        self.counters["max_flush_ms"] = round(max(self.counters["max_flush_ms"], elapsed), 2)
+        return written
+
+    def shutdown(self):
+        """Flush-on-exit hook (registered with atexit when the flusher thread first starts)."""
+        if self.app is None or self._stopping:
+            return
+        self._stopping = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush(force=True)
+
+    def stats(self) -> dict:
+        writes = self.counters["writes"]
+        with self.app.app_context():
+            pending = db.session.query(func.count()).select_from(JournalDraft).scalar()
+            db.session.remove()
+        return {
+            **self.counters,
+            "pending": pending,
+            "saves_per_write": round(self.counters["submitted"] / writes, 2) if writes else 0.0,
+        }
+
+
+autosave_queue = AutosaveCoalescer()
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import aliased
+from mentee.models import JournalEntry, TrendReport, User, db
+from mentee.services.journal_engine import PerformanceEngine
+
+
+class CohortEngine:
+    """
+    Batch counterpart of PerformanceEngine.analyze_trends for coach reports.
+    One query, columnar frame, group operations -- no per-user round trips.
+    The nightly trend_reports job runs it per chunk of users; report() serves the result.
+    """
+
+    @staticmethod
+    def report(user_id: int):
+        """Last night's trend report (single PK read), or None before the first run."""
+        row = db.session.get(TrendReport, user_id)
+        if row is None:
+            return None
+        return {**row.report, "computed_at": row.computed_at.isoformat()}
+
+    @staticmethod
+    def load_recent(user_ids=None, window: int = None) -> pd.DataFrame:
+        """
+        Pulls the newest `window` entries per user as (user_id, date, performance_score).
+        A materialized per-user cutoff turns the fetch into one idx_user_date range seek
+        per user instead of a window function over every row in the table.
+        """
+        window = window or PerformanceEngine.TREND_WINDOW
+        inner = aliased(JournalEntry)
+        cutoff = select(inner.date)\
+            .where(inner.user_id == User.id)\
+            .order_by(inner.date.desc())\
+            .limit(1).offset(window - 1)\
+            .scalar_subquery()
+
+        cuts = select(User.id.label('user_id'), func.coalesce(cutoff, '').label('cutoff'))
+        if user_ids is not None:
+            cuts = cuts.where(User.id.in_(list(user_ids)))
+        cuts = cuts.cte('cutoffs').prefix_with('MATERIALIZED')
+
+        stmt = select(JournalEntry.user_id, JournalEntry.date, JournalEntry.performance_score)\
+            .join(cuts, and_(JournalEntry.user_id == cuts.c.user_id,
+                             JournalEntry.date >= cuts.c.cutoff))\
+            .order_by(JournalEntry.user_id, JournalEntry.date.desc())
+
+        return pd.read_sql_query(stmt, db.session.connection())
+
+    @staticmethod
+    def compute(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized trend math over a (user_id, date, performance_score) frame
+        already sorted newest-first within each user. Returns one row per user.
+        """
+        if frame.empty:
+            return pd.DataFrame(columns=['entries', 'sample_size', 'mean', 'volatility', 'newest', 'oldest'])
+
+        entries = frame.groupby('user_id', sort=True).size().rename('entries')
+
+        scored = frame.dropna(subset=['performance_score'])
+        scores = scored['performance_score'].astype(np.float64)
+        groups = scores.groupby(scored['user_id'], sort=True)
+
+        mean = groups.transform('mean')
+        sq_dev = (scores - mean) ** 2
+
+        stats = pd.DataFrame({
+            'sample_size': groups.size(),
+            'mean': groups.mean(),
+            'volatility': np.sqrt(sq_dev.groupby(scored['user_id'], sort=True).mean()),
+            'newest': groups.first(),
+            'oldest': groups.last(),
+        })
+        return stats.join(entries, how='right')
+
+    @staticmethod
+    def _grade(stats: pd.DataFrame) -> pd.DataFrame:
+        trend = np.select(
+            [stats['newest'] > stats['oldest'] * 1.1, stats['newest'] < stats['oldest'] * 0.9],
+            ['Ascending', 'Decaying'],
+            default='Stable'
+        )
+        grade = np.select(
+            [stats['volatility'] < 0.8, stats['volatility'] < 1.5],
+            ['Elite', 'Stable'],
+            default='Volatile'
+        )
+        return stats.assign(trend_vector=trend, consistency_grade=grade)
+
+    @staticmethod
+    def analyze_trends_batch(user_ids=None) -> dict:
+        """
+        {user_id: report} with the exact shape analyze_trends returns per user.
+        Users with no entries at all are reported as insufficient_data if requested.
+        """
+        if user_ids is not None:
+            user_ids = list(user_ids)
+        stats = CohortEngine._grade(CohortEngine.compute(CohortEngine.load_recent(user_ids)))
+
+        reports = {}
+        ok = (stats['entries'] >= 3) & stats['sample_size'].notna()
+        for row in stats[ok].itertuples():
+            reports[int(row.Index)] = {
+                "status": "success",
+                "current_mean": round(float(row.mean), 1),
+                "volatility_index": round(float(row.volatility), 2),
+                "trend_vector": row.trend_vector,
+                "consistency_grade": row.consistency_grade,
+                "sample_size": int(row.sample_size)
+            }
+
+        missing = set(user_ids) if user_ids is not None else set()
+        missing |= {int(uid) for uid in stats.index[~ok]}
+        for uid in missing - reports.keys():
+            reports[uid] = {"status": "insufficient_data"}
+        return reports
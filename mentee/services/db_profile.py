@@ -0,0 +1,142 @@
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from mentee.models import db
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check a connection out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = {"checkouts": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "timeouts": 0}
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.wait_stats["timeouts"] += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self.wait_stats["checkouts"] += 1
+                self.wait_stats["wait_ms_total"] += waited
+                self.wait_stats["wait_ms_max"] = max(self.wait_stats["wait_ms_max"], waited)
+
+
+class DatabaseProfile:
+    """
+    Engine tuning per backend, selected by DB_PROFILE ('auto' picks from the URL).
+
+    sqlite: WAL, busy_timeout, synchronous=NORMAL and mmap via connect pragmas,
+            so concurrent journal saves wait for the writer instead of failing
+            with "database is locked".
+    server: sized pool with pre-ping and recycle for PostgreSQL/MySQL.
+
+    Owns db.init_app() because pool options must be in place before
+    Flask-SQLAlchemy builds the engine.
+    """
+
+    PROFILES = ('sqlite', 'server')
+
+    def __init__(self, app=None):
+        self.app = None
+        self.profile = None
+        self.counters = {"connections_opened": 0, "connections_closed": 0, "invalidated": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DB_PROFILE', 'auto')
+        app.config.setdefault('SQLITE_BUSY_TIMEOUT_MS', 5000)
+        app.config.setdefault('SQLITE_SYNCHRONOUS', 'NORMAL')
+        app.config.setdefault('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+        app.config.setdefault('DB_POOL_SIZE', 10)
+        app.config.setdefault('DB_MAX_OVERFLOW', 20)
+        app.config.setdefault('DB_POOL_TIMEOUT', 30)
+        app.config.setdefault('DB_POOL_RECYCLE', 1800)
+        self.app = app
+
+        url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        self.profile = self._select(app.config['DB_PROFILE'], url)
+        # Copied so a class-level dict on the config object is never mutated
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+        if self.profile == 'sqlite':
+            # Python-side wait for the file lock; the pragma below covers SQLite's own busy handler
+            connect_args = dict(options.get('connect_args') or {})
+            connect_args.setdefault('timeout', app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+            options['connect_args'] = connect_args
+            if url.database not in (None, '', ':memory:'):
+                options.setdefault('poolclass', TimedQueuePool)
+        else:
+            options.setdefault('poolclass', TimedQueuePool)
+            options.setdefault('pool_size', app.config['DB_POOL_SIZE'])
+            options.setdefault('max_overflow', app.config['DB_MAX_OVERFLOW'])
+            options.setdefault('pool_timeout', app.config['DB_POOL_TIMEOUT'])
+            options.setdefault('pool_recycle', app.config['DB_POOL_RECYCLE'])
+            options.setdefault('pool_pre_ping', True)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+        db.init_app(app)
+        with app.app_context():
+            self._listen(db.engine)
+        app.extensions['db_profile'] = self
+
+    @classmethod
+    def _select(cls, requested: str, url) -> str:
+        if requested in cls.PROFILES:
+            return requested
+        if requested != 'auto':
+            raise ValueError(f"DB_PROFILE must be 'auto' or one of {cls.PROFILES}, got {requested!r}")
+        return 'sqlite' if url.get_backend_name() == 'sqlite' else 'server'
+
+    def _listen(self, engine):
+        config = self.app.config
+
+        @event.listens_for(engine, 'connect')
+        def _on_connect(dbapi_conn, record):
+            self.counters["connections_opened"] += 1
+            if self.profile != 'sqlite':
+                return
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}")
+            cursor.execute(f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}")
+            cursor.execute(f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}")
+            cursor.close()
+
+        @event.listens_for(engine, 'close')
+        def _on_close(dbapi_conn, record):
+            self.counters["connections_closed"] += 1
+
+        @event.listens_for(engine, 'invalidate')
+        def _on_invalidate(dbapi_conn, record, exception):
+            self.counters["invalidated"] += 1
+
+    def stats(self) -> dict:
+        """Pool occupancy and checkout wait for the default engine."""
+        with self.app.app_context():
+            engine = db.engine
+        pool = engine.pool
+        out = {"profile": self.profile, "dialect": engine.dialect.name, "pool": type(pool).__name__,
+               **self.counters}
+        if isinstance(pool, QueuePool):
+            out.update({"pool_size": pool.size(), "checked_out": pool.checkedout(),
+                        "checked_in": pool.checkedin(), "overflow": pool.overflow()})
+        if isinstance(pool, TimedQueuePool):
+            waits = dict(pool.wait_stats)
+            waits["wait_ms_avg"] = round(waits["wait_ms_total"] / waits["checkouts"], 3) if waits["checkouts"] else 0.0
+            waits["wait_ms_total"] = round(waits["wait_ms_total"], 3)
+            waits["wait_ms_max"] = round(waits["wait_ms_max"], 3)
+            out.update(waits)
+        return out
+
+
+db_profile = DatabaseProfile()
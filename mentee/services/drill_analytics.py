@@ -0,0 +1,160 @@
+import numpy as np
+from mentee.models import DrillAnalyticsSnapshot, DrillSampleSet, db
+
+
+class DrillAnalyticsEngine:
+    """
+    Per-trial reaction samples: compact storage and vectorized cross-session analytics.
+    Reads are capped at MAX_SESSIONS x MAX_TRIALS, so cost is bounded however long
+    an athlete's history gets.
+    """
+
+    MAX_TRIALS = 2000
+    MAX_SESSIONS = 2000
+    DEFAULT_SESSIONS = 200
+    CURVE_POINTS = 100
+    PERCENTILES = (10, 25, 50, 75, 90)
+
+    # --- Storage ---
+
+    @staticmethod
+    def pack_samples(samples):
+        """
+        {"reaction_ms": [...], "hits": [...]} -> DrillSampleSet column values.
+        Returns None when no samples were sent; raises ValueError on bad input.
+        """
+        if not samples:
+            return None
+        if not isinstance(samples, dict):
+            raise ValueError('samples must be an object')
+
+        try:
+            rt = np.asarray(samples.get('reaction_ms') or [], dtype=np.float32)
+            hits = np.asarray(samples.get('hits') or [], dtype=bool)
+        except (TypeError, ValueError):
+            raise ValueError('samples must hold numeric arrays')
+
+        if rt.ndim != 1 or rt.shape != hits.shape:
+            raise ValueError('reaction_ms and hits must be equal-length lists')
+        if not rt.size:
+            return None
+        if rt.size > DrillAnalyticsEngine.MAX_TRIALS:
+            raise ValueError(f'At most {DrillAnalyticsEngine.MAX_TRIALS} trials per session')
+        if not np.all(np.isfinite(rt)) or np.any(rt < 0):
+            raise ValueError('reaction_ms must be finite and non-negative')
+
+        return {
+            'n_trials': int(rt.size),
+            'reaction_ms': rt.astype('<f4').tobytes(),
+            'hits': np.packbits(hits).tobytes()
+        }
+
+    @staticmethod
+    def unpack(sample_set):
+        rt = np.frombuffer(sample_set.reaction_ms, dtype='<f4')
+        hits = np.unpackbits(np.frombuffer(sample_set.hits, dtype=np.uint8), count=sample_set.n_trials).astype(bool)
+        return rt, hits
+
+    # --- Analytics ---
+
+    @staticmethod
+    def _load(user_id: int, drill_id: str, sessions: int):
+        rows = db.session.query(DrillSampleSet.n_trials, DrillSampleSet.reaction_ms, DrillSampleSet.hits)\
+            .filter(DrillSampleSet.user_id == user_id, DrillSampleSet.drill_id == drill_id)\
+            .order_by(DrillSampleSet.session_id.desc())\
+            .limit(sessions).all()
+        rows.reverse()  # chronological
+
+        counts = np.fromiter((r.n_trials for r in rows), dtype=np.int64, count=len(rows))
+        rt = np.frombuffer(b''.join(r.reaction_ms for r in rows), dtype='<f4').astype(np.float64)
+        hits = np.concatenate([
+            np.unpackbits(np.frombuffer(r.hits, dtype=np.uint8), count=r.n_trials) for r in rows
+        ]).astype(bool) if rows else np.zeros(0, dtype=bool)
+        return counts, rt, hits
+
+    @staticmethod
+    def _downsample(values: np.ndarray, points: int) -> np.ndarray:
+        """Averages consecutive sessions into at most `points` buckets (NaN-aware)."""
+        if values.size <= points:
+            return values
+        buckets = np.array_split(values, points)
+        return np.array([np.nanmean(b) if np.any(~np.isnan(b)) else np.nan for b in buckets])
+
+    @staticmethod
+    def snapshot(user_id: int, drill_id: str):
+        """
+        The nightly report for the default window if no sample set has landed since
+        (one idx_samples_user_drill seek), else None.
+        """
+        snap = db.session.get(DrillAnalyticsSnapshot, (user_id, drill_id))
+        if snap is None:
+            return None
+        newer = db.session.query(DrillSampleSet.session_id)\
+            .filter(DrillSampleSet.user_id == user_id, DrillSampleSet.drill_id == drill_id,
+                    DrillSampleSet.session_id > snap.source_session_id).first()
+        if newer is not None:
+            return None
+        return {**snap.report, "snapshot_at": snap.computed_at.isoformat()}
+
+    @staticmethod
+    def analyze(user_id: int, drill_id: str, sessions: int = None) -> dict:
+        sessions = max(1, min(sessions or DrillAnalyticsEngine.DEFAULT_SESSIONS, DrillAnalyticsEngine.MAX_SESSIONS))
+        counts, rt, hits = DrillAnalyticsEngine._load(user_id, drill_id, sessions)
+        if not counts.size:
+            return {"status": "insufficient_data"}
+
+        n_sessions = counts.size
+        group = np.repeat(np.arange(n_sessions), counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        trial = (np.arange(rt.size) - np.repeat(starts, counts)).astype(np.float64)
+
+        # Learning curve: per-session hit rate and mean response time on hits
+        hit_rate = np.bincount(group, weights=hits, minlength=n_sessions) / counts
+        hit_n = np.bincount(group[hits], minlength=n_sessions)
+        hit_rt_sum = np.bincount(group[hits], weights=rt[hits], minlength=n_sessions)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_rt = hit_rt_sum / hit_n
+
+        # Fatigue: per-session OLS slope of response time vs trial index (hits only)
+        g, x, y = group[hits], trial[hits], rt[hits]
+        n = hit_n.astype(np.float64)
+        sx = np.bincount(g, weights=x, minlength=n_sessions)
+        sy = hit_rt_sum
+        sxx = np.bincount(g, weights=x * x, minlength=n_sessions)
+        sxy = np.bincount(g, weights=x * y, minlength=n_sessions)
+        denom = n * sxx - sx * sx
+        valid = (n >= 3) & (denom > 0)
+        slopes = (n[valid] * sxy[valid] - sx[valid] * sy[valid]) / denom[valid]
+
+        # Learning slope: change in mean response time per session
+        curve_ok = ~np.isnan(mean_rt)
+        learning_slope = None
+        if curve_ok.sum() >= 2:
+            learning_slope = float(np.polyfit(np.arange(n_sessions)[curve_ok], mean_rt[curve_ok], 1)[0])
+
+        hit_rts = rt[hits]
+        points = DrillAnalyticsEngine.CURVE_POINTS
+
+        def _clean(arr):
+            return [None if np.isnan(v) else round(float(v), 2) for v in arr]
+
+        return {
+            "status": "success",
+            "sessions": int(n_sessions),
+            "trials": int(rt.size),
+            "hit_rate": round(float(hits.mean()), 3),
+            "reaction_percentiles_ms": {
+                f"p{p}": round(float(v), 1)
+                for p, v in zip(DrillAnalyticsEngine.PERCENTILES,
+                                np.percentile(hit_rts, DrillAnalyticsEngine.PERCENTILES))
+            } if hit_rts.size else None,
+            "learning_curve": {
+                "mean_reaction_ms": _clean(DrillAnalyticsEngine._downsample(mean_rt, points)),
+                "hit_rate": _clean(DrillAnalyticsEngine._downsample(hit_rate, points))
+            },
+            "learning_slope_ms_per_session": round(learning_slope, 3) if learning_slope is not None else None,
+            "fatigue_slope_ms_per_trial": {
+                "mean": round(float(slopes.mean()), 3),
+                "median": round(float(np.median(slopes)), 3)
+            } if slopes.size else None
+        }
@@ -0,0 +1,195 @@
+import atexit
+import queue
+import threading
+import time
+from sqlalchemy import insert
+from mentee.models import DrillSampleSet, DrillSession, db
+from mentee.services.leaderboard_engine import LeaderboardEngine
+
+
+class DrillWriteBehind:
+    """
+    Coalesces drill session inserts from concurrent requests into periodic bulk commits.
+
+    The buffer is a bounded queue: when it is full, enqueue() refuses and the caller
+    writes synchronously, so memory never grows past DRILL_QUEUE_MAX rows.
+    The flusher thread starts lazily (after gunicorn forks) and drains on exit.
+    A batch that fails to commit is bisected, so one bad row is dropped (and logged)
+    without taking other users' sessions with it.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._exit_hook = False
+        self.counters = {
+            "enqueued": 0,
+            "rejected_full": 0,
+            "flushed_rows": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "dropped_rows": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('DRILL_WRITE_BEHIND', True)
+        app.config.setdefault('DRILL_QUEUE_MAX', 10000)
+        app.config.setdefault('DRILL_FLUSH_INTERVAL', 1.0)
+        app.config.setdefault('DRILL_FLUSH_BATCH', 500)
+        self.app = app
+        self._stopping = False
+        self._queue = queue.Queue(maxsize=app.config['DRILL_QUEUE_MAX'])
+        app.extensions['drill_queue'] = self
+
+    @property
+    def enabled(self):
+        return bool(self.app and self.app.config['DRILL_WRITE_BEHIND'])
+
+    # --- Producer side ---
+
+    def enqueue(self, rows: list) -> bool:
+        """
+        Buffers validated DrillSession column dicts. All-or-nothing: returns False
+        (nothing queued) when the batch does not fit, so the caller can write it inline.
+        """
+        if not self.enabled or self._stopping:
+            return False
+        with self._lock:
+            if self._queue.maxsize - self._queue.qsize() < len(rows):
+                self.counters["rejected_full"] += len(rows)
+                return False
+            for row in rows:
+                self._queue.put_nowait(row)
+            self.counters["enqueued"] += len(rows)
+        self._ensure_thread()
+        if self._queue.qsize() >= self.app.config['DRILL_FLUSH_BATCH']:
+            self._wake.set()
+        return True
+
+    # --- Consumer side ---
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            if not self._exit_hook:
+                # Only processes that queued a row flush on exit (not init_db.py, job runners, benchmarks)
+                atexit.register(self.shutdown)
+                self._exit_hook = True
+            self._thread = threading.Thread(target=self._run, name='drill-write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.app.config['DRILL_FLUSH_INTERVAL'])
+            self._wake.clear()
+            self.flush()
+
+    def _drain(self) -> list:
+        rows = []
+        limit = self.app.config['DRILL_FLUSH_BATCH']
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, rows: list) -> int:
+        """Commits rows, bisecting on failure until the bad rows are isolated. Returns rows written."""
+        try:
+            write_sessions(rows)
+            return len(rows)
+        except Exception:
+            db.session.rollback()
+            if len(rows) == 1:
+                self.counters["dropped_rows"] += 1
+                self.app.logger.exception("Drill flush dropped a session for user %s (%s)",
+                                          rows[0].get("user_id"), rows[0].get("drill_id"))
+                return 0
+        mid = len(rows) // 2
+        return self._write(rows[:mid]) + self._write(rows[mid:])
+
+    def flush(self) -> int:
+        """Writes everything currently buffered, one bulk commit per DRILL_FLUSH_BATCH rows."""
+        written = 0
+        with self.app.app_context():
+            while True:
+                rows = self._drain()
+                if not rows:
+                    break
+                started = time.perf_counter()
+                try:
+                    done = self._write(rows)
+                    written += done
+                    self.counters["flushed_rows"] += done
+                    if done < len(rows):
+                        self.counters["flush_errors"] += 1
+                finally:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    self.counters["flushes"] += 1
+                    self.counters["last_flush_ms"] = round(elapsed, 2)
+                    self.counters["max_flush_ms"] = round(max(self.counters["max_flush_ms"], elapsed), 2)
+                    self.counters["total_flush_ms"] += elapsed
+            db.session.remove()
+        return written
+
+    def shutdown(self):
+        """Flush-on-exit hook (registered with atexit when the flusher thread first starts)."""
+        if self.app is None or self._stopping:
+            return
+        self._stopping = True
+        self._wake.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self) -> dict:
+        flushes = self.counters["flushes"]
+        return {
+            **self.counters,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self._queue.maxsize if self._queue else 0,
+            "avg_flush_ms": round(self.counters["total_flush_ms"] / flushes, 2) if flushes else 0.0,
+        }
+
+
+def write_sessions(rows: list):
+    """
+    Bulk-inserts session dicts and folds them into personal bests in one commit.
+    Rows carrying packed trial samples get their ids back via RETURNING.
+    """
+    def columns(row):
+        return {k: v for k, v in row.items() if k != "samples"}
+
+    plain = [r for r in rows if not r.get("samples")]
+    sampled = [r for r in rows if r.get("samples")]
+
+    if plain:
+        db.session.execute(insert(DrillSession), [columns(r) for r in plain])
+    if sampled:
+        ids = db.session.scalars(
+            insert(DrillSession).returning(DrillSession.id, sort_by_parameter_order=True),
+            [columns(r) for r in sampled]
+        ).all()
+        db.session.execute(insert(DrillSampleSet), [
+            {"session_id": sid, "user_id": r["user_id"], "drill_id": r["drill_id"], **r["samples"]}
+            for sid, r in zip(ids, sampled)
+        ])
+
+    LeaderboardEngine.record_sessions((r["user_id"], r["drill_id"], r["score"]) for r in rows)
+    db.session.commit()
+
+
+drill_queue = DrillWriteBehind()
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import tempfile
+import threading
+from markupsafe import Markup, escape
+from flask import abort, current_app, send_from_directory, url_for
+
+
+class ImagePipeline:
+    """
+    Resized WebP/JPEG derivatives of static artwork with content-hashed names.
+
+    Derivatives live in IMAGE_CACHE_DIR and are produced lazily on first request
+    (or ahead of time by build_images.py). Because the name embeds a hash of the
+    source bytes and encode settings, responses are cached as immutable.
+    """
+
+    WIDTHS = (320, 640, 960, 1280)
+    FORMATS = {"webp": ("WEBP", "image/webp"), "jpg": ("JPEG", "image/jpeg")}
+    QUALITY = 80
+    SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+    def __init__(self, app=None):
+        self.app = None
+        self._sources = {}      # rel path -> (mtime, size, digest, width)
+        self._derivatives = {}  # derivative filename -> (rel path, width, ext)
+        self._scanned = None    # source folder mtimes at the last full scan
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('IMAGE_CACHE_DIR', os.path.join(app.instance_path, 'image_cache'))
+        app.config.setdefault('IMAGE_SOURCE_DIRS', ['img'])
+        self.app = app
+        app.add_url_rule('/media/img/<name>', 'image_derivative', self._serve)
+        app.add_template_global(self.responsive_img)
+        app.extensions['image_pipeline'] = self
+
+    @property
+    def cache_dir(self):
+        return self.app.config['IMAGE_CACHE_DIR']
+
+    # --- Naming ---
+
+    def _source(self, rel_path: str):
+        """Digest and pixel width of a static image, memoized on (mtime, size)."""
+        full = os.path.join(self.app.static_folder, rel_path)
+        st = os.stat(full)
+        cached = self._sources.get(rel_path)
+        if cached and cached[:2] == (st.st_mtime, st.st_size):
+            return cached
+
+        from PIL import Image
+        with open(full, 'rb') as fh:
+            digest = hashlib.sha1(fh.read()).hexdigest()
+        with Image.open(full) as im:
+            width = im.width
+        entry = (st.st_mtime, st.st_size, digest, width)
+        self._sources[rel_path] = entry
+        return entry
+
+    def variants(self, rel_path: str, ext: str):
+        """[(width, filename)] for every target width not larger than the source."""
+        _, _, digest, src_width = self._source(rel_path)
+        stem = os.path.splitext(os.path.basename(rel_path))[0]
+        tag = hashlib.sha1(f"{digest}|{ext}|{self.QUALITY}".encode()).hexdigest()[:10]
+
+        widths = [w for w in self.WIDTHS if w < src_width] + [min(src_width, self.WIDTHS[-1])]
+        out = []
+        for w in sorted(set(widths)):
+            name = f"{stem}-{w}w-{tag}.{ext}"
+            self._derivatives[name] = (rel_path, w, ext)
+            out.append((w, name))
+        return out
+
+    # --- Generation ---
+
+    def render(self, name: str) -> str:
+        """Ensures the derivative exists on disk; returns its path."""
+        target = os.path.join(self.cache_dir, name)
+        if os.path.exists(target):
+            return target
+
+        rel_path, width, ext = self._derivatives[name]
+        pil_format = self.FORMATS[ext][0]
+
+        from PIL import Image
+        with self._lock:
+            if os.path.exists(target):
+                return target
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with Image.open(os.path.join(self.app.static_folder, rel_path)) as im:
+                im = im.convert('RGB')
+                if im.width > width:
+                    im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+                options = {"method": 6} if ext == 'webp' else {"optimize": True, "progressive": True}
+                fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.' + ext)
+                try:
+                    with os.fdopen(fd, 'wb') as fh:
+                        im.save(fh, pil_format, quality=self.QUALITY, **options)
+                    os.replace(tmp, target)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+        return target
+
+    def build(self, rel_paths) -> list:
+        """Eagerly renders every derivative (build step). Returns the filenames."""
+        names = []
+        for rel_path in rel_paths:
+            for ext in self.FORMATS:
+                for _, name in self.variants(rel_path, ext):
+                    self.render(name)
+                    names.append(name)
+        return names
+
+    def sources(self):
+        """Every image under the IMAGE_SOURCE_DIRS static subfolders."""
+        for folder in self.app.config['IMAGE_SOURCE_DIRS']:
+            base = os.path.join(self.app.static_folder, folder)
+            for entry in sorted(os.listdir(base)) if os.path.isdir(base) else []:
+                if os.path.splitext(entry)[1].lower() in self.SOURCE_EXTENSIONS:
+                    yield f"{folder}/{entry}"
+
+    def _source_dirs_signature(self):
+        folders = []
+        for folder in self.app.config['IMAGE_SOURCE_DIRS']:
+            try:
+                folders.append(os.stat(os.path.join(self.app.static_folder, folder)).st_mtime)
+            except OSError:
+                folders.append(None)
+        return tuple(folders)
+
+    def _resolve(self, name):
+        # Another worker may have rendered the page that linked this name. Rescan only when
+        # a source folder changed since the last scan, so unknown names (404 probes) cost a stat
+        if name not in self._derivatives:
+            signature = self._source_dirs_signature()
+            if signature != self._scanned:
+                for rel_path in self.sources():
+                    for ext in self.FORMATS:
+                        self.variants(rel_path, ext)
+                self._scanned = signature
+        return self._derivatives.get(name)
+
+    def _serve(self, name):
+        if not self._resolve(name):
+            abort(404)
+        self.render(name)
+        response = send_from_directory(self.cache_dir, name, mimetype=self.FORMATS[self._derivatives[name][2]][1])
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+    # --- Template helper ---
+
+    def srcset(self, rel_path: str, ext: str) -> str:
+        return ", ".join(
+            f"{url_for('image_derivative', name=name)} {w}w" for w, name in self.variants(rel_path, ext)
+        )
+
+    def responsive_img(self, rel_path: str, alt: str = "", sizes: str = "100vw", **attrs):
+        """
+        <picture> with a WebP srcset and a JPEG fallback; falls back to the original
+        static file if the source cannot be read.
+        """
+        extra = Markup("").join(
+            Markup(' {}="{}"').format(k.rstrip('_').replace('_', '-'), v) for k, v in attrs.items()
+        )
+        try:
+            webp = self.srcset(rel_path, 'webp')
+            jpg_variants = self.variants(rel_path, 'jpg')
+        except (OSError, ValueError):
+            current_app.logger.warning("responsive_img: cannot read %s", rel_path)
+            return Markup('<img src="{}" alt="{}"{}>').format(url_for('static', filename=rel_path), alt, extra)
+
+        jpg = ", ".join(f"{url_for('image_derivative', name=name)} {w}w" for w, name in jpg_variants)
+        fallback = url_for('image_derivative', name=jpg_variants[len(jpg_variants) // 2][1])
+        return Markup(
+            '<picture class="responsive">'
+            '<source type="image/webp" srcset="{webp}" sizes="{sizes}">'
+            '<img src="{fallback}" srcset="{jpg}" sizes="{sizes}" alt="{alt}"{extra}>'
+            '</picture>'
+        ).format(webp=webp, jpg=jpg, sizes=sizes, fallback=fallback, alt=escape(alt), extra=extra)
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,299 @@
+import hmac
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from flask import abort, jsonify, request
+from sqlalchemy import func, or_, update
+from sqlalchemy.exc import IntegrityError
+from mentee.models import JobChunk, JobRun, db
+from mentee.services.nightly_jobs import JOBS
+
+
+class RunTakenOver(RuntimeError):
+    """Another process claimed this run (its heartbeat looked stale); this one must stop writing."""
+
+
+class JobScheduler:
+    """
+    Brokerless nightly batch runner.
+
+    Every job splits its work into fixed id-range chunks that run on a
+    JOBS_WORKERS thread pool, each in its own transaction together with a
+    job_chunks marker. The (job, run_date) row in job_runs is the lock: one
+    process claims a night's run, and a failed run (or one whose heartbeat is
+    older than JOBS_STALE_SECONDS) is taken over and resumed from its finished
+    chunks. While a run is in progress a timer refreshes its heartbeat every
+    JOBS_STALE_SECONDS / 3, however long a chunk takes, and every chunk commit
+    and the final status write check that this process still owns the run.
+    Runs come from the in-process thread (JOBS_ENABLED, at JOBS_RUN_AT
+    UTC, started by the first request so it survives a gunicorn fork) or from
+    `python run_jobs.py` under cron. Progress and timings are served at /jobs/status
+    to callers bearing JOBS_TOKEN (the endpoint 404s while no token is configured).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.running = None       # job name while this process runs one
+        self.next_run_at = None
+        self.counters = {"runs": 0, "runs_failed": 0, "runs_skipped": 0, "runs_taken_over": 0, "chunks": 0,
+                         "chunks_resumed": 0, "last_run_ms": 0.0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_ENABLED', False)
+        app.config.setdefault('JOBS_RUN_AT', '03:00')        # UTC
+        app.config.setdefault('JOBS_WORKERS', 4)
+        app.config.setdefault('JOBS_CHUNK_SIZE', 500)        # users (or tombstone ids) per chunk
+        app.config.setdefault('JOBS_STALE_SECONDS', 900)
+        app.config.setdefault('JOBS_TOKEN', None)             # /jobs/status is off without a token
+        self.app = app
+        app.add_url_rule('/jobs/status', 'job_status', self._serve_status)
+        app.extensions['job_scheduler'] = self
+        if app.config['JOBS_ENABLED']:
+            app.before_request(self._ensure_thread)
+
+    @property
+    def owner(self) -> str:
+        # Read per call: workers forked from a preloaded app must not share the parent's pid
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    # --- Claiming ---
+
+    def _claim(self, job: str, run_date: str, force: bool):
+        """Returns this process's JobRun for (job, run_date), or None if it is done or owned by a live run."""
+        run = JobRun.query.filter_by(job=job, run_date=run_date).first()
+        if run is None:
+            try:
+                run = JobRun(job=job, run_date=run_date, status='running', owner=self.owner)
+                db.session.add(run)
+                db.session.commit()
+                return run
+            except IntegrityError:
+                db.session.rollback()
+                run = JobRun.query.filter_by(job=job, run_date=run_date).first()
+
+        if run.status == 'done' and not force:
+            return None
+        stale = datetime.utcnow() - timedelta(seconds=self.app.config['JOBS_STALE_SECONDS'])
+        takeover = update(JobRun).where(JobRun.id == run.id)
+        if not force:
+            takeover = takeover.where(or_(JobRun.status == 'failed', JobRun.heartbeat_at < stale))
+        claimed = db.session.execute(takeover.values(
+            status='running', owner=self.owner, heartbeat_at=datetime.utcnow(), attempts=JobRun.attempts + 1,
+            error=None, finished_at=None)).rowcount
+        if not claimed:
+            db.session.rollback()
+            return None
+        if force and run.status == 'done':
+            JobChunk.query.filter_by(run_id=run.id).delete()   # a forced re-run starts from scratch
+        db.session.commit()
+        db.session.refresh(run)
+        return run
+
+    # --- Running ---
+
+    def _beat(self, run_id: int):
+        """Refreshes the run's heartbeat if this process still owns it (caller commits). Raises RunTakenOver."""
+        owned = db.session.execute(update(JobRun).where(JobRun.id == run_id, JobRun.owner == self.owner)
+                                   .values(heartbeat_at=datetime.utcnow())).rowcount
+        if not owned:
+            raise RunTakenOver(f"Run {run_id} is now owned by another process")
+
+    def _heartbeat(self, run_id: int, stop: threading.Event):
+        """Keeps a long chunk from looking stalled to other processes."""
+        interval = max(1.0, self.app.config['JOBS_STALE_SECONDS'] / 3)
+        while not stop.wait(interval):
+            with self.app.app_context():
+                try:
+                    self._beat(run_id)
+                    db.session.commit()
+                except RunTakenOver:
+                    db.session.rollback()
+                    return
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Heartbeat for job run %s failed", run_id)
+                finally:
+                    db.session.remove()
+
+    def _run_chunk(self, run_id: int, job: str, chunk: int, size: int, run_date: str) -> int:
+        with self.app.app_context():
+            try:
+                started = time.perf_counter()
+                rows = JOBS[job]["run"](chunk, size, run_date) or 0
+                db.session.add(JobChunk(run_id=run_id, chunk=chunk, rows_affected=rows,
+                                        duration_ms=round((time.perf_counter() - started) * 1000, 3)))
+                self._beat(run_id)
+                db.session.commit()
+                return rows
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+
+    def run_job(self, job: str, run_date: str = None, force: bool = False) -> dict:
+        """Claims and runs (or resumes) one job for run_date. Must be called inside an app context."""
+        run_date = run_date or datetime.utcnow().date().isoformat()
+        run = self._claim(job, run_date, force)
+        if run is None:
+            self.counters["runs_skipped"] += 1
+            return {"job": job, "run_date": run_date, "status": "skipped"}
+
+        started = time.perf_counter()
+        self.running = job
+        run_id, done = run.id, set()
+        size = self.app.config['JOBS_CHUNK_SIZE']
+        spec = JOBS[job]
+        status, error, rows = 'done', None, None
+        stop = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(run_id, stop), name=f'job-{job}-heartbeat',
+                         daemon=True).start()
+        try:
+            chunks_total = run.chunks_total = spec["chunks"](size)
+            db.session.commit()
+            done = {c for (c,) in db.session.query(JobChunk.chunk).filter_by(run_id=run_id)}
+            pending = [k for k in range(chunks_total) if k not in done]
+            self.counters["chunks_resumed"] += len(done)
+
+            with ThreadPoolExecutor(max_workers=self.app.config['JOBS_WORKERS'],
+                                    thread_name_prefix=f'job-{job}') as pool:
+                futures = [pool.submit(self._run_chunk, run_id, job, k, size, run_date) for k in pending]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        self.counters["chunks"] += 1
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            if "finish" in spec:
+                self._beat(run_id)
+                db.session.commit()
+                spec["finish"](run_date)
+            rows = db.session.query(func.coalesce(func.sum(JobChunk.rows_affected), 0))\
+                .filter_by(run_id=run_id).scalar()
+        except RunTakenOver:
+            db.session.rollback()
+            status = 'taken_over'
+        except Exception as e:
+            db.session.rollback()
+            status, error = 'failed', repr(e)[:2000]
+            self.app.logger.exception("Nightly job %s (%s) failed; the next run resumes it", job, run_date)
+        finally:
+            stop.set()
+            self.running = None
+
+        elapsed = (time.perf_counter() - started) * 1000
+        values = {"status": status, "error": error, "finished_at": datetime.utcnow(), "duration_ms": round(elapsed, 3)}
+        if status == 'done':
+            values["rows_affected"] = rows
+        # Only the owner records the outcome; a process that lost the run leaves it to the new owner
+        if status == 'taken_over' or not db.session.execute(
+                update(JobRun).where(JobRun.id == run_id, JobRun.owner == self.owner).values(**values)).rowcount:
+            db.session.rollback()
+            self.counters["runs_taken_over"] += 1
+            self.app.logger.warning("Nightly job %s (%s) was taken over by another process", job, run_date)
+            return {"job": job, "run_date": run_date, "status": "taken_over", "chunks": run.chunks_total,
+                    "resumed_chunks": None, "rows": None, "ms": round(elapsed, 1), "error": None}
+        db.session.commit()
+        self.counters["runs" if status == 'done' else "runs_failed"] += 1
+        self.counters["last_run_ms"] = round(elapsed, 2)
+        return {"job": job, "run_date": run_date, "status": status, "chunks": run.chunks_total,
+                "resumed_chunks": len(done) if status == 'done' else None,
+                "rows": rows, "ms": round(elapsed, 1), "error": error}
+
+    def run_all(self, run_date: str = None, jobs=None, force: bool = False) -> list:
+        """Runs the nightly jobs in order. Must be called inside an app context."""
+        unknown = set(jobs or ()) - JOBS.keys()
+        if unknown:
+            raise ValueError(f"Unknown job(s): {', '.join(sorted(unknown))}")
+        return [self.run_job(job, run_date, force) for job in JOBS if not jobs or job in jobs]
+
+    # --- In-process schedule ---
+
+    def _next_run(self, now: datetime) -> datetime:
+        hour, minute = (int(part) for part in self.app.config['JOBS_RUN_AT'].split(':'))
+        at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return at if at > now else at + timedelta(days=1)
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name='job-scheduler', daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        # Catch up first: tonight's run may have been interrupted (claims skip finished jobs)
+        now = datetime.utcnow()
+        due = self._next_run(now) - timedelta(days=1)
+        while True:
+            if due <= now:
+                try:
+                    with self.app.app_context():
+                        self.run_all(due.date().isoformat())
+                        db.session.remove()
+                except Exception:
+                    self.app.logger.exception("Nightly job run aborted")
+            now = datetime.utcnow()
+            self.next_run_at = due = self._next_run(now)
+            time.sleep(max(1.0, (due - now).total_seconds()))
+            now = datetime.utcnow()
+
+    # --- Status ---
+
+    def status(self) -> dict:
+        """Latest run per job with chunk progress and timings."""
+        latest = db.session.query(func.max(JobRun.id)).group_by(JobRun.job)
+        runs = JobRun.query.filter(JobRun.id.in_(latest.scalar_subquery())).all()
+        chunk_stats = {
+            run_id: (n, avg, top) for run_id, n, avg, top in db.session.query(
+                JobChunk.run_id, func.count(), func.avg(JobChunk.duration_ms), func.max(JobChunk.duration_ms))
+            .filter(JobChunk.run_id.in_([r.id for r in runs])).group_by(JobChunk.run_id)
+        }
+        jobs = {}
+        for run in runs:
+            n, avg, top = chunk_stats.get(run.id, (0, None, None))
+            jobs[run.job] = {
+                "run_date": run.run_date, "status": run.status, "owner": run.owner, "attempts": run.attempts,
+                "chunks_done": n, "chunks_total": run.chunks_total,
+                "progress": round(n / run.chunks_total, 4) if run.chunks_total else (1.0 if run.status == 'done' else 0.0),
+                "rows_affected": run.rows_affected,
+                "avg_chunk_ms": round(avg, 3) if avg is not None else None,
+                "max_chunk_ms": round(top, 3) if top is not None else None,
+                "started_at": run.started_at.isoformat() if run.started_at else None,
+                "heartbeat_at": run.heartbeat_at.isoformat() if run.heartbeat_at else None,
+                "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+                "duration_ms": run.duration_ms, "error": run.error,
+            }
+        return {
+            "scheduler": {"enabled": self.app.config['JOBS_ENABLED'], "run_at_utc": self.app.config['JOBS_RUN_AT'],
+                          "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+                          "running_here": self.running, "owner": self.owner},
+            "jobs": {job: jobs.get(job) for job in JOBS},
+        }
+
+    def _serve_status(self):
+        # Hostnames, pids and job errors are operator-only
+        token = self.app.config['JOBS_TOKEN']
+        if not token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            abort(403)
+        return jsonify(self.status())
+
+    def stats(self) -> dict:
+        return {**self.counters, "running": self.running is not None}
+
+
+job_scheduler = JobScheduler()
@@ -1,7 +1,43 @@
-import difflib
+import re
+import zlib
+from itertools import combinations
 import numpy as np
 from sqlalchemy import desc
-from mentee.models import JournalEntry, UserIdentity, db
+from mentee.models import JournalEntry, db
+from mentee.services.user_cache import user_cache
+
+# Fixed MinHash parameters: signatures must stay comparable across restarts
+_MINHASH_RNG = np.random.default_rng(20240611)
+_MINHASH_A = _MINHASH_RNG.integers(1, 2**63, size=64, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _MINHASH_RNG.integers(0, 2**63, size=64, dtype=np.uint64)
+
+# ==========================================
+# IDENTITY PROMPT TABLE
+# ==========================================
+# Base Protocol (Night Closure)
+_BASE_PROMPTS = (
+    {"id": "win", "label": "Tactical Victory", "placeholder": "One specific execution win..."},
+    {"id": "fix", "label": "Mechanical Failure", "placeholder": "One error to correct tomorrow..."},
+)
+
+# Archetype Injection: trait -> extra prompt (table order is render order)
+_TRAIT_PROMPTS = {
+    "Stoic": {"id": "id_stoic", "label": "Emotional Override", "placeholder": "Where did you suppress impulse today?"},
+    "Aggressive": {"id": "id_aggressive", "label": "Hesitation Audit", "placeholder": "Did you strike when the window opened?"},
+    "Analytical": {"id": "id_analytical", "label": "Data Divergence", "placeholder": "What outcome defied your prediction?"},
+}
+
+
+def _compile_schemas():
+    """Every trait subset -> tuple of plain prompt dicts, built once (never handed out directly)."""
+    registry = {}
+    for size in range(len(_TRAIT_PROMPTS) + 1):
+        for combo in combinations(sorted(_TRAIT_PROMPTS), size):
+            registry[combo] = _BASE_PROMPTS + tuple(_TRAIT_PROMPTS[t] for t in _TRAIT_PROMPTS if t in combo)
+    return registry
+
+
+_SCHEMA_REGISTRY = _compile_schemas()
 
 class PerformanceEngine:
     
@@ -13,6 +49,15 @@ class PerformanceEngine:
         'recovery': 0.15
     }
 
+    # Number of most recent entries the trend report looks at
+    TREND_WINDOW = 14
+
+    # Anti-autopilot: word 3-gram MinHash compared against the past week
+    WORD_RE = re.compile(r"\w+")
+    SHINGLE_SIZE = 3
+    AUTOPILOT_LOOKBACK = 7
+    AUTOPILOT_THRESHOLD = 0.6
+
     @staticmethod
     def compute_score(metrics: dict) -> float:
         """
@@ -31,55 +76,79 @@ class PerformanceEngine:
             return 0.0
 
     @staticmethod
-    def detect_autopilot(current_text: str, user_id: int) -> str:
+    def _shingles(text: str):
+        """Lowercased word 3-grams; short texts collapse to a single shingle."""
+        words = PerformanceEngine.WORD_RE.findall(text.lower())
+        k = PerformanceEngine.SHINGLE_SIZE
+        if len(words) <= k:
+            return {" ".join(words)} if words else set()
+        return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+    @staticmethod
+    def text_signature(text: str):
+        """
+        MinHash signature of the entry text (64 x uint32, packed into 256 bytes).
+        One pass over the shingles, so cost is linear in text length.
+        """
+        shingles = PerformanceEngine._shingles(text or "")
+        if not shingles:
+            return None
+
+        base = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                           dtype=np.uint64, count=len(shingles))
+        # Multiply-shift hashing: uint64 wraparound is the mod 2^64
+        hashed = (base[:, None] * _MINHASH_A + _MINHASH_B) >> np.uint64(32)
+        return hashed.min(axis=0).astype('<u4').tobytes()
+
+    @staticmethod
+    def signature_similarity(sig_a: bytes, sig_b: bytes) -> float:
+        """Estimated Jaccard similarity between two signatures."""
+        if not sig_a or not sig_b:
+            return 0.0
+        a = np.frombuffer(sig_a, dtype='<u4')
+        b = np.frombuffer(sig_b, dtype='<u4')
+        return float(np.mean(a == b))
+
+    @staticmethod
+    def detect_autopilot(current_text: str, user_id: int, signature: bytes = None, exclude_date: str = None) -> str:
         """
         Anti-Autopilot System.
-        Compares current entry text against the last entry to detect low-effort copy-pasting.
+        Compares the current entry's MinHash signature against the last AUTOPILOT_LOOKBACK
+        entries to detect low-effort copy-pasting across the week.
         """
         if not current_text or len(current_text) < 8:
             return 'autopilot' # Too short
 
-        last_entry = JournalEntry.query.filter_by(user_id=user_id)\
-            .order_by(desc(JournalEntry.date)).first()
-        
-        if last_entry and last_entry.reflection_data:
-            # Flatten previous dict values to string
-            prev_text = " ".join([str(v) for v in last_entry.reflection_data.values() if v])
-            
-            # Sequence Matcher: Ratio > 0.65 implies high similarity (copy-paste)
-            similarity = difflib.SequenceMatcher(None, current_text, prev_text).ratio()
-            
-            if similarity > 0.65:
+        signature = signature or PerformanceEngine.text_signature(current_text)
+
+        recent = db.session.query(JournalEntry.text_signature)\
+            .filter(JournalEntry.user_id == user_id, JournalEntry.text_signature.isnot(None))
+        if exclude_date:
+            recent = recent.filter(JournalEntry.date != exclude_date)
+        recent = recent.order_by(desc(JournalEntry.date)).limit(PerformanceEngine.AUTOPILOT_LOOKBACK)
+
+        # Estimated Jaccard > threshold implies copy-paste of an earlier entry
+        for (prev_sig,) in recent:
+            if PerformanceEngine.signature_similarity(signature, prev_sig) > PerformanceEngine.AUTOPILOT_THRESHOLD:
                 return 'autopilot'
-        
+
         return 'high_entropy'
 
+    @staticmethod
+    def schema_key(traits) -> tuple:
+        """Canonical registry key: known traits only, sorted, de-duplicated."""
+        return tuple(sorted(set(traits or ()) & _TRAIT_PROMPTS.keys()))
+
     @staticmethod
     def get_identity_schema(user_id: int):
         """
-        Generates dynamic prompts based on the user's psychological archetype.
+        Dynamic night-closure prompts for the user's psychological archetype.
+        The schema is compiled at import time; callers get a JSON-ready list of
+        copies, so the shared registry can never be mutated through them.
         """
-        identity = UserIdentity.query.filter_by(user_id=user_id).first()
-        
-        # Base Protocol (Night Closure)
-        base_schema = [
-            {"id": "win", "label": "Tactical Victory", "placeholder": "One specific execution win..."},
-            {"id": "fix", "label": "Mechanical Failure", "placeholder": "One error to correct tomorrow..."}
-        ]
-
-        if not identity or not identity.core_traits:
-            return base_schema
-
-        # Archetype Injection
-        traits = identity.core_traits
-        if "Stoic" in traits:
-            base_schema.append({"id": "id_check", "label": "Emotional Override", "placeholder": "Where did you suppress impulse today?"})
-        if "Aggressive" in traits:
-            base_schema.append({"id": "id_check", "label": "Hesitation Audit", "placeholder": "Did you strike when the window opened?"})
-        if "Analytical" in traits:
-            base_schema.append({"id": "id_check", "label": "Data Divergence", "placeholder": "What outcome defied your prediction?"})
-
-        return base_schema
+        snapshot = user_cache.get(user_id)
+        traits = snapshot.identity.core_traits if snapshot and snapshot.identity else ()
+        return [dict(prompt) for prompt in _SCHEMA_REGISTRY[PerformanceEngine.schema_key(traits)]]
 
     @staticmethod
     def analyze_trends(user_id: int):
@@ -89,14 +158,21 @@ class PerformanceEngine:
         """
         # Fetch last 14 entries (2 weeks)
         entries = JournalEntry.query.filter_by(user_id=user_id)\
-            .order_by(desc(JournalEntry.date)).limit(14).all()
+            .order_by(desc(JournalEntry.date)).limit(PerformanceEngine.TREND_WINDOW).all()
         
         if not entries or len(entries) < 3:
             return {"status": "insufficient_data"}
 
         # Extract non-null scores
         scores = [e.performance_score for e in entries if e.performance_score is not None]
-        
+        return PerformanceEngine.summarize_scores(scores)
+
+    @staticmethod
+    def summarize_scores(scores: list):
+        """
+        Shared math for the trend report.
+        Expects non-null scores ordered newest first.
+        """
         if not scores:
             return {"status": "insufficient_data"}
 
@@ -122,4 +198,4 @@ class PerformanceEngine:
             "trend_vector": trend,
             "consistency_grade": grade,
             "sample_size": len(scores)
-        }
\ No newline at end of file
+        }
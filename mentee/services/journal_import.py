@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from mentee.models import JournalEntry, db
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.rollup_engine import RollupEngine
+
+TRUTHY = {'1', 'true', 'yes', 'y', 'on'}
+
+
+class ImportEngine:
+    """
+    Streaming journal migration: parse -> validate -> chunked native upsert.
+    Only one chunk of rows is ever held in memory.
+    """
+
+    CHUNK_SIZE = 500
+    MAX_REPORTED_ERRORS = 100
+
+    # --- Parsers (generators of (line_no, record)) ---
+
+    @staticmethod
+    def parse_ndjson(stream):
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e.msg}")
+
+    @staticmethod
+    def parse_csv(stream):
+        # Header is line 1, so data rows start at 2
+        for line_no, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_no, row
+
+    @staticmethod
+    def parse(stream, fmt: str):
+        if fmt == 'csv':
+            return ImportEngine.parse_csv(stream)
+        if fmt == 'ndjson':
+            return ImportEngine.parse_ndjson(stream)
+        raise ValueError(f"Unsupported format '{fmt}' (use ndjson or csv)")
+
+    @staticmethod
+    def text_stream(binary):
+        """Wraps a binary stream (request body, open file) for line-by-line decoding."""
+        return io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+
+    # --- Validation ---
+
+    @staticmethod
+    def validate(record, user_id: int, now: datetime) -> dict:
+        """Normalizes one record into a journal_entries row. Raises ValueError."""
+        if isinstance(record, Exception):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError("Record must be an object")
+
+        date_str = record.get('date') or ''
+        if not isinstance(date_str, str):
+            raise ValueError(f"Date must be a string, got {type(date_str).__name__}")
+        try:
+            # Dates compare as strings everywhere, so store the zero-padded form ("2026-1-5" -> "2026-01-05")
+            date_str = datetime.strptime(date_str.strip(), '%Y-%m-%d').date().isoformat()
+        except ValueError:
+            raise ValueError(f"Bad date '{date_str}' (expected YYYY-MM-DD)")
+
+        mood = record.get('mood') or None
+        if mood is not None and (not isinstance(mood, str) or mood not in JournalEntry.MOODS):
+            raise ValueError(f"Unknown mood '{mood}'")
+
+        score = record.get('score', record.get('performance_score'))
+        if score is None or score == '':
+            score = None
+        elif isinstance(score, bool) or not isinstance(score, (int, float, str)) or \
+                (isinstance(score, float) and not score.is_integer()):
+            raise ValueError(f"Score '{score}' is not an integer")
+        else:
+            try:
+                score = int(score)
+            except (TypeError, ValueError):
+                raise ValueError(f"Score '{score}' is not an integer")
+            if not 1 <= score <= 10:
+                raise ValueError(f"Score {score} out of range 1-10")
+
+        brain_dump = record.get('brain_dump_mode')
+        if isinstance(brain_dump, str):
+            brain_dump = brain_dump.strip().lower() in TRUTHY
+        elif brain_dump is not None and not isinstance(brain_dump, (bool, int)):
+            raise ValueError(f"brain_dump_mode must be a boolean, got {type(brain_dump).__name__}")
+
+        for field in ('micro_win', 'reflection'):
+            value = record.get(field)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{field} must be a string, got {type(value).__name__}")
+
+        content = {
+            "micro_win": record.get('micro_win') or '',
+            "reflection": record.get('reflection') or '',
+            "brain_dump_mode": bool(brain_dump)
+        }
+        text = " ".join(v for v in (content["micro_win"], content["reflection"]) if v)
+
+        return {
+            "user_id": user_id,
+            "date": date_str,
+            "mood": mood,
+            "performance_score": score,
+            "content": content,
+            "text_signature": PerformanceEngine.text_signature(text),
+            "is_gap_day": False,
+            "updated_at": now
+        }
+
+    # --- Writes ---
+
+    @staticmethod
+    def _upsert(rows: list):
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            insert = postgresql.insert
+        elif dialect == 'sqlite':
+            insert = sqlite.insert
+        else:
+            raise RuntimeError(f"Bulk import needs ON CONFLICT support (got {dialect})")
+
+        stmt = insert(JournalEntry.__table__)
+        set_ = {col: stmt.excluded[col] for col in
+                ('mood', 'performance_score', 'content', 'text_signature', 'updated_at')}
+        # Core upserts bypass the ORM version counter, so bump it here for If-Match clients
+        set_['version'] = JournalEntry.__table__.c.version + 1
+        stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'date'], set_=set_)
+        db.session.execute(stmt, rows)
+        db.session.commit()
+
+    @staticmethod
+    def import_entries(user_id: int, records, chunk_size: int = None) -> dict:
+        """
+        Consumes a (line_no, record) iterable and upserts valid rows chunk by chunk.
+        Returns a report with throughput and the first MAX_REPORTED_ERRORS row errors.
+        A body that stops decoding or parsing part-way keeps the chunks already written
+        and is reported as stream_error.
+        """
+        chunk_size = chunk_size or ImportEngine.CHUNK_SIZE
+        started = time.perf_counter()
+        now = datetime.utcnow()
+
+        report = {"rows_read": 0, "rows_written": 0, "error_count": 0, "errors": [], "stream_error": None}
+        # Keyed by date: a repeated date inside one chunk keeps the last record,
+        # and Postgres refuses to touch the same row twice in one statement
+        pending = {}
+
+        def flush():
+            if pending:
+                ImportEngine._upsert(list(pending.values()))
+                report["rows_written"] += len(pending)
+                pending.clear()
+
+        last_line = 0
+        try:
+            try:
+                for line_no, record in records:
+                    last_line = line_no
+                    report["rows_read"] += 1
+                    try:
+                        row = ImportEngine.validate(record, user_id, now)
+                    except ValueError as e:
+                        report["error_count"] += 1
+                        if len(report["errors"]) < ImportEngine.MAX_REPORTED_ERRORS:
+                            report["errors"].append({"line": line_no, "error": str(e)})
+                        continue
+
+                    pending[row["date"]] = row
+                    if len(pending) >= chunk_size:
+                        flush()
+            except (csv.Error, UnicodeDecodeError) as e:
+                report["stream_error"] = {"after_line": last_line, "error": str(e)}
+            flush()
+        finally:
+            # Upserts bypass save_entry, so re-derive the rollup from whatever was committed,
+            # even when a later chunk or the stream itself failed
+            if report["rows_written"]:
+                db.session.rollback()
+                RollupEngine.rebuild(user_id)
+
+        elapsed = time.perf_counter() - started
+        report["seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows_read"] / elapsed, 1) if elapsed else None
+        return report
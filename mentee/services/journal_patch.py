@@ -0,0 +1,113 @@
+from datetime import datetime
+from mentee.models import JournalEntry, db
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.rollup_engine import RollupEngine
+
+# Patchable fields: column-backed, then keys inside the content JSON
+COLUMN_FIELDS = {'mood': 'mood', 'score': 'performance_score'}
+CONTENT_FIELDS = ('micro_win', 'reflection', 'brain_dump_mode')
+TEXT_FIELDS = ('micro_win', 'reflection')
+
+
+class VersionConflict(Exception):
+    """The entry moved past the version the client edited; carries the current row (or None if gone)."""
+
+    def __init__(self, entry):
+        super().__init__("Version conflict")
+        self.entry = entry
+
+
+class JournalPatchEngine:
+    """
+    Field-level journal updates.
+
+    Only the fields present in the diff are touched, so a score nudge never
+    rewrites the reflection text, re-fingerprints it or moves the rollup ring.
+    JournalEntry.version is the mapper's version_id_col: the explicit
+    expected-version check answers If-Match early, and the ORM's
+    UPDATE ... WHERE version = ? catches a writer that slips in before commit.
+    """
+
+    @staticmethod
+    def parse(data) -> dict:
+        """Validates a PATCH body into a field dict. Raises ValueError."""
+        if not isinstance(data, dict) or not data:
+            raise ValueError("Body must be a non-empty JSON object")
+        unknown = set(data) - set(COLUMN_FIELDS) - set(CONTENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+
+        fields = {}
+        if 'mood' in data:
+            if data['mood'] is not None and data['mood'] not in JournalEntry.MOODS:
+                raise ValueError(f"Mood must be one of {', '.join(JournalEntry.MOODS)}")
+            fields['mood'] = data['mood']
+        if 'score' in data:
+            score = data['score']
+            if score in (None, ''):
+                score = None
+            else:
+                try:
+                    score = int(score)
+                except (TypeError, ValueError):
+                    raise ValueError("Score must be an integer")
+                if not 1 <= score <= 10:
+                    raise ValueError("Score must be 1-10")
+            fields['score'] = score
+        for key in TEXT_FIELDS:
+            if key in data:
+                if not isinstance(data[key], str):
+                    raise ValueError(f"{key} must be a string")
+                fields[key] = data[key]
+        if 'brain_dump_mode' in data:
+            fields['brain_dump_mode'] = bool(data['brain_dump_mode'])
+        return fields
+
+    @staticmethod
+    def apply(user_id: int, date_str: str, fields: dict, expected_version: int = None):
+        """
+        Applies a parsed diff to one entry, creating it if needed (caller owns the commit).
+        Returns (entry, changed_fields, effort); effort is None unless the text changed.
+        Raises VersionConflict when expected_version is stale (0 expects no entry yet).
+        """
+        entry = JournalEntry.query.filter_by(user_id=user_id, date=date_str).first()
+        if expected_version is not None and (entry.version if entry else 0) != expected_version:
+            raise VersionConflict(entry)
+
+        is_new = entry is None
+        old_score = None if is_new else entry.performance_score
+        if is_new:
+            entry = JournalEntry(user_id=user_id, date=date_str,
+                                 content={"micro_win": "", "reflection": "", "brain_dump_mode": False})
+            db.session.add(entry)
+
+        changed = []
+        for field, column in COLUMN_FIELDS.items():
+            if field in fields and getattr(entry, column) != fields[field]:
+                setattr(entry, column, fields[field])
+                changed.append(field)
+
+        content = dict(entry.content or {})
+        for key in CONTENT_FIELDS:
+            if key in fields and content.get(key) != fields[key]:
+                content[key] = fields[key]
+                changed.append(key)
+        if any(key in changed for key in CONTENT_FIELDS):
+            entry.content = content   # reassign: in-place JSON edits are not tracked
+
+        if not changed and not is_new:
+            return entry, changed, None
+
+        # Every column is set before the first query below autoflushes, so the row is
+        # written (and its version bumped) exactly once
+        entry.updated_at = datetime.utcnow()
+        effort = None
+        if is_new or any(key in changed for key in TEXT_FIELDS):
+            text = " ".join(v for v in (content.get("micro_win"), content.get("reflection")) if v)
+            entry.text_signature = PerformanceEngine.text_signature(text)
+            effort = PerformanceEngine.detect_autopilot(text, user_id, signature=entry.text_signature,
+                                                        exclude_date=date_str)
+
+        if is_new or 'score' in changed:
+            RollupEngine.apply_entry(user_id, date_str, old_score, entry.performance_score, is_new)
+        return entry, changed, effort
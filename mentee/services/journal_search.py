@@ -0,0 +1,172 @@
+import re
+import time
+from markupsafe import escape
+from sqlalchemy import text
+from mentee.models import db
+
+# Highlight sentinels: FTS5 wraps matches in these, then we HTML-escape and swap in <mark>
+_OPEN, _CLOSE = '\x02', '\x03'
+_QUERY_RE = re.compile(r'"([^"]+)"|([\w]+\*?)', re.UNICODE)
+
+# owner holds a 'u<user_id>' token so the per-user filter is resolved inside the FTS index
+_TABLE_DDL = """CREATE VIRTUAL TABLE IF NOT EXISTS journal_fts USING fts5(
+        owner, micro_win, reflection,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    )"""
+
+# Triggers are dropped and recreated on every install so definition changes reach existing databases.
+# They delete-then-insert rather than INSERT OR REPLACE: inside an INSERT ... ON CONFLICT DO UPDATE
+# (the import upsert) SQLite overrides a trigger's OR REPLACE and the FTS insert fails.
+_TRIGGERS = {
+    "journal_fts_insert": """AFTER INSERT ON journal_entries BEGIN
+        DELETE FROM journal_fts WHERE rowid = new.id;
+        INSERT INTO journal_fts(rowid, owner, micro_win, reflection)
+        VALUES (new.id, 'u' || new.user_id,
+                json_extract(new.content, '$.micro_win'), json_extract(new.content, '$.reflection'));
+    END""",
+    "journal_fts_update": """AFTER UPDATE OF content ON journal_entries BEGIN
+        DELETE FROM journal_fts WHERE rowid = old.id;
+        INSERT INTO journal_fts(rowid, owner, micro_win, reflection)
+        VALUES (new.id, 'u' || new.user_id,
+                json_extract(new.content, '$.micro_win'), json_extract(new.content, '$.reflection'));
+    END""",
+    "journal_fts_delete": """AFTER DELETE ON journal_entries BEGIN
+        DELETE FROM journal_fts WHERE rowid = old.id;
+    END""",
+}
+
+
+class JournalSearchEngine:
+    """
+    Full-text search over journal micro wins and reflections (SQLite FTS5).
+
+    journal_fts mirrors journal_entries through triggers, so the save path,
+    chunked imports and bulk seeding all stay in sync without extra code.
+    Ranking is bm25 with micro_win weighted above reflection.
+    """
+
+    WEIGHTS = (0.0, 2.0, 1.0)   # owner, micro_win, reflection
+    MAX_LIMIT = 50
+    SNIPPET_TOKENS = 16
+
+    # engine URL -> whether journal_fts exists (checked once; install/drop keep it current)
+    _installed = {}
+
+    @staticmethod
+    def available() -> bool:
+        """True when journal_fts exists: SQLite without FTS5 or a failed upgrade leaves it missing."""
+        if db.engine.dialect.name != 'sqlite':
+            return False
+        key = str(db.engine.url)
+        if key not in JournalSearchEngine._installed:
+            with db.engine.connect() as conn:
+                JournalSearchEngine._installed[key] = JournalSearchEngine._exists(conn)
+        return JournalSearchEngine._installed[key]
+
+    @staticmethod
+    def _exists(conn) -> bool:
+        return conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'journal_fts'")).first() is not None
+
+    @staticmethod
+    def install(conn) -> bool:
+        """Creates the FTS table if missing (backfilling it) and (re)creates the triggers. Returns True if created."""
+        exists = JournalSearchEngine._exists(conn)
+        conn.execute(text(_TABLE_DDL))
+        for name, body in _TRIGGERS.items():
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            conn.execute(text(f"CREATE TRIGGER {name} {body}"))
+        if not exists:
+            JournalSearchEngine._backfill(conn)
+        JournalSearchEngine._installed[str(conn.engine.url)] = True
+        return not exists
+
+    @staticmethod
+    def _backfill(conn):
+        conn.execute(text("""
+            INSERT INTO journal_fts(rowid, owner, micro_win, reflection)
+            SELECT id, 'u' || user_id, json_extract(content, '$.micro_win'), json_extract(content, '$.reflection')
+            FROM journal_entries
+        """))
+
+    @staticmethod
+    def rebuild():
+        """Repopulates the index from journal_entries (repair path)."""
+        conn = db.session.connection()
+        conn.execute(text("DELETE FROM journal_fts"))
+        JournalSearchEngine._backfill(conn)
+        db.session.commit()
+
+    @staticmethod
+    def drop(conn):
+        conn.execute(text("DROP TABLE IF EXISTS journal_fts"))
+        JournalSearchEngine._installed[str(conn.engine.url)] = False
+
+    @staticmethod
+    def build_query(raw: str):
+        """
+        User text -> safe FTS5 expression: bare words and "quoted phrases" are
+        ANDed, a trailing * keeps prefix matching; FTS5 operators are not exposed.
+        """
+        parts = []
+        for phrase, word in _QUERY_RE.findall(raw or ''):
+            if phrase:
+                tokens = re.findall(r'\w+', phrase)
+                if tokens:
+                    parts.append('"' + ' '.join(tokens) + '"')
+            elif word:
+                prefix = word.endswith('*')
+                parts.append(f'"{word.rstrip("*")}"' + ('*' if prefix else ''))
+        return ' '.join(parts) or None
+
+    @staticmethod
+    def _markup(fragment):
+        if fragment is None:
+            return None
+        return str(escape(fragment)).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+    @staticmethod
+    def search(user_id: int, query: str, date_from: str = None, date_to: str = None,
+               limit: int = 20, offset: int = 0) -> dict:
+        """Ranked matches for one user, newest first among equal ranks, with highlighted snippets."""
+        started = time.perf_counter()
+        expression = JournalSearchEngine.build_query(query)
+        if expression is None:
+            return {"total": 0, "results": [], "took_ms": 0.0}
+
+        params = {
+            "match": f'owner:u{int(user_id)} AND {{micro_win reflection}} : ({expression})',
+            "date_from": date_from or '0000-00-00', "date_to": date_to or '9999-99-99',
+            "limit": max(1, min(limit, JournalSearchEngine.MAX_LIMIT)), "offset": max(0, offset),
+            "open": _OPEN, "close": _CLOSE, "tokens": JournalSearchEngine.SNIPPET_TOKENS,
+        }
+        w_owner, w_win, w_reflection = JournalSearchEngine.WEIGHTS
+        rank = f"bm25(journal_fts, {w_owner}, {w_win}, {w_reflection})"
+        where = """journal_fts MATCH :match
+                   AND je.date BETWEEN :date_from AND :date_to"""
+
+        total = db.session.execute(text(f"""
+            SELECT count(*) FROM journal_fts JOIN journal_entries je ON je.id = journal_fts.rowid
+            WHERE {where}
+        """), params).scalar()
+
+        rows = db.session.execute(text(f"""
+            SELECT je.date, je.mood, je.performance_score, {rank} AS rank,
+                   highlight(journal_fts, 1, :open, :close) AS micro_win,
+                   snippet(journal_fts, 2, :open, :close, '…', :tokens) AS reflection
+            FROM journal_fts JOIN journal_entries je ON je.id = journal_fts.rowid
+            WHERE {where}
+            ORDER BY rank, je.date DESC
+            LIMIT :limit OFFSET :offset
+        """), params).all()
+
+        return {
+            "total": total,
+            "results": [{
+                "date": r.date, "mood": r.mood, "score": r.performance_score,
+                "rank": round(-r.rank, 6),
+                "micro_win": JournalSearchEngine._markup(r.micro_win),
+                "reflection": JournalSearchEngine._markup(r.reflection),
+            } for r in rows],
+            "took_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
@@ -0,0 +1,156 @@
+import math
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from mentee.models import DrillPersonalBest, DrillSession, User, db
+
+
+class LeaderboardEngine:
+    """
+    Personal bests and per-drill rankings.
+    Every lookup is served from drill_personal_bests and its (drill_id, best_score) index,
+    never from a scan of drill_sessions.
+    A first insert races concurrent first saves of the same (user, drill), so it runs in
+    a savepoint; the loser reloads the winner's row and folds its score into it.
+    """
+
+    @staticmethod
+    def _insert_bests(rows) -> bool:
+        """Adds new personal-best rows in a savepoint. False if another transaction inserted one first."""
+        try:
+            with db.session.begin_nested():
+                db.session.add_all(rows)
+            return True
+        except IntegrityError:
+            return False
+
+    @staticmethod
+    def record_session(user_id: int, drill_id: str, score: int):
+        """
+        Folds a finished session into the personal-best row (caller owns the commit).
+        Returns (personal_best_row, is_new_best).
+        """
+        pb = DrillPersonalBest.query.filter_by(user_id=user_id, drill_id=drill_id)\
+            .with_for_update().first()
+        if not pb:
+            pb = DrillPersonalBest(user_id=user_id, drill_id=drill_id, best_score=score,
+                                   sessions=1, achieved_at=datetime.utcnow())
+            if LeaderboardEngine._insert_bests([pb]):
+                return pb, True
+            pb = DrillPersonalBest.query.filter_by(user_id=user_id, drill_id=drill_id)\
+                .with_for_update().one()
+
+        pb.sessions += 1
+        if score > pb.best_score:
+            pb.best_score = score
+            pb.achieved_at = datetime.utcnow()
+            return pb, True
+        return pb, False
+
+    @staticmethod
+    def record_sessions(results) -> dict:
+        """
+        Batch form of record_session for (user_id, drill_id, score) triples.
+        Loads the affected rows in one query; caller owns the commit.
+        Returns {(user_id, drill_id): is_new_best}.
+        """
+        batch_best, counts = {}, {}
+        for user_id, drill_id, score in results:
+            key = (user_id, drill_id)
+            batch_best[key] = max(score, batch_best.get(key, score))
+            counts[key] = counts.get(key, 0) + 1
+        if not batch_best:
+            return {}
+
+        user_ids = {uid for uid, _ in batch_best}
+        drill_ids = {did for _, did in batch_best}
+        now = datetime.utcnow()
+        for attempt in range(2):
+            existing = {
+                (pb.user_id, pb.drill_id): pb
+                for pb in DrillPersonalBest.query.filter(
+                    DrillPersonalBest.user_id.in_(user_ids),
+                    DrillPersonalBest.drill_id.in_(drill_ids)
+                ).with_for_update()
+            }
+            fresh = [DrillPersonalBest(user_id=key[0], drill_id=key[1], best_score=score,
+                                       sessions=counts[key], achieved_at=now)
+                     for key, score in batch_best.items() if key not in existing]
+            if not fresh or LeaderboardEngine._insert_bests(fresh):
+                break
+            if attempt:
+                raise RuntimeError("Personal-best insert kept conflicting")
+
+        improved = {}
+        for key, score in batch_best.items():
+            pb = existing.get(key)
+            if not pb:
+                improved[key] = True
+                continue
+            pb.sessions += counts[key]
+            improved[key] = score > pb.best_score
+            if improved[key]:
+                pb.best_score = score
+                pb.achieved_at = now
+        return improved
+
+    @staticmethod
+    def personal_bests(user_id: int) -> dict:
+        """{drill_id: best_score} for every drill the user has played, in one query."""
+        rows = db.session.query(DrillPersonalBest.drill_id, DrillPersonalBest.best_score)\
+            .filter(DrillPersonalBest.user_id == user_id).all()
+        return {drill_id: best for drill_id, best in rows}
+
+    @staticmethod
+    def personal_best(user_id: int, drill_id: str) -> int:
+        pb = db.session.get(DrillPersonalBest, (user_id, drill_id))
+        return pb.best_score if pb else 0
+
+    @staticmethod
+    def percentile(drill_id: str, score: int) -> dict:
+        """
+        Rank of `score` among all players' bests for the drill.
+        Both counts are range reads on idx_drill_best.
+        """
+        base = db.session.query(func.count()).select_from(DrillPersonalBest)\
+            .filter(DrillPersonalBest.drill_id == drill_id)
+        total = base.scalar() or 0
+        if not total:
+            return {"rank": 1, "players": 0, "top_percent": 100}
+
+        better = base.filter(DrillPersonalBest.best_score > score).scalar() or 0
+        return {
+            "rank": better + 1,
+            "players": total,
+            "top_percent": min(100, max(1, math.ceil((better + 1) * 100 / total)))
+        }
+
+    @staticmethod
+    def leaderboard(drill_id: str, limit: int = 10) -> list:
+        rows = db.session.query(DrillPersonalBest.best_score, DrillPersonalBest.achieved_at, User.name)\
+            .join(User, User.id == DrillPersonalBest.user_id)\
+            .filter(DrillPersonalBest.drill_id == drill_id)\
+            .order_by(DrillPersonalBest.best_score.desc(), DrillPersonalBest.achieved_at)\
+            .limit(max(1, limit)).all()
+        return [
+            {"rank": i, "name": name, "score": score, "achieved_at": achieved.isoformat() if achieved else None}
+            for i, (score, achieved, name) in enumerate(rows, start=1)
+        ]
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recomputes drill_personal_bests from drill_sessions (repair path)."""
+        DrillPersonalBest.query.delete()
+        rows = db.session.query(
+            DrillSession.user_id, DrillSession.drill_id,
+            func.max(DrillSession.score), func.count(DrillSession.id), func.max(DrillSession.timestamp)
+        ).group_by(DrillSession.user_id, DrillSession.drill_id).all()
+
+        # achieved_at falls back to the latest session; the exact PB time is not recoverable cheaply
+        if rows:
+            db.session.execute(DrillPersonalBest.__table__.insert(), [
+                {"user_id": uid, "drill_id": drill_id, "best_score": best, "sessions": n, "achieved_at": last}
+                for uid, drill_id, best, n, last in rows
+            ])
+        db.session.commit()
+        return len(rows)
@@ -0,0 +1,50 @@
+import json
+import os
+import threading
+from mentee.services.article_index import ArticleIndex
+
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'content', 'library.json')
+
+
+class LibraryContent:
+    """
+    Mental Edge library and mentor roster, loaded from content/library.json on
+    first use rather than at import, so worker boot does not pay for it.
+    The search index is built alongside the data, once per process.
+    """
+
+    _data = None
+    _index = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def load():
+        if LibraryContent._data is None:
+            with LibraryContent._lock:
+                if LibraryContent._data is None:
+                    with open(LIBRARY_PATH, encoding='utf-8') as fh:
+                        data = json.load(fh)
+                    LibraryContent._index = ArticleIndex(data["articles"])
+                    LibraryContent._data = data
+        return LibraryContent._data
+
+    @staticmethod
+    def articles() -> list:
+        return LibraryContent.load()["articles"]
+
+    @staticmethod
+    def collections() -> list:
+        return LibraryContent.load()["collections"]
+
+    @staticmethod
+    def paths() -> list:
+        return LibraryContent.load()["paths"]
+
+    @staticmethod
+    def mentors() -> list:
+        return LibraryContent.load()["mentors"]
+
+    @staticmethod
+    def index() -> ArticleIndex:
+        LibraryContent.load()
+        return LibraryContent._index
@@ -0,0 +1,152 @@
+import math
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, func, select, text, update
+from mentee.models import (DrillAnalyticsSnapshot, DrillSampleSet, JobChunk, JobRun, JournalEntry,
+                           SyncTombstone, TrendReport, User, db)
+from mentee.services.drill_analytics import DrillAnalyticsEngine
+from mentee.services.sync_engine import SyncEngine
+
+_UPDATE_BATCH = 500
+
+
+def _id_range(chunk: int, size: int):
+    """Chunk k covers ids [k*size + 1, (k+1)*size]; fixed ranges keep chunks stable across resumes."""
+    return chunk * size + 1, (chunk + 1) * size
+
+
+def _chunk_count(max_id, size: int) -> int:
+    return math.ceil((max_id or 0) / size)
+
+
+class NightlyJobs:
+    """
+    Batch work run by JobScheduler, one id-range chunk at a time.
+
+    Each chunk function does its writes without committing: the scheduler commits
+    them together with the chunk's job_chunks marker, so a resumed run never
+    repeats or skips a chunk. Chunk functions must be idempotent anyway.
+    """
+
+    HISTORY_DAYS = 30   # job_runs / job_chunks kept for the status endpoint
+
+    # --- Chunking ---
+
+    @staticmethod
+    def user_chunks(size: int) -> int:
+        return _chunk_count(db.session.query(func.max(User.id)).scalar(), size)
+
+    @staticmethod
+    def tombstone_chunks(size: int) -> int:
+        return _chunk_count(db.session.query(func.max(SyncTombstone.id)).scalar(), size)
+
+    # --- Gap days ---
+
+    @staticmethod
+    def mark_gap_days(chunk: int, size: int, run_date: str) -> int:
+        """
+        is_gap_day = the entry comes after at least one missed day (its previous entry is
+        older than yesterday). First entries are never gap days. Returns rows changed.
+        """
+        lo, hi = _id_range(chunk, size)
+        prev = func.lag(JournalEntry.date).over(partition_by=JournalEntry.user_id, order_by=JournalEntry.date)
+        rows = db.session.query(JournalEntry.id, JournalEntry.date, JournalEntry.is_gap_day, prev.label('prev'))\
+            .filter(JournalEntry.user_id.between(lo, hi)).all()
+
+        flips = {True: [], False: []}
+        for row in rows:
+            gap = row.prev is not None and \
+                (date.fromisoformat(row.date) - date.fromisoformat(row.prev)).days > 1
+            if bool(row.is_gap_day) != gap:
+                flips[gap].append(row.id)
+
+        # Core UPDATE on the table: derived data, so no version bump and no If-Match conflicts for clients
+        table = JournalEntry.__table__
+        for flag, ids in flips.items():
+            for i in range(0, len(ids), _UPDATE_BATCH):
+                db.session.execute(update(table).where(table.c.id.in_(ids[i:i + _UPDATE_BATCH]))
+                                   .values(is_gap_day=flag))
+        return len(flips[True]) + len(flips[False])
+
+    # --- Drill analytics snapshots ---
+
+    @staticmethod
+    def snapshot_drill_analytics(chunk: int, size: int, run_date: str) -> int:
+        """Recomputes the default-window report for every (user, drill) with new sample sets. Returns reports written."""
+        lo, hi = _id_range(chunk, size)
+        newest = db.session.query(DrillSampleSet.user_id, DrillSampleSet.drill_id,
+                                  func.max(DrillSampleSet.session_id))\
+            .filter(DrillSampleSet.user_id.between(lo, hi))\
+            .group_by(DrillSampleSet.user_id, DrillSampleSet.drill_id).all()
+        existing = {(s.user_id, s.drill_id): s for s in
+                    DrillAnalyticsSnapshot.query.filter(DrillAnalyticsSnapshot.user_id.between(lo, hi))}
+
+        written = 0
+        now = datetime.utcnow()
+        for user_id, drill_id, source_id in newest:
+            snap = existing.get((user_id, drill_id))
+            if snap is not None and snap.source_session_id == source_id:
+                continue   # nothing new since last night
+            report = DrillAnalyticsEngine.analyze(user_id, drill_id)
+            if snap is None:
+                db.session.add(DrillAnalyticsSnapshot(user_id=user_id, drill_id=drill_id, source_session_id=source_id,
+                                                      report=report, computed_at=now))
+            else:
+                snap.source_session_id, snap.report, snap.computed_at = source_id, report, now
+            written += 1
+        return written
+
+    # --- Coach trend reports ---
+
+    @staticmethod
+    def trend_reports(chunk: int, size: int, run_date: str) -> int:
+        """One CohortEngine batch per chunk of users, stored as trend_reports. Returns reports written."""
+        from mentee.services.cohort_engine import CohortEngine   # pandas: only the nightly run pays the import
+        lo, hi = _id_range(chunk, size)
+        user_ids = [uid for (uid,) in db.session.query(User.id).filter(User.id.between(lo, hi))]
+        if not user_ids:
+            return 0
+        reports = CohortEngine.analyze_trends_batch(user_ids)
+        existing = {r.user_id: r for r in TrendReport.query.filter(TrendReport.user_id.between(lo, hi))}
+
+        now = datetime.utcnow()
+        for user_id, report in reports.items():
+            row = existing.get(user_id)
+            if row is None:
+                db.session.add(TrendReport(user_id=user_id, report=report, computed_at=now))
+            else:
+                row.report, row.computed_at = report, now
+        return len(reports)
+
+    # --- Compaction ---
+
+    @staticmethod
+    def compact_tombstones(chunk: int, size: int, run_date: str) -> int:
+        """Purges sync tombstones past SyncEngine.TOMBSTONE_RETENTION_DAYS (cursors that old are refused)."""
+        lo, hi = _id_range(chunk, size)
+        cutoff = datetime.fromisoformat(run_date) - timedelta(days=SyncEngine.TOMBSTONE_RETENTION_DAYS)
+        result = db.session.execute(delete(SyncTombstone).where(SyncTombstone.id.between(lo, hi),
+                                                                SyncTombstone.deleted_at < cutoff))
+        return result.rowcount
+
+    @staticmethod
+    def compact_finish(run_date: str):
+        """Prunes old job history, then lets SQLite merge FTS segments and refresh planner stats."""
+        cutoff = (date.fromisoformat(run_date) - timedelta(days=NightlyJobs.HISTORY_DAYS)).isoformat()
+        old_runs = select(JobRun.id).where(JobRun.run_date < cutoff)
+        db.session.execute(delete(JobChunk).where(JobChunk.run_id.in_(old_runs)))
+        db.session.execute(delete(JobRun).where(JobRun.run_date < cutoff))
+        if db.engine.dialect.name == 'sqlite':
+            if db.session.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'journal_fts'")).first():
+                db.session.execute(text("INSERT INTO journal_fts(journal_fts) VALUES ('optimize')"))
+            db.session.execute(text("PRAGMA optimize"))
+
+
+# Run order matters: compaction goes last so it never races the other jobs' reads
+JOBS = {
+    "gap_days": {"chunks": NightlyJobs.user_chunks, "run": NightlyJobs.mark_gap_days},
+    "drill_snapshots": {"chunks": NightlyJobs.user_chunks, "run": NightlyJobs.snapshot_drill_analytics},
+    "trend_reports": {"chunks": NightlyJobs.user_chunks, "run": NightlyJobs.trend_reports},
+    "compact": {"chunks": NightlyJobs.tombstone_chunks, "run": NightlyJobs.compact_tombstones,
+                "finish": NightlyJobs.compact_finish},
+}
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response, session, url_for
+from flask_login import current_user
+
+
+class PageCache:
+    """
+    Rendered-response cache for anonymous views built from static data.
+
+    Keys are (endpoint, view args, query string, version); the version folds in
+    template mtimes, the registered page data and PAGE_CACHE_VERSION, so a deploy
+    or data edit invalidates everything. Bounded by PAGE_CACHE_MAX_BYTES with LRU eviction. Logged-in
+    visitors always render fresh because base.html shows their name, and so does any request
+    with flashed messages waiting or whose render wrote the session (the cookie is only
+    written after the view returns, so it never shows up in the response headers here).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._version = None
+        self.max_bytes = 0
+        self._entries = OrderedDict()   # key -> (body, etag, mimetype)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._data_sources = []         # callables returning the data cached pages render from
+        self._warm_values = {}          # endpoint -> callable returning [view args]
+        self.counters = {"hits": 0, "misses": 0, "not_modified": 0, "bypassed": 0, "evictions": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PAGE_CACHE_ENABLED', True)
+        app.config.setdefault('PAGE_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+        app.config.setdefault('PAGE_CACHE_VERSION', '1')
+        app.config.setdefault('PAGE_CACHE_WARM', True)
+        self.app = app
+        self.max_bytes = app.config['PAGE_CACHE_MAX_BYTES']
+        self._version = None
+        self.clear()
+        app.extensions['page_cache'] = self
+
+    def register_data(self, loader):
+        """
+        Registers a callable returning data that cached pages render from; it is
+        folded into the version on first use so registration stays import-cheap.
+        """
+        if loader not in self._data_sources:
+            self._data_sources.append(loader)
+        self._version = None
+
+    def warm_values(self, endpoint: str, values):
+        """Registers a callable yielding view args to pre-render for a parametrised endpoint."""
+        self._warm_values[endpoint] = values
+
+    @property
+    def version(self) -> str:
+        if self._version is None:
+            self._version = self._compute_version()
+        return self._version
+
+    def _compute_version(self) -> str:
+        digest = hashlib.sha1(str(self.app.config['PAGE_CACHE_VERSION']).encode())
+        for loader in self._data_sources:
+            digest.update(json.dumps(loader(), sort_keys=True, default=str).encode())
+        root = os.path.join(self.app.root_path, self.app.template_folder)
+        for folder, _, files in sorted(os.walk(root)):
+            for name in sorted(files):
+                st = os.stat(os.path.join(folder, name))
+                digest.update(f"{folder}/{name}:{st.st_mtime_ns}:{st.st_size}".encode())
+        return digest.hexdigest()[:12]
+
+    @property
+    def enabled(self):
+        return bool(self.app and self.app.config['PAGE_CACHE_ENABLED'] and not self.app.debug)
+
+    # --- Store ---
+
+    def _key(self):
+        args = tuple(sorted((request.view_args or {}).items()))
+        query = tuple(sorted(request.args.items(multi=True)))
+        return (request.endpoint, args, query, self.version)
+
+    def _store(self, key, body: bytes, mimetype: str):
+        etag = hashlib.sha1(body).hexdigest()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._bytes -= len(old[0])
+            if len(body) > self.max_bytes:
+                return etag
+            self._entries[key] = (body, etag, mimetype)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.counters["evictions"] += 1
+        return etag
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- Decorator ---
+
+    def _respond(self, body, etag, mimetype):
+        response = make_response(body)
+        response.mimetype = mimetype
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['Vary'] = 'Cookie'
+        return response.make_conditional(request)
+
+    def cached(self, view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or request.method != 'GET' or current_user.is_authenticated \
+                    or '_flashes' in session:
+                self.counters["bypassed"] += 1
+                return view(*args, **kwargs)
+
+            key = self._key()
+            entry = self._lookup(key)
+            if entry:
+                self.counters["hits"] += 1
+                response = self._respond(*entry)
+                if response.status_code == 304:
+                    self.counters["not_modified"] += 1
+                return response
+
+            self.counters["misses"] += 1
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or session.modified or 'Set-Cookie' in response.headers:
+                return response
+            etag = self._store(key, response.get_data(), response.mimetype)
+            return self._respond(response.get_data(), etag, response.mimetype)
+        wrapper.page_cached = True
+        return wrapper
+
+    def warm(self) -> int:
+        """
+        Renders every cached page once as an anonymous visitor so the first real
+        requests hit the cache. Endpoints with URL arguments are expanded through
+        warm_values(); returns the number of pages stored.
+        """
+        if not self.enabled or not self.app.config['PAGE_CACHE_WARM']:
+            return 0
+
+        urls = []
+        with self.app.test_request_context():
+            for rule in self.app.url_map.iter_rules():
+                view = self.app.view_functions.get(rule.endpoint)
+                if not getattr(view, 'page_cached', False):
+                    continue
+                if not rule.arguments:
+                    urls.append(url_for(rule.endpoint))
+                elif rule.endpoint in self._warm_values:
+                    urls.extend(url_for(rule.endpoint, **args) for args in self._warm_values[rule.endpoint]())
+
+        client = self.app.test_client()
+        return sum(client.get(url).status_code == 200 for url in urls)
+
+    def warm_in_background(self):
+        """Runs warm() on a daemon thread so worker boot does not wait on template rendering."""
+        thread = threading.Thread(target=self.warm, name='page-cache-warm', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        return {**self.counters, "entries": len(self._entries), "bytes": self._bytes,
+                "capacity_bytes": self.max_bytes, "version": self.version}
+
+
+page_cache = PageCache()
@@ -0,0 +1,144 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashPoolSaturated(Exception):
+    """Raised when no hashing slot frees up within HASH_POOL_QUEUE_TIMEOUT."""
+
+
+class PasswordHasher:
+    """
+    Runs scrypt hashing in a small process pool so login storms cannot pin the
+    web worker's threads. Admission is capped by a semaphore: callers wait at most
+    HASH_POOL_QUEUE_TIMEOUT for a slot, then get HashPoolSaturated and fail fast.
+    A task that overruns HASH_POOL_TASK_TIMEOUT retires the whole pool (its children
+    are terminated, so released slots never stack up behind a still-hashing process)
+    and the next call starts a fresh one.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._slots = None
+        self._stats_lock = threading.Lock()
+        self.counters = {
+            "hashes": 0,
+            "rejected": 0,
+            "errors": 0,
+            "pools_replaced": 0,
+            "in_flight": 0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+            "total_ms": 0.0,
+        }
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('HASH_POOL_ENABLED', True)
+        app.config.setdefault('HASH_POOL_WORKERS', 2)
+        app.config.setdefault('HASH_POOL_MAX_PENDING', 8)
+        app.config.setdefault('HASH_POOL_QUEUE_TIMEOUT', 2.0)
+        app.config.setdefault('HASH_POOL_TASK_TIMEOUT', 10.0)
+        self.app = app
+        self._slots = threading.BoundedSemaphore(app.config['HASH_POOL_MAX_PENDING'])
+        app.extensions['password_hasher'] = self
+
+    def _executor(self):
+        # Created on first use so each gunicorn worker gets its own pool after fork.
+        # Never 'fork': the web worker is multithreaded, and a forked child can inherit
+        # a lock held by another thread. The forkserver is a clean single-threaded
+        # process with werkzeug.security preloaded; spawn is the fallback.
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    if 'forkserver' in multiprocessing.get_all_start_methods():
+                        context = multiprocessing.get_context('forkserver')
+                        context.set_forkserver_preload(['werkzeug.security'])
+                    else:
+                        context = multiprocessing.get_context('spawn')
+                    self._pool = ProcessPoolExecutor(max_workers=self.app.config['HASH_POOL_WORKERS'],
+                                                     mp_context=context)
+        return self._pool
+
+    def _retire(self, pool):
+        """Terminates a pool whose worker overran its task; the next call builds a new one."""
+        with self._pool_lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        with self._stats_lock:
+            self.counters["pools_replaced"] += 1
+
+    def _submit(self, fn, args, deadline):
+        pool = self._executor()
+        try:
+            return pool.submit(fn, *args).result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            self._retire(pool)
+            raise HashPoolSaturated("Password hashing timed out")
+
+    def _run(self, fn, *args):
+        if not self.app.config['HASH_POOL_ENABLED']:
+            return fn(*args)
+
+        if not self._slots.acquire(timeout=self.app.config['HASH_POOL_QUEUE_TIMEOUT']):
+            with self._stats_lock:
+                self.counters["rejected"] += 1
+            raise HashPoolSaturated("Password hashing is saturated, retry shortly")
+
+        with self._stats_lock:
+            self.counters["in_flight"] += 1
+        started = time.perf_counter()
+        failed = False
+        deadline = time.monotonic() + self.app.config['HASH_POOL_TASK_TIMEOUT']
+        try:
+            try:
+                return self._submit(fn, args, deadline)
+            except (BrokenProcessPool, CancelledError):
+                # Another caller's timeout retired the pool under us: one retry on the fresh pool
+                return self._submit(fn, args, deadline)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._stats_lock:
+                self.counters["in_flight"] -= 1
+                self.counters["hashes"] += 1
+                self.counters["errors"] += int(failed)
+                self.counters["last_ms"] = round(elapsed, 2)
+                self.counters["max_ms"] = round(max(self.counters["max_ms"], elapsed), 2)
+                self.counters["total_ms"] += elapsed
+            self._slots.release()
+
+    def generate(self, password: str) -> str:
+        return self._run(generate_password_hash, password, 'scrypt')
+
+    def check(self, pwhash: str, password: str) -> bool:
+        return self._run(check_password_hash, pwhash, password)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        hashes = self.counters["hashes"]
+        return {
+            **self.counters,
+            "capacity": self.app.config['HASH_POOL_MAX_PENDING'] if self.app else 0,
+            "avg_ms": round(self.counters["total_ms"] / hashes, 2) if hashes else 0.0,
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,206 @@
+import hmac
+import threading
+import time
+from collections import defaultdict
+from flask import Response, abort, request
+from sqlalchemy import event
+from mentee.models import db
+
+# Upper bounds; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Extensions whose stats() are exported as gauges
+STATS_EXTENSIONS = ('db_profile', 'drill_queue', 'autosave_queue', 'job_scheduler', 'password_hasher', 'user_cache', 'page_cache')
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """
+    Per-endpoint latency and SQL histograms, exported in Prometheus text format at /metrics.
+
+    SQL statements are timed with engine cursor events and attributed to the
+    request running on the same thread; statements slower than SLOW_QUERY_MS
+    are logged with their endpoint. Figures are per worker process, so each
+    gunicorn worker reports its own series. /metrics answers only scrapers bearing
+    METRICS_TOKEN and 404s while no token is configured.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+        if app is not None:
+            self.init_app(app)
+
+    def reset(self):
+        with self._lock:
+            self.latency = {}                   # (endpoint, method) -> _Histogram (seconds)
+            self.sql_count = {}                 # endpoint -> _Histogram (statements per request)
+            self.sql_seconds = defaultdict(float)
+            self.responses = defaultdict(int)   # (endpoint, method, status) -> count
+            self.slow_queries = defaultdict(int)
+            self.background_sql = {"statements": 0, "seconds": 0.0}
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('SLOW_QUERY_MS', 100)
+        app.config.setdefault('METRICS_TOKEN', None)          # /metrics is off without a token
+        self.app = app
+        self.reset()
+        if not app.config['METRICS_ENABLED']:
+            return
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor)
+        app.add_url_rule('/metrics', 'metrics', self._serve)
+        app.extensions['request_metrics'] = self
+
+    # --- SQL events ---
+
+    def _before_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['metrics_query_start'].pop()
+        state = getattr(self._local, 'request', None)
+        endpoint = state["endpoint"] if state else None
+        if state:
+            state["sql"] += 1
+            state["sql_seconds"] += elapsed
+        else:
+            with self._lock:
+                self.background_sql["statements"] += 1
+                self.background_sql["seconds"] += elapsed
+
+        if elapsed * 1000 >= self.app.config['SLOW_QUERY_MS']:
+            with self._lock:
+                self.slow_queries[endpoint or '(background)'] += 1
+            self.app.logger.warning("Slow query %.1f ms [%s]: %s", elapsed * 1000,
+                                    endpoint or 'background', ' '.join(statement.split())[:500])
+
+    # --- Request hooks ---
+
+    def _start(self):
+        self._local.request = {"endpoint": request.endpoint or 'unmatched', "sql": 0, "sql_seconds": 0.0,
+                               "started": time.perf_counter()}
+
+    def _record(self, status):
+        state = getattr(self._local, 'request', None)
+        if state is None:
+            return
+        self._local.request = None
+        elapsed = time.perf_counter() - state["started"]
+        endpoint = state["endpoint"]
+        with self._lock:
+            key = (endpoint, request.method)
+            if key not in self.latency:
+                self.latency[key] = _Histogram(LATENCY_BUCKETS)
+            self.latency[key].observe(elapsed)
+            if endpoint not in self.sql_count:
+                self.sql_count[endpoint] = _Histogram(SQL_COUNT_BUCKETS)
+            self.sql_count[endpoint].observe(state["sql"])
+            self.sql_seconds[endpoint] += state["sql_seconds"]
+            self.responses[(endpoint, request.method, status)] += 1
+
+    def _finish(self, response):
+        self._record(response.status_code)
+        return response
+
+    def _teardown(self, exc):
+        # after_request is skipped when a view raises; count those as 500s
+        if exc is not None:
+            self._record(500)
+
+    # --- Export ---
+
+    def render(self) -> str:
+        lines = []
+
+        def histogram(name, help_text, series, label_names):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+                lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+                lines.append(f"{name}_sum{_labels(**labels)} {hist.sum:.6f}")
+                lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        with self._lock:
+            histogram("mentee_request_duration_seconds", "Request latency by endpoint.",
+                      self.latency, ("endpoint", "method"))
+            histogram("mentee_request_sql_statements", "SQL statements executed per request.",
+                      self.sql_count, ("endpoint",))
+
+            lines.append("# HELP mentee_request_sql_seconds_total Time spent in SQL per endpoint.")
+            lines.append("# TYPE mentee_request_sql_seconds_total counter")
+            for endpoint, seconds in sorted(self.sql_seconds.items()):
+                lines.append(f"mentee_request_sql_seconds_total{_labels(endpoint=endpoint)} {seconds:.6f}")
+
+            lines.append("# HELP mentee_requests_total Responses by endpoint, method and status.")
+            lines.append("# TYPE mentee_requests_total counter")
+            for (endpoint, method, status), n in sorted(self.responses.items()):
+                lines.append(f"mentee_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {n}")
+
+            lines.append(f"# HELP mentee_slow_queries_total Statements over {self.app.config['SLOW_QUERY_MS']} ms.")
+            lines.append("# TYPE mentee_slow_queries_total counter")
+            for endpoint, n in sorted(self.slow_queries.items()):
+                lines.append(f"mentee_slow_queries_total{_labels(endpoint=endpoint)} {n}")
+
+            lines.append("# HELP mentee_background_sql_statements_total SQL outside requests (queues, jobs).")
+            lines.append("# TYPE mentee_background_sql_statements_total counter")
+            lines.append(f"mentee_background_sql_statements_total {self.background_sql['statements']}")
+            lines.append("# TYPE mentee_background_sql_seconds_total counter")
+            lines.append(f"mentee_background_sql_seconds_total {self.background_sql['seconds']:.6f}")
+
+        for ext in STATS_EXTENSIONS:
+            component = self.app.extensions.get(ext)
+            if component is None:
+                continue
+            for key, value in component.stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"mentee_{ext}_{key}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _serve(self):
+        token = self.app.config['METRICS_TOKEN']
+        if not token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+            abort(403)
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+request_metrics = RequestMetrics()
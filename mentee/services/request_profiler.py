@@ -0,0 +1,193 @@
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from flask import g, request
+
+
+class RequestProfiler:
+    """
+    Opt-in stack-sampling profiler for individual requests.
+
+    A request is profiled when it carries PROFILER_HEADER with the PROFILER_TOKEN
+    value, or by chance at PROFILER_SAMPLE_RATE (optionally limited to
+    PROFILER_ENDPOINTS). One daemon thread samples the stacks of the profiled
+    request threads every PROFILER_INTERVAL_MS; unprofiled requests pay a dict
+    lookup. Each profile lands in PROFILER_DIR as
+      <id>.collapsed  folded stacks for flamegraph.pl / speedscope
+      <id>.json       request metadata plus per-function self/total samples
+    and the oldest files are pruned to keep the directory under PROFILER_MAX_BYTES.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._active = {}          # thread id -> session dict
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._sampler = None
+        self._labels = {}          # code object -> frame label
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILER_ENABLED', False)
+        app.config.setdefault('PROFILER_SAMPLE_RATE', 0.0)
+        app.config.setdefault('PROFILER_ENDPOINTS', None)      # e.g. ['dashboard.drills_hub']
+        app.config.setdefault('PROFILER_HEADER', 'X-Mentee-Profile')
+        app.config.setdefault('PROFILER_TOKEN', None)          # header trigger is off without a token
+        app.config.setdefault('PROFILER_INTERVAL_MS', 1.0)
+        app.config.setdefault('PROFILER_MAX_SAMPLES', 20000)
+        app.config.setdefault('PROFILER_DIR', os.path.join(app.instance_path, 'profiles'))
+        app.config.setdefault('PROFILER_MAX_BYTES', 50 * 1024 * 1024)
+        self.app = app
+        if not app.config['PROFILER_ENABLED']:
+            return
+
+        app.before_request(self._start)
+        app.after_request(self._tag_response)
+        app.teardown_request(self._stop)
+        app.extensions['request_profiler'] = self
+
+    # --- Triggering ---
+
+    def _wanted(self) -> bool:
+        config = self.app.config
+        token = config['PROFILER_TOKEN']
+        supplied = request.headers.get(config['PROFILER_HEADER'])
+        if token and supplied and hmac.compare_digest(supplied, token):
+            return True
+        endpoints = config['PROFILER_ENDPOINTS']
+        if endpoints and request.endpoint not in endpoints:
+            return False
+        rate = config['PROFILER_SAMPLE_RATE']
+        return rate > 0 and random.random() < rate
+
+    def _start(self):
+        if not self._wanted():
+            return
+        session = {"id": f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}",
+                   "stacks": Counter(), "samples": 0, "started": time.perf_counter()}
+        g.profile_id = session["id"]
+        with self._lock:
+            self._active[threading.get_ident()] = session
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, name='request-profiler', daemon=True)
+                self._sampler.start()
+        self._wakeup.set()
+
+    def _tag_response(self, response):
+        if 'profile_id' in g:
+            response.headers['X-Profile-Id'] = g.profile_id
+        return response
+
+    def _stop(self, exc):
+        with self._lock:
+            session = self._active.pop(threading.get_ident(), None)
+        if session is None:
+            return
+        duration_ms = (time.perf_counter() - session["started"]) * 1000
+        try:
+            self._write(session, duration_ms, exc)
+        except OSError as e:
+            self.app.logger.warning("Profiler could not write %s: %s", session["id"], e)
+
+    # --- Sampling ---
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if 'site-packages' + os.sep in filename:
+                filename = filename.split('site-packages' + os.sep, 1)[1]
+            elif os.sep + 'mentee' + os.sep in filename:
+                filename = 'mentee/' + filename.split(os.sep + 'mentee' + os.sep, 1)[1]
+            else:
+                filename = os.path.basename(filename)
+            # Folded-stack format: ';' separates frames and the last space precedes the count
+            label = f"{filename}:{code.co_name}:{code.co_firstlineno}".replace(';', ':').replace(' ', '_')
+            self._labels[code] = label
+        return label
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                idle = not self._active
+            if idle:
+                self._wakeup.clear()
+                self._wakeup.wait(timeout=30)
+                continue
+
+            interval = self.app.config['PROFILER_INTERVAL_MS'] / 1000
+            limit = self.app.config['PROFILER_MAX_SAMPLES']
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, session in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is None or thread_id == own or session["samples"] >= limit:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._label(frame.f_code))
+                        frame = frame.f_back
+                    session["stacks"][tuple(reversed(stack))] += 1
+                    session["samples"] += 1
+            del frames
+            time.sleep(interval)
+
+    # --- Output ---
+
+    def _write(self, session, duration_ms, exc):
+        directory = self.app.config['PROFILER_DIR']
+        os.makedirs(directory, exist_ok=True)
+        stacks = session["stacks"]
+        base = os.path.join(directory, session["id"])
+
+        with open(base + '.collapsed', 'w') as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{';'.join(stack)} {count}\n")
+
+        self_samples, total_samples = Counter(), Counter()
+        for stack, count in stacks.items():
+            self_samples[stack[-1]] += count
+            for label in set(stack):
+                total_samples[label] += count
+        samples = session["samples"] or 1
+        functions = [
+            {"function": label, "self": self_samples[label], "total": total,
+             "self_pct": round(100 * self_samples[label] / samples, 2), "total_pct": round(100 * total / samples, 2)}
+            for label, total in sorted(total_samples.items(), key=lambda kv: (-self_samples[kv[0]], -kv[1]))
+        ]
+        with open(base + '.json', 'w') as fh:
+            json.dump({
+                "id": session["id"], "endpoint": request.endpoint, "method": request.method,
+                "path": request.full_path.rstrip('?'), "duration_ms": round(duration_ms, 3),
+                "error": repr(exc) if exc else None, "samples": session["samples"],
+                "interval_ms": self.app.config['PROFILER_INTERVAL_MS'], "functions": functions,
+            }, fh, indent=1)
+
+        self._prune(directory, keep=session["id"])
+
+    def _prune(self, directory, keep):
+        """Deletes the oldest profiles until the directory fits PROFILER_MAX_BYTES (the newest always stays)."""
+        entries, total = [], 0
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            st = os.stat(path)
+            total += st.st_size
+            if not name.startswith(keep):
+                entries.append((st.st_mtime, st.st_size, path))
+        for _, size, path in sorted(entries):
+            if total <= self.app.config['PROFILER_MAX_BYTES']:
+                break
+            os.remove(path)
+            total -= size
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+from sqlalchemy import desc
+from mentee.models import JournalEntry, PerformanceRollup, db
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.streak_engine import StreakEngine, _parse
+
+
+def _is_next_day(prev_str: str, date_str: str) -> bool:
+    try:
+        return _parse(date_str) - _parse(prev_str) == timedelta(days=1)
+    except (TypeError, ValueError):
+        return False
+
+
+class RollupEngine:
+    """
+    Keeps PerformanceRollup rows in step with journal_entries.
+    All writes happen on the caller's session; the caller owns the commit.
+    """
+
+    # --- Welford primitives ---
+
+    @staticmethod
+    def _push_score(rollup, x):
+        rollup.count += 1
+        delta = x - rollup.mean
+        rollup.mean += delta / rollup.count
+        rollup.m2 += delta * (x - rollup.mean)
+
+    @staticmethod
+    def _pop_score(rollup, x):
+        if rollup.count <= 1:
+            rollup.count, rollup.mean, rollup.m2 = 0, 0.0, 0.0
+            return
+        rollup.count -= 1
+        delta = x - rollup.mean
+        rollup.mean -= delta / rollup.count
+        rollup.m2 = max(rollup.m2 - delta * (x - rollup.mean), 0.0)
+
+    # --- Recent-entries ring ---
+
+    @staticmethod
+    def _touch_ring(rollup, date_str, score, is_new):
+        """Keeps the newest TREND_WINDOW (date, score) pairs, newest first."""
+        ring = [list(pair) for pair in (rollup.recent_scores or [])]
+        window = PerformanceEngine.TREND_WINDOW
+
+        for pair in ring:
+            if pair[0] == date_str:
+                pair[1] = score
+                break
+        else:
+            if is_new and (len(ring) < window or date_str > ring[-1][0]):
+                ring.append([date_str, score])
+                ring.sort(key=lambda p: p[0], reverse=True)
+                del ring[window:]
+
+        # Reassign so the JSON column is flagged dirty
+        rollup.recent_scores = ring
+
+    # --- Public API ---
+
+    @staticmethod
+    def get_or_create(user_id: int):
+        rollup = PerformanceRollup.query.filter_by(user_id=user_id).with_for_update().first()
+        if not rollup:
+            rollup = PerformanceRollup(user_id=user_id, count=0, mean=0.0, m2=0.0,
+                                       recent_scores=[], streak_length=0, longest_streak=0)
+            db.session.add(rollup)
+        return rollup
+
+    @staticmethod
+    def apply_entry(user_id: int, date_str: str, old_score, new_score, is_new: bool):
+        """
+        Folds one journal upsert into the user's rollup.
+        old_score is the value before the save (ignored when is_new).
+        """
+        rollup = RollupEngine.get_or_create(user_id)
+
+        if not is_new and old_score is not None:
+            RollupEngine._pop_score(rollup, old_score)
+        if new_score is not None:
+            RollupEngine._push_score(rollup, new_score)
+
+        RollupEngine._touch_ring(rollup, date_str, new_score, is_new)
+        if is_new:
+            StreakEngine.on_insert(rollup, date_str)
+        rollup.updated_at = datetime.utcnow()
+        return rollup
+
+    @staticmethod
+    def remove_entry(user_id: int, date_str: str, score):
+        """
+        Folds one journal delete into the user's rollup.
+        Call after the entry's DELETE is flushed; score is its performance_score.
+        """
+        rollup = RollupEngine.get_or_create(user_id)
+        if score is not None:
+            RollupEngine._pop_score(rollup, score)
+
+        ring = [list(pair) for pair in (rollup.recent_scores or []) if pair[0] != date_str]
+        if len(ring) == PerformanceEngine.TREND_WINDOW - 1:
+            # The ring was full, so an older entry may be waiting outside it
+            older = db.session.query(JournalEntry.date, JournalEntry.performance_score)\
+                .filter(JournalEntry.user_id == user_id, JournalEntry.date < ring[-1][0])\
+                .order_by(desc(JournalEntry.date)).first()
+            if older:
+                ring.append(list(older))
+        rollup.recent_scores = ring
+
+        StreakEngine.on_delete(rollup, date_str)
+        rollup.updated_at = datetime.utcnow()
+        return rollup
+
+    @staticmethod
+    def insights(user_id: int):
+        """O(1) replacement for PerformanceEngine.analyze_trends."""
+        rollup = db.session.get(PerformanceRollup, user_id)
+        if not rollup:
+            return {"status": "insufficient_data"}
+
+        ring = rollup.recent_scores or []
+        if len(ring) < 3:
+            return {"status": "insufficient_data"}
+
+        report = PerformanceEngine.summarize_scores([s for _, s in ring if s is not None])
+        if report["status"] != "success":
+            return report
+
+        report.update({
+            "lifetime_mean": round(rollup.mean, 1),
+            "lifetime_volatility": round(rollup.variance ** 0.5, 2),
+            "lifetime_entries": rollup.count,
+            "streak_length": rollup.streak_length,
+            "current_streak": StreakEngine.current(rollup),
+            "longest_streak": rollup.longest_streak,
+            "last_entry_date": rollup.last_entry_date
+        })
+        return report
+
+    @staticmethod
+    def rebuild(user_id: int = None, batch_size: int = 1000):
+        """
+        Recomputes rollups from journal_entries (repair path).
+        Streams rows ordered by (user_id, date) so memory stays flat.
+        Returns the number of rollups written.
+        """
+        wipe = PerformanceRollup.query
+        rows = db.session.query(JournalEntry.user_id, JournalEntry.date, JournalEntry.performance_score)
+        if user_id is not None:
+            wipe = wipe.filter_by(user_id=user_id)
+            rows = rows.filter(JournalEntry.user_id == user_id)
+        wipe.delete()
+
+        rows = rows.order_by(JournalEntry.user_id, JournalEntry.date)\
+            .execution_options(yield_per=batch_size)
+
+        written = 0
+        current = None
+        for uid, date_str, score in rows:
+            if current is None or current.user_id != uid:
+                current = PerformanceRollup(user_id=uid, count=0, mean=0.0, m2=0.0,
+                                            recent_scores=[], streak_length=0, longest_streak=0)
+                db.session.add(current)
+                written += 1
+                if written % batch_size == 0:
+                    db.session.flush()
+
+            if score is not None:
+                RollupEngine._push_score(current, score)
+            RollupEngine._touch_ring(current, date_str, score, True)
+
+            # Rows arrive in date order, so the streak only ever moves forward
+            if _is_next_day(current.last_entry_date, date_str):
+                current.streak_length += 1
+            else:
+                current.streak_length = 1
+            current.last_entry_date = date_str
+            current.longest_streak = max(current.longest_streak, current.streak_length)
+
+        db.session.commit()
+        return written
@@ -0,0 +1,139 @@
+from sqlalchemy import and_, bindparam, func, insert, inspect, select, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from mentee.models import DrillPersonalBest, DrillSession, JournalEntry, PerformanceRollup, db
+from mentee.services.journal_engine import PerformanceEngine
+from mentee.services.journal_search import JournalSearchEngine
+from mentee.services.rollup_engine import RollupEngine
+
+
+class SchemaEngine:
+    """
+    Explicit, idempotent schema setup run by init_db.py (never at worker boot).
+
+    There is no migration framework here, so upgrade() covers the additive
+    changes this app makes: new tables, new nullable columns, new indexes and
+    the SQLite full-text index, plus backfills for derived columns.
+    Anything destructive still goes through reset_db.py.
+    """
+
+    BACKFILL_BATCH = 1000
+
+    @staticmethod
+    def backfill_signatures(conn) -> int:
+        """
+        Fills journal_entries.text_signature for rows saved before it existed, so
+        detect_autopilot sees their history. Keyset batches by id; Core update, so
+        no version bump. Returns rows signed.
+        """
+        table = JournalEntry.__table__
+        stmt = update(table).where(table.c.id == bindparam('row_id')).values(text_signature=bindparam('sig'))
+        signed, last_id = 0, 0
+        while True:
+            rows = conn.execute(select(table.c.id, table.c.content)
+                                .where(table.c.text_signature.is_(None), table.c.id > last_id)
+                                .order_by(table.c.id).limit(SchemaEngine.BACKFILL_BATCH)).all()
+            if not rows:
+                return signed
+            last_id = rows[-1].id
+            params = []
+            for row in rows:
+                content = row.content if isinstance(row.content, dict) else {}
+                parts = (content.get("micro_win"), content.get("reflection"))
+                sig = PerformanceEngine.text_signature(" ".join(v for v in parts if isinstance(v, str) and v))
+                if sig is not None:
+                    params.append({"row_id": row.id, "sig": sig})
+            if params:
+                conn.execute(stmt, params)
+                signed += len(params)
+
+    @staticmethod
+    def backfill_rollups() -> int:
+        """
+        Rebuilds the rollup of every user with journal history but no performance_rollups
+        row (databases that predate rollups). Saves only fold into an existing rollup, so
+        without this the first save would start the user's stats and streak from zero.
+        Returns rollups written.
+        """
+        user_ids = [uid for (uid,) in db.session.query(JournalEntry.user_id).distinct()
+                    .outerjoin(PerformanceRollup, PerformanceRollup.user_id == JournalEntry.user_id)
+                    .filter(PerformanceRollup.user_id.is_(None))]
+        return sum(RollupEngine.rebuild(uid) for uid in user_ids)
+
+    @staticmethod
+    def backfill_personal_bests(conn) -> int:
+        """
+        Inserts drill_personal_bests rows for (user, drill) pairs that have sessions but no
+        row yet, from MAX(score) / COUNT(*) over drill_sessions; achieved_at is the first
+        session that reached the best. Returns rows inserted.
+        """
+        sessions, bests = DrillSession.__table__, DrillPersonalBest.__table__
+        best = select(sessions.c.user_id, sessions.c.drill_id,
+                      func.max(sessions.c.score).label('best_score'), func.count().label('sessions'))\
+            .select_from(sessions.outerjoin(bests, and_(bests.c.user_id == sessions.c.user_id,
+                                                        bests.c.drill_id == sessions.c.drill_id)))\
+            .where(bests.c.user_id.is_(None))\
+            .group_by(sessions.c.user_id, sessions.c.drill_id).subquery()
+        rows = select(best.c.user_id, best.c.drill_id, best.c.best_score, best.c.sessions,
+                      func.min(sessions.c.timestamp))\
+            .join(sessions, and_(sessions.c.user_id == best.c.user_id, sessions.c.drill_id == best.c.drill_id,
+                                 sessions.c.score == best.c.best_score))\
+            .group_by(best.c.user_id, best.c.drill_id, best.c.best_score, best.c.sessions)
+        return conn.execute(insert(bests).from_select(
+            ['user_id', 'drill_id', 'best_score', 'sessions', 'achieved_at'], rows)).rowcount
+
+    @staticmethod
+    def upgrade() -> list:
+        """Brings the live database up to the models. Returns a list of actions taken."""
+        actions = []
+        engine = db.engine
+        existing = set(inspect(engine).get_table_names())
+
+        missing = [t for t in db.metadata.sorted_tables if t.name not in existing]
+        if missing:
+            db.metadata.create_all(engine, tables=missing)
+            actions.extend(f"create table {t.name}" for t in missing)
+
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table in db.metadata.sorted_tables:
+                if table in missing:
+                    continue
+                columns = {c['name'] for c in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in columns:
+                        continue
+                    if not column.nullable and column.server_default is None:
+                        raise RuntimeError(f"{table.name}.{column.name} is NOT NULL without a default; "
+                                           f"add it by hand or run reset_db.py")
+                    ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {ddl}'))
+                    actions.append(f"add column {table.name}.{column.name}")
+
+                indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name not in indexes:
+                        conn.execute(CreateIndex(index))
+                        actions.append(f"create index {index.name}")
+
+            # Full-text index over journal text, kept in sync by triggers (SQLite only).
+            # A build without FTS5 fails on the CREATE, before any trigger: search reports 501.
+            if engine.dialect.name == 'sqlite':
+                try:
+                    if JournalSearchEngine.install(conn):
+                        actions.append("create fts journal_fts (+ triggers, backfilled)")
+                except OperationalError as exc:
+                    actions.append(f"skip fts journal_fts ({exc.orig})")
+
+            signed = SchemaEngine.backfill_signatures(conn)
+            if signed:
+                actions.append(f"backfill journal_entries.text_signature ({signed} rows)")
+
+            bests = SchemaEngine.backfill_personal_bests(conn)
+            if bests:
+                actions.append(f"backfill drill_personal_bests ({bests} rows)")
+
+        seeded = SchemaEngine.backfill_rollups()
+        if seeded:
+            actions.append(f"backfill performance_rollups ({seeded} users)")
+        return actions
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from sqlalchemy import desc
+from mentee.models import JournalEntry, PerformanceRollup, User, db
+
+DATE_FMT = '%Y-%m-%d'
+
+
+def _parse(date_str: str):
+    return datetime.strptime(date_str, DATE_FMT).date()
+
+
+class StreakEngine:
+    """
+    Per-user streak index on PerformanceRollup:
+      streak_length    consecutive days ending at last_entry_date
+      last_entry_date  newest journal date
+      longest_streak   best run ever
+    Saves and deletes adjust it with date arithmetic against the current run.
+    Only edits away from the run walk their neighbouring run through idx_user_date,
+    and only deleting a day of the longest run rescans that user's dates.
+    A streak is current while last_entry_date is today or yesterday (UTC), so
+    idx_rollup_streak answers cross-user rankings without touching journal_entries.
+    """
+
+    LEADERBOARD_MAX = 50
+
+    # --- Run walks (bounded by the run they measure) ---
+
+    @staticmethod
+    def _run_before(user_id: int, day) -> int:
+        """Length of the consecutive run that ends the day before `day`."""
+        count, expected = 0, day - timedelta(days=1)
+        earlier = db.session.query(JournalEntry.date)\
+            .filter(JournalEntry.user_id == user_id, JournalEntry.date < day.strftime(DATE_FMT))\
+            .order_by(desc(JournalEntry.date)).yield_per(64)
+        for (prev_date,) in earlier:
+            if prev_date != expected.strftime(DATE_FMT):
+                break
+            count += 1
+            expected -= timedelta(days=1)
+        return count
+
+    @staticmethod
+    def _run_after(user_id: int, day) -> int:
+        """Length of the consecutive run that starts the day after `day`."""
+        count, expected = 0, day + timedelta(days=1)
+        later = db.session.query(JournalEntry.date)\
+            .filter(JournalEntry.user_id == user_id, JournalEntry.date > day.strftime(DATE_FMT))\
+            .order_by(JournalEntry.date).yield_per(64)
+        for (next_date,) in later:
+            if next_date != expected.strftime(DATE_FMT):
+                break
+            count += 1
+            expected += timedelta(days=1)
+        return count
+
+    @staticmethod
+    def _longest_run(user_id: int) -> int:
+        """Full pass over one user's dates (only when the longest run itself was cut)."""
+        longest = run = 0
+        prev = None
+        dates = db.session.query(JournalEntry.date).filter(JournalEntry.user_id == user_id)\
+            .order_by(JournalEntry.date).yield_per(256)
+        for (date_str,) in dates:
+            day = _parse(date_str)
+            run = run + 1 if prev is not None and day - prev == timedelta(days=1) else 1
+            longest = max(longest, run)
+            prev = day
+        return longest
+
+    # --- Incremental maintenance (caller owns the commit) ---
+
+    @staticmethod
+    def on_insert(rollup, date_str: str):
+        """A new journal date for rollup.user_id."""
+        day = _parse(date_str)
+        if not rollup.last_entry_date:
+            rollup.last_entry_date, rollup.streak_length = date_str, 1
+        else:
+            last = _parse(rollup.last_entry_date)
+            if day > last:
+                rollup.streak_length = rollup.streak_length + 1 if day - last == timedelta(days=1) else 1
+                rollup.last_entry_date = date_str
+            else:
+                # Back-fill: joins the run before it, and the current run if it lands right before its start
+                before = StreakEngine._run_before(rollup.user_id, day)
+                run_start = last - timedelta(days=rollup.streak_length - 1)
+                if day == run_start - timedelta(days=1):
+                    rollup.streak_length += 1 + before
+                    merged = rollup.streak_length
+                else:
+                    merged = before + 1 + StreakEngine._run_after(rollup.user_id, day)
+                rollup.longest_streak = max(rollup.longest_streak or 0, merged)
+        rollup.longest_streak = max(rollup.longest_streak or 0, rollup.streak_length)
+
+    @staticmethod
+    def on_delete(rollup, date_str: str):
+        """A journal date was removed (and flushed) for rollup.user_id."""
+        if not rollup.last_entry_date:
+            return
+        day, last = _parse(date_str), _parse(rollup.last_entry_date)
+        run_start = last - timedelta(days=rollup.streak_length - 1)
+
+        if day >= run_start:
+            cut_run = rollup.streak_length
+            if day == last and rollup.streak_length > 1:
+                rollup.streak_length -= 1
+                rollup.last_entry_date = (day - timedelta(days=1)).strftime(DATE_FMT)
+            elif day == last:
+                prev = db.session.query(JournalEntry.date)\
+                    .filter(JournalEntry.user_id == rollup.user_id, JournalEntry.date < date_str)\
+                    .order_by(desc(JournalEntry.date)).limit(1).scalar()
+                rollup.last_entry_date = prev
+                rollup.streak_length = 1 + StreakEngine._run_before(rollup.user_id, _parse(prev)) if prev else 0
+            else:
+                rollup.streak_length = (last - day).days   # the part after the hole
+        else:
+            cut_run = StreakEngine._run_before(rollup.user_id, day) + 1 + \
+                StreakEngine._run_after(rollup.user_id, day)
+
+        if cut_run >= (rollup.longest_streak or 0):
+            rollup.longest_streak = StreakEngine._longest_run(rollup.user_id)
+
+    # --- Reads ---
+
+    @staticmethod
+    def current(rollup, today=None) -> int:
+        today = today or datetime.utcnow().date()
+        if not rollup or not rollup.last_entry_date:
+            return 0
+        # Future-dated entries (allowed on save/import) never make a run live
+        return rollup.streak_length if today - timedelta(days=1) <= _parse(rollup.last_entry_date) <= today else 0
+
+    @staticmethod
+    def summary(user_id: int) -> dict:
+        """Single PK read."""
+        rollup = db.session.get(PerformanceRollup, user_id)
+        return {
+            "current": StreakEngine.current(rollup),
+            "longest": rollup.longest_streak if rollup else 0,
+            "last_entry_date": rollup.last_entry_date if rollup else None,
+        }
+
+    @staticmethod
+    def top_current(limit: int = LEADERBOARD_MAX) -> list:
+        """Longest live streaks across users, walked in idx_rollup_streak order."""
+        today = datetime.utcnow().date()
+        yesterday, today = (today - timedelta(days=1)).strftime(DATE_FMT), today.strftime(DATE_FMT)
+        rows = db.session.query(PerformanceRollup.streak_length, PerformanceRollup.longest_streak,
+                                PerformanceRollup.last_entry_date, User.name)\
+            .join(User, User.id == PerformanceRollup.user_id)\
+            .filter(PerformanceRollup.streak_length > 0, PerformanceRollup.last_entry_date.between(yesterday, today))\
+            .order_by(PerformanceRollup.streak_length.desc(), PerformanceRollup.last_entry_date.desc())\
+            .limit(max(1, min(limit, StreakEngine.LEADERBOARD_MAX))).all()
+        return [
+            {"rank": i, "name": name, "current": streak, "longest": longest, "last_entry_date": last}
+            for i, (streak, longest, last, name) in enumerate(rows, start=1)
+        ]
@@ -0,0 +1,176 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, event, insert, or_
+from mentee.models import DrillSession, JournalEntry, SyncTombstone
+
+
+class CursorExpired(ValueError):
+    """The cursor predates the tombstone retention window."""
+
+
+class SyncEngine:
+    """
+    Delta sync of journal entries and drill sessions for client-side replicas.
+
+    The opaque cursor holds three positions:
+      j  (updated_at, id) keyset over idx_user_updated
+      d  last drill session id (idx_user_session); sessions are immutable and the
+         write-behind queue inserts them after their timestamp, so id is the
+         only order that never skips a late row
+      t  last tombstone id (idx_tombstone_user)
+    Tombstones are always sent before upserts. updated_at is stamped at flush,
+    before the writer waits for the SQLite write lock or a pooled connection, so
+    a save can commit up to hold_seconds() after its stamp. On every page the
+    journal position is therefore held that far behind the clock; a page that
+    reaches into the hold window ends the journal pass, and the rows it served
+    come again on the next sync (clients upsert idempotently).
+
+    The nightly compact job purges tombstones after TOMBSTONE_RETENTION_DAYS, so a
+    cursor issued (at) before that horizon raises CursorExpired and the client
+    starts a full sync.
+    """
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+    SAFETY_SECONDS = 2      # margin on top of the lock and pool waits
+    TOMBSTONE_RETENTION_DAYS = 90
+    VERSION = 1
+
+    @staticmethod
+    def hold_seconds() -> float:
+        """Longest gap between a journal row's updated_at stamp and its commit becoming visible."""
+        config = current_app.config
+        return config.get('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000 + config.get('DB_POOL_TIMEOUT', 30) + \
+            SyncEngine.SAFETY_SECONDS
+
+    # --- Cursor ---
+
+    @staticmethod
+    def encode_cursor(position: dict) -> str:
+        raw = json.dumps({"v": SyncEngine.VERSION, **position}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> dict:
+        """Empty cursor -> full sync. Raises ValueError on anything malformed."""
+        if not cursor:
+            return {"j": None, "d": 0, "t": 0, "at": None}
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            position = json.loads(raw)
+            if position.get("v") != SyncEngine.VERSION:
+                raise ValueError
+            j = position.get("j")
+            if j is not None:
+                j = (datetime.fromisoformat(j[0]), int(j[1]))
+            at = datetime.fromisoformat(position["at"])
+            decoded = {"j": j, "d": int(position.get("d", 0)), "t": int(position.get("t", 0)), "at": at}
+        except (KeyError, TypeError, ValueError, IndexError, AttributeError, json.JSONDecodeError):
+            raise ValueError("Invalid sync cursor")
+        # A day of slack so a tombstone purged tonight is never newer than an accepted cursor
+        horizon = datetime.utcnow() - timedelta(days=SyncEngine.TOMBSTONE_RETENTION_DAYS - 1)
+        if at < horizon:
+            raise CursorExpired("Sync cursor expired; start a full sync")
+        return decoded
+
+    # --- Payload rows ---
+
+    @staticmethod
+    def drill_dict(session: DrillSession) -> dict:
+        return {
+            "id": session.id,
+            "drill_id": session.drill_id,
+            "score": session.score,
+            "accuracy": session.accuracy,
+            "level": session.level_reached,
+            "duration": session.duration_seconds,
+            "meta": session.meta_data or {},
+            "timestamp": session.timestamp.isoformat() if session.timestamp else None,
+        }
+
+    # --- Sync ---
+
+    @staticmethod
+    def changes(user_id: int, cursor: str = None, limit: int = DEFAULT_LIMIT) -> dict:
+        """
+        Everything that changed for one user since cursor, at most limit rows per kind.
+        Raises ValueError for a bad cursor (CursorExpired once it is past retention).
+        """
+        position = SyncEngine.decode_cursor(cursor)
+        limit = max(1, min(limit, SyncEngine.MAX_LIMIT))
+        now = datetime.utcnow()
+
+        tombstones = SyncTombstone.query\
+            .filter(SyncTombstone.user_id == user_id, SyncTombstone.id > position["t"])\
+            .order_by(SyncTombstone.id).limit(limit + 1).all()
+        deleted = [{"entity": t.entity, "key": t.entity_key, "deleted_at": t.deleted_at.isoformat()}
+                   for t in tombstones[:limit]]
+        if tombstones:
+            position["t"] = tombstones[:limit][-1].id
+
+        # Deletes first: a client never applies an upsert before the delete that preceded it
+        if len(tombstones) > limit:
+            return SyncEngine._page(position, True, deleted, [], [], now)
+
+        journal = JournalEntry.query.filter(JournalEntry.user_id == user_id)
+        if position["j"] is not None:
+            after_ts, after_id = position["j"]
+            journal = journal.filter(or_(JournalEntry.updated_at > after_ts,
+                                         and_(JournalEntry.updated_at == after_ts, JournalEntry.id > after_id)))
+        journal = journal.order_by(JournalEntry.updated_at, JournalEntry.id).limit(limit + 1).all()
+
+        drills = DrillSession.query\
+            .filter(DrillSession.user_id == user_id, DrillSession.id > position["d"])\
+            .order_by(DrillSession.id).limit(limit + 1).all()
+
+        journal_more, drills_more = len(journal) > limit, len(drills) > limit
+        journal, drills = journal[:limit], drills[:limit]
+        if drills:
+            position["d"] = drills[-1].id
+
+        held = now - timedelta(seconds=SyncEngine.hold_seconds())
+        j = (journal[-1].updated_at, journal[-1].id) if journal else position["j"]
+        if j is not None and j[0] > held:
+            # Rows this recent may still have earlier-stamped commits landing behind them:
+            # hold the cursor behind the clock (never behind where it was) and stop here,
+            # since paging on from the held position would serve this page again
+            j = max(position["j"] or (held, 0), (held, 0))
+            journal_more = False
+        position["j"] = j
+        has_more = journal_more or drills_more
+
+        return SyncEngine._page(position, has_more, deleted,
+                                [e.to_dict() for e in journal],
+                                [SyncEngine.drill_dict(s) for s in drills], now)
+
+    @staticmethod
+    def _page(position, has_more, deleted, journal, drills, now) -> dict:
+        j = position["j"]
+        return {
+            "cursor": SyncEngine.encode_cursor({
+                "j": [j[0].isoformat(), j[1]] if j else None, "d": position["d"], "t": position["t"],
+                "at": now.isoformat()}),
+            "has_more": has_more,
+            "deleted": deleted,
+            "journal": journal,
+            "drills": drills,
+            "server_time": now.isoformat(),
+        }
+
+
+# --- Tombstones ---
+# ORM deletes record a tombstone in the same transaction. Bulk query.delete()
+# bypasses these hooks, so anything deleting that way writes its own rows.
+
+def _tombstone(entity, key_of):
+    def listener(mapper, connection, target):
+        connection.execute(insert(SyncTombstone.__table__).values(
+            user_id=target.user_id, entity=entity, entity_key=str(key_of(target)),
+            deleted_at=datetime.utcnow()))
+    return listener
+
+
+event.listen(JournalEntry, 'after_delete', _tombstone('journal', lambda e: e.date))
+event.listen(DrillSession, 'after_delete', _tombstone('drill', lambda s: s.id))
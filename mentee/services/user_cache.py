@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, joinedload, object_session
+from mentee.models import User, UserIdentity, db
+
+
+class IdentitySnapshot:
+    __slots__ = ('archetype_name', 'core_traits')
+
+    def __init__(self, identity):
+        self.archetype_name = identity.archetype_name
+        self.core_traits = tuple(identity.core_traits or ())
+
+
+class UserSnapshot(UserMixin):
+    """
+    Detached, read-only view of a User for current_user.
+    Holds plain values only, so it is safe to share across requests and threads.
+    """
+    __slots__ = ('id', 'email', 'name', 'identity')
+
+    def __init__(self, user):
+        self.id = user.id
+        self.email = user.email
+        self.name = user.name
+        self.identity = IdentitySnapshot(user.identity) if user.identity else None
+
+
+class UserCache:
+    """
+    Per-process LRU + TTL cache of UserSnapshots behind the Flask-Login user_loader.
+
+    Writes to users / user_identities invalidate the entry in this process through
+    mapper events, and again once the transaction commits or rolls back, so a
+    concurrent request cannot re-cache the pre-commit row in between. Every
+    invalidation bumps a generation; a load that an invalidation overtook is
+    returned but not cached. Other workers converge within USER_CACHE_TTL seconds.
+    """
+
+    def __init__(self, app=None):
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._invalidated = OrderedDict()   # user_id -> generation of its latest invalidation
+        self._forgotten = 0                 # newest generation pruned from _invalidated
+        self._lock = threading.Lock()
+        self.max_size = 1024
+        self.ttl = 300.0
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_SIZE', 1024)
+        app.config.setdefault('USER_CACHE_TTL', 300)
+        self.max_size = app.config['USER_CACHE_SIZE']
+        self.ttl = float(app.config['USER_CACHE_TTL'])
+        self.clear()
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id: int):
+        """Returns a UserSnapshot (loading it with its identity on a miss) or None."""
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(user_id)
+            if hit and hit[0] > now:
+                self._entries.move_to_end(user_id)
+                self.counters["hits"] += 1
+                return hit[1]
+            self.counters["misses"] += 1
+            started = self._generation
+
+        user = User.query.options(joinedload(User.identity)).filter_by(id=user_id).first()
+        if not user:
+            return None
+
+        snapshot = UserSnapshot(user)
+        with self._lock:
+            if self._invalidated.get(user_id, self._forgotten) > started:
+                # Invalidated while we loaded: this row may predate that write
+                return snapshot
+            self._entries[user_id] = (now + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+        return snapshot
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._generation += 1
+            self._invalidated[user_id] = self._generation
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.max_size:
+                self._forgotten = self._invalidated.popitem(last=False)[1]
+            if self._entries.pop(user_id, None) is not None:
+                self.counters["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._forgotten = self._generation
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "size": len(self._entries),
+            "capacity": self.max_size,
+            "hit_ratio": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+user_cache = UserCache()
+
+
+# --- Invalidation on profile / identity writes ---
+
+def _written(target, user_id):
+    user_cache.invalidate(user_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('user_cache_dirty', set()).add(user_id)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_written(mapper, connection, target):
+    _written(target, target.id)
+
+
+@event.listens_for(UserIdentity, 'after_insert')
+@event.listens_for(UserIdentity, 'after_update')
+@event.listens_for(UserIdentity, 'after_delete')
+def _identity_written(mapper, connection, target):
+    _written(target, target.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _transaction_ended(session):
+    # Anything cached between the flush and now is the old row (or a rolled-back one)
+    for user_id in session.info.pop('user_cache_dirty', ()):
+        user_cache.invalidate(user_id)
@@ -33,11 +33,14 @@ class BaseDrill {
         this.interval = null;
         this.accuracyHits = 0;
         this.accuracyTotal = 0;
+        this.samples = { reaction_ms: [], hits: [] };
+        this.lastActionAt = null;
     }
 
     start() {
         this.isRunning = true;
         this.score = 0;
+        this.lastActionAt = Date.now();
         this.updateHUD();
         this.startTimer();
         this.setupGame();
@@ -69,9 +72,14 @@ class BaseDrill {
         document.getElementById('hud-level').innerText = this.level;
     }
 
-    recordAction(correct) {
+    // ms defaults to the time since the previous action (per-trial response time)
+    recordAction(correct, ms = null) {
+        const now = Date.now();
         this.accuracyTotal++;
         if(correct) this.accuracyHits++;
+        this.samples.reaction_ms.push(ms !== null ? ms : now - this.lastActionAt);
+        this.samples.hits.push(correct ? 1 : 0);
+        this.lastActionAt = now;
     }
 
     async endGame() {
@@ -90,7 +98,7 @@ class BaseDrill {
 
         // Backend Save
         try {
-            await fetch('/api/drills/save', {
+            const res = await fetch('/dashboard/api/drills/save', {
                 method: 'POST',
                 headers: {'Content-Type': 'application/json'},
                 body: JSON.stringify({
@@ -98,9 +106,15 @@ class BaseDrill {
                     score: this.score,
                     accuracy: acc,
                     level: this.level,
-                    duration: 60 - this.timer
+                    duration: 60 - this.timer,
+                    samples: this.samples
                 })
             });
+            const json = await res.json();
+            if(json.percentile && json.percentile.players > 1) {
+                const rank = document.getElementById('res-rank');
+                rank.innerText = `${json.is_personal_best ? 'New personal best! ' : ''}You are in the top ${json.percentile.top_percent}%`;
+            }
         } catch(e) { console.error("Save failed", e); }
     }
 }
@@ -140,14 +154,14 @@ class ReactionDrill extends BaseDrill {
         if(this.state === 'wait') {
             this.score -= 50; // Penalty
             this.zone.innerText = "TOO EARLY!";
-            this.recordAction(false);
+            this.recordAction(false, 0);
             clearTimeout(this.timeout);
             setTimeout(() => this.scheduleNext(), 1000);
         } else if(this.state === 'go') {
             const time = Date.now() - this.startTime;
             const points = Math.max(0, 500 - time); // Faster = more points
             this.addScore(points);
-            this.recordAction(true);
+            this.recordAction(true, time);
             this.zone.innerText = `${time}ms`;
             this.state = 'done';
             setTimeout(() => this.scheduleNext(), 1000);
@@ -2,11 +2,21 @@ const Journal = {
     viewDate: new Date(),
     selDate: null,
     dataCache: {},
+    // Local replica kept current by /api/sync; month changes and panel opens never hit the network
+    replicaKey: document.currentScript?.dataset.replica || 'mentee.replica',
+    replica: { cursor: null, entries: {}, drills: {} },
+    syncing: null,
+    // Open entry: version for If-Match and the field values the server already has
+    version: null,
+    sent: {},
+    autosaveTimer: null,
 
     init() {
+        this.loadReplica();
         this.renderGrid();
         this.fetchData();
         this.bindEvents();
+        this.sync();
     },
 
     bindEvents() {
@@ -23,13 +33,19 @@ const Journal = {
             btn.onclick = (e) => {
                 document.querySelectorAll('.mood-btn').forEach(b => b.classList.remove('selected'));
                 e.currentTarget.classList.add('selected');
+                this.scheduleAutosave();
             }
         });
 
         // Slider
         document.getElementById('inScore').oninput = (e) => {
             document.getElementById('scoreDisplay').innerText = e.target.value;
+            this.scheduleAutosave();
         };
+        ['inWin', 'inReflect'].forEach(id => {
+            document.getElementById(id).addEventListener('input', () => this.scheduleAutosave());
+        });
+        document.getElementById('checkDump').addEventListener('change', () => this.scheduleAutosave());
     },
 
     shiftMonth(dir) {
@@ -80,21 +96,65 @@ const Journal = {
         }
     },
 
-    async fetchData() {
-        const year = this.viewDate.getFullYear();
-        const month = String(this.viewDate.getMonth() + 1).padStart(2, '0');
-        
+    fetchData() {
+        this.updateVisuals();
+    },
+
+    loadReplica() {
         try {
-            const res = await fetch(`/api/journal/calendar?month=${year}-${month}`);
-            const data = await res.json();
-            this.dataCache = data;
-            this.updateVisuals();
-        } catch(e) { console.error("API Error", e); }
+            const saved = JSON.parse(localStorage.getItem(this.replicaKey));
+            if(saved && saved.entries) this.replica = saved;
+        } catch(e) { console.warn("Replica reset", e); }
+        this.dataCache = this.replica.entries;
+    },
+
+    saveReplica() {
+        try {
+            localStorage.setItem(this.replicaKey, JSON.stringify(this.replica));
+        } catch(e) { console.warn("Replica not persisted", e); }
+    },
+
+    // Pulls only what changed since the stored cursor; deletes are applied before upserts
+    sync() {
+        if(this.syncing) return this.syncing;
+        this.syncing = (async () => {
+            try {
+                let more = true;
+                while(more) {
+                    const cursor = this.replica.cursor ? `?cursor=${encodeURIComponent(this.replica.cursor)}` : '';
+                    const res = await fetch(`/dashboard/api/sync${cursor}`);
+                    if((res.status === 400 || res.status === 410) && this.replica.cursor) {
+                        // Cursor from an older format, or older than tombstone retention: start a fresh full sync
+                        this.replica = { cursor: null, entries: {}, drills: {} };
+                        this.dataCache = this.replica.entries;
+                        continue;
+                    }
+                    if(!res.ok) throw new Error(`sync ${res.status}`);
+                    const page = await res.json();
+
+                    page.deleted.forEach(t => {
+                        if(t.entity === 'journal') delete this.replica.entries[t.key];
+                        else if(t.entity === 'drill') delete this.replica.drills[t.key];
+                    });
+                    page.journal.forEach(e => {
+                        // A debounced autosave is ahead of the row until its flush syncs
+                        const mine = this.replica.entries[e.date];
+                        if(!(mine && mine.pending && mine.version > e.version)) this.replica.entries[e.date] = e;
+                    });
+                    page.drills.forEach(d => { this.replica.drills[d.id] = d; });
+                    this.replica.cursor = page.cursor;
+                    more = page.has_more;
+                }
+                this.saveReplica();
+                this.updateVisuals();
+            } catch(e) { console.error("Sync Error", e); }
+            finally { this.syncing = null; }
+        })();
+        return this.syncing;
     },
 
     updateVisuals() {
-        let streak = 0;
-        
+        document.querySelectorAll('.d-cell.filled').forEach(cell => cell.classList.remove('filled'));
         Object.keys(this.dataCache).forEach(date => {
             const cell = document.getElementById(`cell-${date}`);
             if(cell) {
@@ -120,13 +180,17 @@ const Journal = {
                 } else {
                     indicator.style.backgroundColor = 'var(--j-accent)';
                 }
-                streak++;
             }
         });
-        document.getElementById('streakCount').innerText = streak;
+    },
+
+    // Streaks come from the server index (rendered into the page, refreshed by saves)
+    showStreak(streak) {
+        if(streak) document.getElementById('streakCount').innerText = streak.current;
     },
 
     async openPanel(dateStr) {
+        this.flushAutosave();
         this.selDate = dateStr;
         const d = new Date(dateStr);
         
@@ -146,55 +210,145 @@ const Journal = {
         // Show
         document.getElementById('entryPanel').classList.add('open');
 
-        // Fetch
-        try {
-            const res = await fetch(`/api/journal/${dateStr}`);
-            const json = await res.json();
-
-            if(json.exists) {
-                const data = json.data;
-                if(data.mood) document.querySelector(`.mood-btn[data-val="${data.mood}"]`)?.classList.add('selected');
-                if(data.score) {
-                    document.getElementById('inScore').value = data.score;
-                    document.getElementById('scoreDisplay').innerText = data.score;
-                }
-                if(data.content) {
-                    document.getElementById('inWin').value = data.content.micro_win || "";
-                    document.getElementById('inReflect').value = data.content.reflection || "";
-                    document.getElementById('checkDump').checked = data.content.brain_dump_mode || false;
-                }
+        // Served from the replica; only a cold replica goes to the network
+        let data = this.replica.entries[dateStr];
+        if(!data && !this.replica.cursor) {
+            try {
+                const res = await fetch(`/dashboard/api/journal/${dateStr}`);
+                const json = await res.json();
+                if(json.exists) data = json.data;
+            } catch(e) { console.error("Load Error:", e); }
+        }
+        if(this.selDate !== dateStr) return;
+        this.version = data ? data.version ?? null : null;
+        this.sent = data ? this.fieldsOf(data) : {};
+        if(data) {
+            if(data.mood) document.querySelector(`.mood-btn[data-val="${data.mood}"]`)?.classList.add('selected');
+            if(data.score) {
+                document.getElementById('inScore').value = data.score;
+                document.getElementById('scoreDisplay').innerText = data.score;
+            }
+            if(data.content) {
+                document.getElementById('inWin').value = data.content.micro_win || "";
+                document.getElementById('inReflect').value = data.content.reflection || "";
+                document.getElementById('checkDump').checked = data.content.brain_dump_mode || false;
             }
-        } catch(e) { console.error("Load Error:", e); }
+        }
     },
 
     close() {
+        this.flushAutosave();
         document.getElementById('entryPanel').classList.remove('open');
     },
 
-    async save() {
+    fieldsOf(entry) {
+        const content = entry.content || {};
+        return {
+            mood: entry.mood ?? null,
+            score: entry.score ?? null,
+            micro_win: content.micro_win || "",
+            reflection: content.reflection || "",
+            brain_dump_mode: !!content.brain_dump_mode
+        };
+    },
+
+    panelFields() {
         const moodEl = document.querySelector('.mood-btn.selected');
-        
-        const payload = {
-            date: this.selDate,
+        return {
             mood: moodEl ? moodEl.dataset.val : null,
-            score: document.getElementById('inScore').value,
+            score: parseInt(document.getElementById('inScore').value, 10),
             micro_win: document.getElementById('inWin').value,
             reflection: document.getElementById('inReflect').value,
             brain_dump_mode: document.getElementById('checkDump').checked
         };
+    },
+
+    // Only fields that differ from what the server has are sent
+    panelDiff() {
+        const fields = this.panelFields();
+        const diff = {};
+        Object.keys(fields).forEach(k => { if(fields[k] !== this.sent[k]) diff[k] = fields[k]; });
+        return diff;
+    },
+
+    scheduleAutosave() {
+        clearTimeout(this.autosaveTimer);
+        this.autosaveTimer = setTimeout(() => {
+            this.autosaveTimer = null;
+            this.patch(true).catch(e => console.error("Autosave Error", e));
+        }, 800);
+    },
+
+    flushAutosave() {
+        if(!this.autosaveTimer) return;
+        clearTimeout(this.autosaveTimer);
+        this.autosaveTimer = null;
+        this.patch(true).catch(e => console.error("Autosave Error", e));
+    },
+
+    // PATCH the diff with If-Match; autosaves are debounced again on the server (202)
+    async patch(autosave) {
+        const dateStr = this.selDate;
+        const diff = this.panelDiff();
+        if(!dateStr || !Object.keys(diff).length) return {ok: true};
+
+        const headers = {'Content-Type': 'application/json'};
+        if(this.version !== null) headers['If-Match'] = `"${this.version}"`;
+        const res = await fetch(`/dashboard/api/journal/${dateStr}${autosave ? '?autosave=1' : ''}`, {
+            method: 'PATCH', headers, body: JSON.stringify(diff)
+        });
+        const json = await res.json();
 
+        if(res.status === 409) {
+            // Another tab or device won: adopt its version and show it
+            if(json.current) this.replica.entries[dateStr] = json.current;
+            else delete this.replica.entries[dateStr];
+            this.saveReplica();
+            this.updateVisuals();
+            if(this.selDate === dateStr) { this.autosaveTimer = null; await this.openPanel(dateStr); }
+            return {ok: false, conflict: true};
+        }
+        if(!res.ok) throw new Error(json.error);
+
+        if(res.status === 202) {
+            // Debounced server-side: json.version is what the flush will write, and the next If-Match
+            const base = this.replica.entries[dateStr] || {date: dateStr, mood: null, score: null, content: {}};
+            const entry = {...base, content: {...base.content}, version: json.version, pending: true};
+            Object.entries(diff).forEach(([key, value]) => {
+                if(key === 'mood' || key === 'score') entry[key] = value;
+                else entry.content[key] = value;
+            });
+            this.replica.entries[dateStr] = entry;
+            this.saveReplica();
+            this.updateVisuals();
+            if(this.selDate === dateStr) {
+                this.version = json.version;
+                this.sent = {...this.sent, ...diff};
+            }
+            return {ok: true};
+        }
+        // The response is the new row; the next sync re-sends it harmlessly
+        this.replica.entries[dateStr] = json.data;
+        this.saveReplica();
+        this.updateVisuals();
+        this.showStreak(json.streak);
+        if(this.selDate === dateStr) {
+            this.version = json.data.version;
+            this.sent = this.fieldsOf(json.data);
+        }
+        return {ok: true, effort: json.effort};
+    },
+
+    async save() {
         const msg = document.getElementById('saveMsg');
         msg.innerText = "Saving...";
         msg.style.opacity = 1;
+        clearTimeout(this.autosaveTimer);
+        this.autosaveTimer = null;
 
         try {
-            await fetch('/api/journal', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify(payload)
-            });
-            msg.innerText = "Saved!";
-            this.fetchData(); // Refresh Grid
+            const result = await this.patch(false);
+            msg.innerText = result.conflict ? "Changed elsewhere - reloaded" : "Saved!";
             setTimeout(() => msg.style.opacity = 0, 1500);
         } catch(e) {
             msg.innerText = "Error";
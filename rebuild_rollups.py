@@ -0,0 +1,21 @@
+import sys
+from mentee import create_app, db
+from mentee.services.rollup_engine import RollupEngine
+from mentee.services.leaderboard_engine import LeaderboardEngine
+
+# Usage: python rebuild_rollups.py [user_id]
+# Run once after init_db adds performance_rollups.longest_streak to backfill it.
+app = create_app()
+
+with app.app_context():
+    user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    scope = f"user {user_id}" if user_id is not None else "all users"
+
+    print(f"--- Rebuilding performance rollups for {scope} ---")
+    written = RollupEngine.rebuild(user_id)
+    print(f"✅ SUCCESS: {written} rollups recomputed from journal_entries.")
+
+    if user_id is None:
+        print("--- Rebuilding drill personal bests ---")
+        written = LeaderboardEngine.rebuild()
+        print(f"✅ SUCCESS: {written} personal bests recomputed from drill_sessions.")
@@ -1,5 +1,7 @@
 from mentee import create_app, db
 from mentee.models import User, JournalEntry, UserIdentity
+from mentee.services.schema_engine import SchemaEngine
+from mentee.services.journal_search import JournalSearchEngine
 from datetime import datetime, timedelta
 import random
 
@@ -7,10 +9,13 @@ app = create_app()
 
 with app.app_context():
     print("--- 1. Wiping Old Database ---")
+    if db.engine.dialect.name == 'sqlite':
+        with db.engine.begin() as conn:
+            JournalSearchEngine.drop(conn)
     db.drop_all()
     
     print("--- 2. Creating New Schema (SQLite Compatible) ---")
-    db.create_all()
+    SchemaEngine.upgrade()
 
     # Create User (Make sure to change password if needed)
     user = User(email="test@elite.com", name="Aniket Narayan Biswas", password="password")
@@ -1,7 +1,11 @@
 from mentee import create_app
+from mentee.services.schema_engine import SchemaEngine
 
-app = create_app()
-
-
+# Import-safe on purpose: the password pool's forkserver/spawn children import this
+# module as __mp_main__. `flask --app run` finds the create_app factory on its own.
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app = create_app()
+    # Dev server convenience; deployed workers rely on `python init_db.py` instead
+    with app.app_context():
+        SchemaEngine.upgrade()
+    app.run(debug=True)
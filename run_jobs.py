@@ -0,0 +1,39 @@
+import sys
+from mentee import create_app, db
+from mentee.services.job_scheduler import job_scheduler
+from mentee.services.nightly_jobs import JOBS
+
+# Usage: python run_jobs.py [job ...] [--force]
+# Runs tonight's batch jobs now (e.g. from cron instead of JOBS_ENABLED workers).
+# Safe to re-run: finished jobs are skipped, interrupted ones resume from their last finished chunk.
+# Jobs: gap_days, drill_snapshots, trend_reports, compact
+app = create_app()
+
+with app.app_context():
+    args = sys.argv[1:]
+    force = '--force' in args
+    jobs = [a for a in args if a != '--force'] or None
+    unknown = set(jobs or ()) - JOBS.keys()
+    if unknown:
+        print(f"❌ Unknown job(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(JOBS)}")
+        sys.exit(2)
+
+    print(f"--- Running nightly jobs: {', '.join(jobs or JOBS)} ---")
+    failed = 0
+    for result in job_scheduler.run_all(jobs=jobs, force=force):
+        if result["status"] == 'skipped':
+            print(f"   {result['job']}: already done for {result['run_date']} (use --force to re-run)")
+        elif result["status"] == 'taken_over':
+            print(f"   {result['job']}: taken over by another process (its heartbeat saw this run as stalled)")
+        elif result["status"] == 'done':
+            resumed = f", {result['resumed_chunks']} resumed" if result["resumed_chunks"] else ""
+            print(f"   {result['job']}: {result['rows']} rows in {result['chunks']} chunks{resumed} ({result['ms']} ms)")
+        else:
+            failed += 1
+            print(f"   {result['job']}: FAILED {result['error']}")
+    db.session.remove()
+
+    if failed:
+        print(f"❌ {failed} job(s) failed; re-run to resume.")
+        sys.exit(1)
+    print("✅ SUCCESS: Nightly jobs complete.")
@@ -0,0 +1,48 @@
+import pytest
+import config
+from mentee import create_app, db
+from mentee.services.autosave_queue import autosave_queue
+from mentee.services.drill_queue import drill_queue
+from mentee.services.schema_engine import SchemaEngine
+from mentee.services.user_cache import user_cache
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    class TestConfig(config.Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path_factory.mktemp('db') / 'mentee.db'}"
+        JOBS_ENABLED = False
+        DRILL_FLUSH_INTERVAL = 60      # tests flush the write-behind queue explicitly
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        SchemaEngine.upgrade()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def clean_db(app):
+    """Every test starts from empty tables and cold per-process caches."""
+    yield
+    with app.app_context():
+        autosave_queue.flush(force=True)
+        drill_queue.flush()
+        db.session.remove()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+    user_cache.clear()
+
+
+def login(app, email='a@b.c', name='A', password='pw'):
+    """A test client signed up (first call) and logged in as email."""
+    client = app.test_client()
+    client.post('/auth/signup', data={'email': email, 'name': name, 'password': password})
+    client.post('/auth/login', data={'email': email, 'password': password})
+    return client
+
+
+@pytest.fixture
+def client(app):
+    return login(app)
@@ -0,0 +1,20 @@
+import gzip
+import re
+from mentee.services.asset_manifest import asset_manifest
+
+
+def test_assets_are_precompressed_when_the_manifest_is_built(app):
+    hashed = asset_manifest.resolve('css/journal.css')
+    entry = asset_manifest._by_hashed[hashed]
+    assert entry["gzip"] is not None          # before any request asked for it
+
+    response = app.test_client().get(f'/assets/{hashed}', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert gzip.decompress(response.data) == entry["identity"]
+
+
+def test_templates_link_fingerprinted_assets(client):
+    page = client.get('/dashboard/journal').get_data(as_text=True)
+    assert re.search(r'/assets/js/journal\.[0-9a-f]{12}\.js', page)
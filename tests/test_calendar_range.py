@@ -0,0 +1,28 @@
+RANGE = '/dashboard/api/journal/calendar/range?from=2026-01-01&to=2026-01-31'
+
+
+def _save(client, date, score):
+    return client.post('/dashboard/api/journal', json={'date': date, 'mood': 'calm', 'score': score})
+
+
+def test_unchanged_range_revalidates_with_304(client):
+    _save(client, '2026-01-05', 6)
+    first = client.get(RANGE)
+    assert first.status_code == 200
+
+    again = client.get(RANGE, headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_deleting_an_older_entry_changes_the_etag(client):
+    _save(client, '2026-01-05', 6)
+    _save(client, '2026-01-06', 7)          # newest write; the delete below is not it
+    first = client.get(RANGE)
+    assert first.get_json()['dates'] == ['2026-01-05', '2026-01-06']
+
+    assert client.delete('/dashboard/api/journal/2026-01-05').status_code == 200
+
+    after = client.get(RANGE, headers={'If-None-Match': first.headers['ETag']})
+    assert after.status_code == 200
+    assert after.get_json()['dates'] == ['2026-01-06']
+    assert after.headers['ETag'] != first.headers['ETag']
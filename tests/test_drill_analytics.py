@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.mark.parametrize('sessions, expected', [(-5, 1), (0, 4), (2, 2), (10**9, 4)])
+def test_sessions_window_is_clamped(client, sessions, expected):
+    for _ in range(4):
+        client.post('/dashboard/api/drills/save', json={
+            'drill_id': 'reaction', 'score': 5,
+            'samples': {'reaction_ms': [300, 280, 310, 290], 'hits': [True, True, False, True]}})
+
+    report = client.get(f'/dashboard/api/drills/reaction/analytics?sessions={sessions}').get_json()
+    assert report['status'] == 'success'
+    assert report['sessions'] == expected
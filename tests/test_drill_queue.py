@@ -0,0 +1,54 @@
+from mentee import db
+from mentee.models import DrillSession
+from mentee.services import drill_queue as drill_queue_module
+from mentee.services.drill_queue import drill_queue
+
+
+def test_bad_row_is_isolated_from_its_batch(app, client, monkeypatch):
+    real_write = drill_queue_module.write_sessions
+
+    def write_sessions(rows):
+        if any(r["score"] == 666 for r in rows):
+            raise RuntimeError("constraint violated")
+        real_write(rows)
+
+    monkeypatch.setattr(drill_queue_module, 'write_sessions', write_sessions)
+    scores = [1, 2, 3, 666, 5, 6, 7]
+    response = client.post('/dashboard/api/drills/save-batch', json={
+        'sessions': [{'drill_id': 'reaction', 'score': s} for s in scores]})
+    assert response.status_code == 202
+
+    dropped = drill_queue.counters["dropped_rows"]
+    drill_queue.flush()
+
+    assert drill_queue.counters["dropped_rows"] == dropped + 1
+    with app.app_context():
+        assert sorted(s for (s,) in db.session.query(DrillSession.score)) == [1, 2, 3, 5, 6, 7]
+
+
+def test_malformed_numbers_are_rejected_per_session(client):
+    response = client.post('/dashboard/api/drills/save-batch', json={'sessions': [
+        {'drill_id': 'reaction', 'score': 5, 'accuracy': 'high'},
+        {'drill_id': 'reaction', 'score': 5, 'level': [3]},
+        {'drill_id': 'reaction', 'score': 5, 'duration': True},
+        {'drill_id': 'reaction', 'score': 5, 'meta': 'x'},
+        {'drill_id': 'reaction', 'score': 5, 'accuracy': 0.9, 'level': 3, 'duration': 42.0},
+    ]})
+
+    body = response.get_json()
+    assert body['accepted'] == 1
+    assert [e['index'] for e in body['errors']] == [0, 1, 2, 3]
+
+
+def test_exit_hook_waits_for_the_first_enqueue(app, client):
+    fresh = drill_queue_module.DrillWriteBehind()
+    fresh.init_app(app)
+    assert not fresh._exit_hook
+    try:
+        assert fresh.enqueue([{"user_id": 1, "drill_id": "reaction", "score": 1}])
+        assert fresh._exit_hook
+    finally:
+        fresh._stopping = True
+        fresh._drain()
+        fresh._wake.set()
+        app.extensions['drill_queue'] = drill_queue
@@ -0,0 +1,33 @@
+from mentee import db
+from mentee.models import User, UserIdentity
+from mentee.services.journal_engine import PerformanceEngine
+
+
+def test_prompts_serialize_and_follow_traits(app, client):
+    body = client.get('/dashboard/api/journal/prompts').get_json()
+    assert [p['id'] for p in body['prompts']] == ['win', 'fix']
+
+    with app.app_context():
+        user = User.query.filter_by(email='a@b.c').one()
+        db.session.add(UserIdentity(user_id=user.id, archetype_name='Hunter',
+                                    core_traits=['Analytical', 'Stoic', 'Stoic']))
+        db.session.commit()
+
+    prompts = client.get('/dashboard/api/journal/prompts').get_json()['prompts']
+    ids = [p['id'] for p in prompts]
+    assert ids == ['win', 'fix', 'id_stoic', 'id_analytical']
+    assert len(set(ids)) == len(ids)
+
+
+def test_callers_cannot_mutate_the_shared_schema(app, client):
+    prompts = client.get('/dashboard/api/journal/prompts').get_json()['prompts']
+    with app.app_context():
+        user_id = User.query.filter_by(email='a@b.c').one().id
+        mine = PerformanceEngine.get_identity_schema(user_id)
+        mine[0]['label'] = 'changed'
+        mine.append({'id': 'extra'})
+        assert PerformanceEngine.get_identity_schema(user_id) == prompts
+
+
+def test_journal_page_renders_prompts(client):
+    assert b'data-prompt="win"' in client.get('/dashboard/journal').data
@@ -0,0 +1,36 @@
+import os
+import pytest
+from PIL import Image
+from mentee.services.image_pipeline import image_pipeline
+
+
+def test_unknown_names_do_not_rescan_unchanged_sources(app, monkeypatch):
+    scans = []
+    sources = image_pipeline.sources
+    monkeypatch.setattr(image_pipeline, 'sources', lambda: scans.append(1) or sources())
+    monkeypatch.setattr(image_pipeline, '_scanned', None)
+    client = app.test_client()
+
+    assert client.get('/media/img/probe-1.webp').status_code == 404
+    assert client.get('/media/img/probe-2.webp').status_code == 404
+    assert len(scans) == 1
+
+
+def test_fallback_img_keeps_caller_attributes(app):
+    with app.test_request_context():
+        html = str(image_pipeline.responsive_img('img/missing.png', alt='Hero', class_='hero', loading='lazy'))
+    assert html.startswith('<img ') and 'class="hero"' in html and 'loading="lazy"' in html
+
+
+def test_failed_render_leaves_no_temp_file(app, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, 'IMAGE_CACHE_DIR', str(tmp_path))
+
+    def broken_save(*args, **kwargs):
+        raise OSError("disk full")
+
+    with app.app_context():
+        name = image_pipeline.variants('img/logo.png', 'jpg')[0][1]
+        monkeypatch.setattr(Image.Image, 'save', broken_save)
+        with pytest.raises(OSError):
+            image_pipeline.render(name)
+    assert os.listdir(tmp_path) == []
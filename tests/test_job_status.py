@@ -0,0 +1,60 @@
+def test_status_is_off_without_a_token(app):
+    assert app.config['JOBS_TOKEN'] is None
+    assert app.test_client().get('/jobs/status').status_code == 404
+
+
+def test_status_requires_the_bearer_token(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'JOBS_TOKEN', 's3cret')
+    client = app.test_client()
+    assert client.get('/jobs/status').status_code == 403
+    assert client.get('/jobs/status', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+
+    res = client.get('/jobs/status', headers={'Authorization': 'Bearer s3cret'})
+    assert res.status_code == 200
+    assert 'scheduler' in res.get_json()
+
+
+def _job(monkeypatch, run):
+    from mentee.services.nightly_jobs import JOBS
+    monkeypatch.setitem(JOBS, 'probe', {"chunks": lambda size: 1, "run": run})
+
+
+def test_heartbeat_moves_while_a_long_chunk_runs(app, monkeypatch):
+    import time
+    from mentee import db
+    from mentee.models import JobRun
+    from mentee.services.job_scheduler import job_scheduler
+    monkeypatch.setitem(app.config, 'JOBS_STALE_SECONDS', 3)     # beat every second
+    seen = {}
+
+    def slow_chunk(chunk, size, run_date):
+        claimed = JobRun.query.filter_by(job='probe').one().heartbeat_at
+        time.sleep(1.8)
+        db.session.expire_all()
+        seen['moved'] = JobRun.query.filter_by(job='probe').one().heartbeat_at > claimed
+        db.session.rollback()
+        return 0
+
+    _job(monkeypatch, slow_chunk)
+    with app.app_context():
+        assert job_scheduler.run_job('probe', '2026-01-01')['status'] == 'done'
+    assert seen['moved']
+
+
+def test_run_taken_over_mid_chunk_leaves_the_row_to_the_new_owner(app, monkeypatch):
+    from mentee import db
+    from mentee.models import JobChunk, JobRun
+    from mentee.services.job_scheduler import job_scheduler
+
+    def chunk_outlived_by_takeover(chunk, size, run_date):
+        with app.app_context():
+            db.session.execute(JobRun.__table__.update().values(owner='other-host:1'))
+            db.session.commit()
+        return 5
+
+    _job(monkeypatch, chunk_outlived_by_takeover)
+    with app.app_context():
+        assert job_scheduler.run_job('probe', '2026-01-01')['status'] == 'taken_over'
+        run = JobRun.query.filter_by(job='probe').one()
+        assert (run.owner, run.status) == ('other-host:1', 'running')
+        assert JobChunk.query.count() == 0
@@ -0,0 +1,82 @@
+import json
+import pytest
+from mentee.models import JournalEntry
+
+
+def _ndjson(client, *records):
+    body = "\n".join(r if isinstance(r, str) else json.dumps(r) for r in records)
+    return client.post('/dashboard/api/journal/import?format=ndjson', data=body,
+                       content_type='application/x-ndjson')
+
+
+@pytest.mark.parametrize('bad', [
+    {"date": 20260102},
+    {"date": "2026-01-02", "micro_win": 5},
+    {"date": "2026-01-02", "reflection": ["a", "b"]},
+    {"date": "2026-01-02", "brain_dump_mode": {"on": True}},
+    {"date": "2026-01-02", "mood": ["calm"]},
+    {"date": "2026-01-02", "score": True},
+    {"date": "2026-01-02", "score": 7.5},
+])
+def test_non_string_fields_are_row_errors(client, app, bad):
+    response = _ndjson(client, {"date": "2026-01-01", "score": 6, "micro_win": "ok"}, bad)
+
+    assert response.status_code == 200
+    report = response.get_json()["report"]
+    assert report["rows_written"] == 1
+    assert report["error_count"] == 1
+    assert report["errors"][0]["line"] == 2
+    with app.app_context():
+        assert [e.date for e in JournalEntry.query.all()] == ["2026-01-01"]
+
+
+def test_valid_types_still_accepted(client, app):
+    response = _ndjson(client,
+                       {"date": "2026-01-01", "score": "7", "brain_dump_mode": "yes"},
+                       {"date": "2026-01-02", "score": 8.0, "brain_dump_mode": 1, "micro_win": None})
+
+    report = response.get_json()["report"]
+    assert report["error_count"] == 0 and report["rows_written"] == 2
+    with app.app_context():
+        entry = JournalEntry.query.filter_by(date="2026-01-02").one()
+        assert entry.performance_score == 8
+        assert entry.content == {"micro_win": "", "reflection": "", "brain_dump_mode": True}
+
+
+def test_unpadded_dates_are_stored_zero_padded(client, app):
+    report = _ndjson(client, {"date": "2026-1-5", "score": 4}, {"date": "2026-01-05", "score": 6}).get_json()["report"]
+
+    assert report["error_count"] == 0
+    with app.app_context():
+        assert [(e.date, e.performance_score) for e in JournalEntry.query.all()] == [("2026-01-05", 6)]
+
+
+def test_unpadded_dates_are_normalized_on_save(client, app):
+    assert client.post('/dashboard/api/journal', json={'date': '2026-1-5', 'score': 4}).status_code == 200
+    assert client.patch('/dashboard/api/journal/2026-1-5', json={'score': 5}).status_code == 400
+    with app.app_context():
+        assert [e.date for e in JournalEntry.query.all()] == ["2026-01-05"]
+
+
+def test_stream_failure_keeps_written_chunks_and_rebuilds_rollup(client, app):
+    from mentee.models import PerformanceRollup
+    from mentee.services.journal_import import ImportEngine
+
+    # Past the decoder's first buffer, so some chunks are committed before the bad bytes
+    good = "".join(json.dumps({"date": f"2026-01-{d:02d}", "score": 5, "micro_win": "x" * 500}) + "\n"
+                   for d in range(1, 29))
+    body = good.encode() + b'{"date": "2026-02-01", "micro_win": "\xff\xfe"}\n'
+    ImportEngine.CHUNK_SIZE, chunk = 2, ImportEngine.CHUNK_SIZE
+    try:
+        response = client.post('/dashboard/api/journal/import?format=ndjson', data=body,
+                               content_type='application/x-ndjson')
+    finally:
+        ImportEngine.CHUNK_SIZE = chunk
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "partial" and body["report"]["stream_error"] is not None
+    with app.app_context():
+        written = body["report"]["rows_written"]
+        assert 0 < written < 28 and JournalEntry.query.count() == written
+        assert PerformanceRollup.query.one().count == written
@@ -0,0 +1,147 @@
+from mentee import db
+from mentee.models import JournalDraft, JournalEntry
+from mentee.services.autosave_queue import AutosaveCoalescer, autosave_queue
+from tests.conftest import login
+
+DAY = '2026-03-02'
+URL = f'/dashboard/api/journal/{DAY}'
+
+
+def _create(client):
+    res = client.post('/dashboard/api/journal', json={'date': DAY, 'mood': 'calm', 'score': 5,
+                                                       'micro_win': 'w', 'reflection': 'r'})
+    assert res.status_code == 200
+    return res.get_json()['data']['version']
+
+
+def _autosave(client, body, version):
+    return client.patch(f'{URL}?autosave=1', json=body, headers={'If-Match': f'"{version}"'})
+
+
+def _row(app):
+    with app.app_context():
+        return JournalEntry.query.filter_by(date=DAY).one()
+
+
+def test_autosave_returns_the_version_it_will_write(app, client):
+    v1 = _create(client)
+    res = _autosave(client, {'score': 7}, v1)
+    assert res.status_code == 202
+    assert res.get_json()['version'] == v1 + 1
+    assert res.headers['ETag'] == f'"{v1 + 1}"'
+
+    # The same client keeps editing against the promised version, before and after the flush
+    assert _autosave(client, {'score': 8}, v1 + 1).status_code == 202
+    autosave_queue.flush(force=True)
+    row = _row(app)
+    assert (row.version, row.performance_score) == (v1 + 1, 8)
+    assert client.patch(URL, json={'mood': 'fire'}, headers={'If-Match': f'"{v1 + 1}"'}).status_code == 200
+
+
+def test_stale_if_match_after_flush_is_rejected(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'reflection': 'tab A'}, v1).status_code == 202
+    autosave_queue.flush(force=True)
+
+    # Tab B still holds version 1: the row moved to 2 under it
+    res = client.patch(URL, json={'reflection': 'tab B'}, headers={'If-Match': f'"{v1}"'})
+    assert res.status_code == 409
+    assert res.get_json()['current']['content']['reflection'] == 'tab A'
+    assert _row(app).content['reflection'] == 'tab A'
+
+
+def test_stale_if_match_before_flush_sees_the_pending_edit(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'reflection': 'tab A'}, v1).status_code == 202
+
+    res = _autosave(client, {'reflection': 'tab B'}, v1)
+    assert res.status_code == 409
+    current = res.get_json()['current']
+    assert (current['version'], current['content']['reflection']) == (v1 + 1, 'tab A')
+    assert client.get(URL).headers['ETag'] == f'"{v1 + 1}"'
+
+
+def test_flush_conflict_is_reported_on_next_patch(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'reflection': 'mine'}, v1).status_code == 202
+
+    # Another writer (e.g. an import upsert) moves the row before the flush
+    with app.app_context():
+        db.session.execute(JournalEntry.__table__.update().values(
+            version=JournalEntry.__table__.c.version + 1, content={'reflection': 'theirs'}))
+        db.session.commit()
+    autosave_queue.flush(force=True)
+    with app.app_context():
+        assert JournalDraft.query.one().conflict
+
+    res = _autosave(client, {'score': 9}, v1 + 1)
+    assert res.status_code == 409
+    assert res.get_json()['current']['content']['reflection'] == 'theirs'
+    with app.app_context():
+        assert JournalDraft.query.count() == 0
+    # Reported once: the client retries on the version the 409 handed it
+    assert _autosave(client, {'score': 9}, res.get_json()['current']['version']).status_code == 202
+
+
+def test_any_worker_can_flush_a_draft(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'score': 3}, v1).status_code == 202
+
+    other_worker = AutosaveCoalescer()
+    other_worker.app = app
+    assert other_worker.flush(force=True) == 1
+    assert _row(app).performance_score == 3
+
+
+def test_explicit_save_folds_in_the_draft(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'micro_win': 'drafted'}, v1).status_code == 202
+
+    res = client.patch(URL, json={'score': 6}, headers={'If-Match': f'"{v1 + 1}"'})
+    assert res.status_code == 200
+    data = res.get_json()['data']
+    assert (data['version'], data['score'], data['content']['micro_win']) == (v1 + 1, 6, 'drafted')
+
+
+def test_autosave_creates_missing_entry(app, client):
+    res = client.patch(f'{URL}?autosave=1', json={'mood': 'happy'})
+    assert res.status_code == 202
+    assert client.get(URL).get_json()['data']['mood'] == 'happy'
+    autosave_queue.flush(force=True)
+    assert _row(app).version == res.get_json()['version'] == 1
+
+
+def test_drafts_are_per_user(app, client):
+    v1 = _create(client)
+    other = login(app, email='b@b.c', name='B')
+    assert _autosave(client, {'score': 2}, v1).status_code == 202
+    assert other.get(URL).get_json() == {'exists': False}
+
+
+def test_draft_that_nets_out_still_writes_the_promised_version(app, client):
+    v1 = _create(client)
+    assert _autosave(client, {'score': 6}, v1).status_code == 202
+    res = _autosave(client, {'score': 5}, v1 + 1)
+    assert res.get_json()['version'] == v1 + 1
+    autosave_queue.flush(force=True)
+
+    row = _row(app)
+    assert (row.version, row.performance_score) == (v1 + 1, 5)
+    assert client.patch(URL, json={'mood': 'fire'}, headers={'If-Match': f'"{v1 + 1}"'}).status_code == 200
+
+
+def test_processes_that_never_autosave_skip_the_exit_flush(tmp_path):
+    """init_db.py, job runners and benchmarks build an app too; their exit must not touch journal_drafts."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    script = (
+        "import config\n"
+        "from mentee import create_app\n"
+        "class C(config.Config):\n"
+        f"    SQLALCHEMY_DATABASE_URI = 'sqlite:///{tmp_path / 'empty.db'}'\n"
+        "create_app(C)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], cwd=Path(__file__).parents[1],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0 and 'Traceback' not in result.stderr, result.stderr
@@ -0,0 +1,34 @@
+from sqlalchemy import text
+from mentee import db
+from mentee.services.journal_search import _TRIGGERS, JournalSearchEngine
+
+
+def _save(client, micro_win):
+    res = client.post('/dashboard/api/journal', json={'date': '2026-03-02', 'mood': 'calm', 'score': 5,
+                                                       'micro_win': micro_win, 'reflection': ''})
+    assert res.status_code == 200
+
+
+def test_search_finds_saved_entries(client):
+    _save(client, 'Nailed the backhand')
+    res = client.get('/dashboard/api/journal/search?q=backhand')
+    assert res.status_code == 200
+    assert res.get_json()['total'] == 1
+
+
+def test_missing_fts_index_is_reported_not_raised(app, client):
+    """A database whose upgrade never created journal_fts (e.g. SQLite without FTS5)."""
+    with app.app_context():
+        with db.engine.begin() as conn:
+            for name in _TRIGGERS:
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            conn.execute(text("DROP TABLE journal_fts"))
+        JournalSearchEngine._installed.clear()
+    try:
+        _save(client, 'Nailed the backhand')
+        assert client.get('/dashboard/api/journal/search?q=backhand').status_code == 501
+    finally:
+        with app.app_context():
+            with db.engine.begin() as conn:
+                JournalSearchEngine.install(conn)
+    assert client.get('/dashboard/api/journal/search?q=backhand').get_json()['total'] == 1
@@ -0,0 +1,61 @@
+from sqlalchemy import insert
+from mentee import db
+from mentee.models import DrillPersonalBest, User
+from mentee.services.drill_queue import drill_queue
+from mentee.services.leaderboard_engine import LeaderboardEngine
+from mentee.services.schema_engine import SchemaEngine
+from tests.conftest import login
+
+
+def _save(client, score, drill='reaction'):
+    return client.post('/dashboard/api/drills/save', json={'drill_id': drill, 'score': score})
+
+
+def test_leaderboard_limit_has_a_floor(app, client):
+    for i in range(3):
+        _save(login(app, f'p{i}@x.y', f'P{i}'), 10 + i)
+
+    leaders = client.get('/dashboard/api/drills/reaction/leaderboard?limit=-1').get_json()['leaders']
+    assert [row['score'] for row in leaders] == [12]
+
+
+def test_concurrent_first_personal_best_is_folded_in(app, client, monkeypatch):
+    """
+    Another request inserts the (user, drill) row between our check and our insert.
+    SQLite serializes writers, so the competing row is written on our own connection
+    (what a Postgres READ COMMITTED transaction would see after the other commit).
+    """
+    original = LeaderboardEngine._insert_bests
+
+    def racing_insert(rows):
+        db.session.execute(insert(DrillPersonalBest.__table__), [
+            {"user_id": r.user_id, "drill_id": r.drill_id, "best_score": 50, "sessions": 1} for r in rows])
+        return original(rows)
+
+    monkeypatch.setattr(LeaderboardEngine, '_insert_bests', staticmethod(racing_insert))
+    response = _save(client, 40)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['best_score'] == 50 and body['is_personal_best'] is False
+    with app.app_context():
+        user_id = User.query.filter_by(email='a@b.c').one().id
+        pb = db.session.get(DrillPersonalBest, (user_id, 'reaction'))
+        assert (pb.best_score, pb.sessions) == (50, 2)
+
+
+def test_upgrade_seeds_missing_personal_bests_from_sessions(app, client):
+    for score in (30, 70, 50):
+        assert _save(client, score).status_code == 200
+    drill_queue.flush()
+    with app.app_context():
+        DrillPersonalBest.query.delete()
+        db.session.commit()
+        assert 'backfill drill_personal_bests (1 rows)' in SchemaEngine.upgrade()
+
+    body = _save(client, 60).get_json()
+    assert body['best_score'] == 70 and body['is_personal_best'] is False
+    drill_queue.flush()
+    with app.app_context():
+        pb = DrillPersonalBest.query.one()
+        assert (pb.best_score, pb.sessions) == (70, 4)
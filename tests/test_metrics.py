@@ -0,0 +1,13 @@
+def test_metrics_are_off_without_a_token(app):
+    assert app.config['METRICS_TOKEN'] is None
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_metrics_require_the_bearer_token(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'scrape')
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer nope'}).status_code == 403
+
+    res = client.get('/metrics', headers={'Authorization': 'Bearer scrape'})
+    assert res.status_code == 200 and b'# TYPE' in res.data
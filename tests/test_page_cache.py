@@ -0,0 +1,37 @@
+from flask import session
+import mentee.blueprints.main as main
+from mentee.services.page_cache import page_cache
+
+
+def test_anonymous_page_is_cached(app):
+    page_cache.clear()
+    client = app.test_client()
+    hits = page_cache.counters["hits"]
+    assert client.get('/').status_code == 200
+    assert client.get('/').status_code == 200
+    assert page_cache.counters["hits"] == hits + 1
+
+
+def test_render_that_writes_the_session_is_not_cached(app, monkeypatch):
+    def render_and_remember(template):
+        session['seen_intro'] = True
+        return 'per-visitor body'
+
+    monkeypatch.setattr(main, 'render_template', render_and_remember)
+    page_cache.clear()
+    client = app.test_client()
+    misses = page_cache.counters["misses"]
+    client.get('/philosophy')
+    client.get('/philosophy')
+    assert page_cache.counters["misses"] == misses + 2
+    assert page_cache.stats()["entries"] == 0
+
+
+def test_pending_flashes_bypass_the_cache(app):
+    page_cache.clear()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['_flashes'] = [('message', 'Logged out')]
+    bypassed = page_cache.counters["bypassed"]
+    client.get('/')
+    assert page_cache.counters["bypassed"] == bypassed + 1
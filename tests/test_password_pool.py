@@ -0,0 +1,27 @@
+import time
+import pytest
+from mentee.services.password_pool import HashPoolSaturated, password_hasher
+
+
+def test_timed_out_task_replaces_the_pool(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'HASH_POOL_TASK_TIMEOUT', 0.5)
+    password_hasher._run(abs, -1)            # warm the pool
+    stuck_pool = password_hasher._pool
+    replaced = password_hasher.counters["pools_replaced"]
+
+    with pytest.raises(HashPoolSaturated):
+        password_hasher._run(time.sleep, 30)
+
+    assert password_hasher.counters["pools_replaced"] == replaced + 1
+    assert password_hasher._pool is None
+    for process in (stuck_pool._processes or {}).values():
+        process.join(timeout=5)
+        assert not process.is_alive()
+    assert password_hasher._run(abs, -3) == 3
+    assert password_hasher.counters["in_flight"] == 0
+
+
+def test_hashes_round_trip_through_the_pool(app):
+    pwhash = password_hasher.generate('s3cret')
+    assert password_hasher.check(pwhash, 's3cret')
+    assert not password_hasher.check(pwhash, 'nope')
@@ -0,0 +1,92 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+from mentee import db
+from mentee.models import PerformanceRollup, User
+from mentee.services.autosave_queue import autosave_queue
+from mentee.services.rollup_engine import RollupEngine
+from mentee.services.schema_engine import SchemaEngine
+
+EMPTY = (0, 0.0, 0.0, [], 0, 0, None)
+
+
+def _state(user_id):
+    rollup = db.session.get(PerformanceRollup, user_id)
+    if rollup is None:
+        return EMPTY
+    return (rollup.count, rollup.mean, rollup.m2, rollup.recent_scores,
+            rollup.streak_length, rollup.longest_streak, rollup.last_entry_date)
+
+
+def _assert_matches_rebuild(app, step):
+    with app.app_context():
+        user_id = User.query.filter_by(email='a@b.c').one().id
+        incremental = _state(user_id)
+        RollupEngine.rebuild(user_id)
+        db.session.expire_all()
+        rebuilt = _state(user_id)
+    if incremental[0] == 0 and rebuilt == EMPTY:
+        incremental = (0, 0.0, 0.0) + incremental[3:]
+    count, mean, m2, *rest = incremental
+    assert (count, *rest) == (rebuilt[0], *rebuilt[3:]), step
+    assert mean == pytest.approx(rebuilt[1]) and m2 == pytest.approx(rebuilt[2], abs=1e-6), step
+
+
+@pytest.mark.parametrize('seed', [3, 7, 11])
+def test_incremental_rollup_matches_rebuild(app, client, seed):
+    """Random saves, patches, autosaves and deletes around today keep the rollup equal to a rebuild."""
+    rng = random.Random(seed)
+    today = datetime.utcnow().date()
+    live = set()
+    for step in range(150):
+        day = (today - timedelta(days=rng.randint(0, 18))).isoformat()
+        op = rng.random()
+        if day in live and op < 0.3:
+            assert client.delete(f'/dashboard/api/journal/{day}').status_code == 200
+            live.discard(day)
+        else:
+            score = rng.choice([None] + list(range(1, 11)))
+            if op < 0.55:
+                res = client.post('/dashboard/api/journal', json={'date': day, 'mood': 'calm', 'score': score})
+            elif op < 0.8:
+                res = client.patch(f'/dashboard/api/journal/{day}', json={'score': score})
+            else:
+                res = client.patch(f'/dashboard/api/journal/{day}?autosave=1', json={'score': score})
+                autosave_queue.flush(force=True)
+            assert res.status_code in (200, 202), (step, res.get_json())
+            live.add(day)
+        _assert_matches_rebuild(app, step)
+
+    # Deleting everything leaves nothing a rebuild would disagree with
+    for day in sorted(live):
+        assert client.delete(f'/dashboard/api/journal/{day}').status_code == 200
+    _assert_matches_rebuild(app, 'emptied')
+
+
+def test_upgrade_seeds_missing_rollups_from_history(app, client):
+    """A database from before rollups: the first save must fold into the user's history, not zero."""
+    today = datetime.utcnow().date()
+    for back, score in ((2, 4), (1, 8)):
+        day = (today - timedelta(days=back)).isoformat()
+        assert client.post('/dashboard/api/journal', json={'date': day, 'score': score}).status_code == 200
+    with app.app_context():
+        PerformanceRollup.query.delete()
+        db.session.commit()
+        assert any('performance_rollups (1 users)' in action for action in SchemaEngine.upgrade())
+
+    res = client.post('/dashboard/api/journal', json={'date': today.isoformat(), 'score': 6})
+    assert res.get_json()['streak']['current'] == 3
+    with app.app_context():
+        rollup = PerformanceRollup.query.one()
+        assert (rollup.count, rollup.mean, rollup.longest_streak) == (3, 6.0, 3)
+    _assert_matches_rebuild(app, 'seeded')
+
+
+def test_future_dated_entries_never_make_a_streak_live(app, client):
+    future = datetime.utcnow().date() + timedelta(days=3)
+    for back in range(4):
+        day = (future - timedelta(days=back)).isoformat()
+        assert client.post('/dashboard/api/journal', json={'date': day, 'score': 5}).status_code == 200
+
+    assert client.get('/dashboard/api/streaks').get_json()['current'] == 0
+    assert client.get('/dashboard/api/streaks/leaderboard').get_json()['leaders'] == []
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from mentee import db
+from mentee.models import JournalEntry
+
+SYNC = '/dashboard/api/sync'
+
+
+def _save(client, day):
+    assert client.post('/dashboard/api/journal', json={'date': day, 'score': 5}).status_code == 200
+
+
+def _stamp(app, day, seconds_ago):
+    with app.app_context():
+        db.session.execute(JournalEntry.__table__.update().where(JournalEntry.date == day)
+                           .values(updated_at=datetime.utcnow() - timedelta(seconds=seconds_ago)))
+        db.session.commit()
+
+
+def _dates(page):
+    return sorted(e['date'] for e in page['journal'])
+
+
+def test_save_committing_behind_an_issued_cursor_is_still_synced(app, client):
+    _save(client, '2026-01-01')
+    cursor = client.get(SYNC).get_json()['cursor']
+
+    # Stamped before the cursor was issued, committed after it (waited on the write lock)
+    _save(client, '2026-01-02')
+    _stamp(app, '2026-01-02', 8)
+
+    assert '2026-01-02' in _dates(client.get(f'{SYNC}?cursor={cursor}').get_json())
+
+
+def test_pages_reaching_the_hold_window_end_the_pass(app, client):
+    for day in ('2026-01-01', '2026-01-02', '2026-01-03'):
+        _save(client, day)
+
+    first = client.get(f'{SYNC}?limit=2').get_json()
+    assert len(first['journal']) == 2 and first['has_more'] is False
+    # The held cursor serves the whole recent window again, including the row past the page
+    again = client.get(f"{SYNC}?cursor={first['cursor']}").get_json()
+    assert _dates(again) == ['2026-01-01', '2026-01-02', '2026-01-03']
+
+
+def test_settled_rows_page_normally(app, client):
+    for i, day in enumerate(('2026-01-01', '2026-01-02', '2026-01-03')):
+        _save(client, day)
+        _stamp(app, day, 3600 - i)
+
+    first = client.get(f'{SYNC}?limit=2').get_json()
+    assert first['has_more'] is True and _dates(first) == ['2026-01-01', '2026-01-02']
+    second = client.get(f"{SYNC}?cursor={first['cursor']}&limit=2").get_json()
+    assert _dates(second) == ['2026-01-03'] and second['has_more'] is False
@@ -0,0 +1,59 @@
+import threading
+from mentee import db
+from mentee.models import User
+from mentee.services.user_cache import user_cache
+
+
+def _get_in_other_request(app, user_id):
+    """Loads through the cache from another thread (its own session and connection)."""
+    seen = {}
+
+    def load():
+        with app.app_context():
+            seen['name'] = user_cache.get(user_id).name
+            db.session.remove()
+
+    thread = threading.Thread(target=load)
+    thread.start()
+    thread.join()
+    return seen['name']
+
+
+def test_cache_repopulated_before_commit_is_invalidated_on_commit(app, client):
+    with app.app_context():
+        user = User.query.filter_by(email='a@b.c').one()
+        user.name = 'Renamed'
+        db.session.flush()                         # after_update fires here, before commit
+        assert _get_in_other_request(app, user.id) == 'A'   # re-caches the committed (old) row
+        db.session.commit()
+        assert user_cache.get(user.id).name == 'Renamed'
+
+
+def test_rolled_back_write_is_not_served(app, client):
+    with app.app_context():
+        user = User.query.filter_by(email='a@b.c').one()
+        user.name = 'Uncommitted'
+        db.session.flush()
+        assert user_cache.get(user.id).name == 'Uncommitted'   # same transaction sees its own write
+        db.session.rollback()
+        assert user_cache.get(user.id).name == 'A'
+
+
+def test_load_overtaken_by_invalidation_is_not_cached(app, client, monkeypatch):
+    import mentee.services.user_cache as module
+    snapshot_of = module.UserSnapshot
+
+    def invalidated_mid_load(user):
+        user_cache.invalidate(user.id)         # a commit lands after our SELECT, before our put
+        return snapshot_of(user)
+
+    with app.app_context():
+        user_id = User.query.filter_by(email='a@b.c').one().id
+        user_cache.clear()
+        monkeypatch.setattr(module, 'UserSnapshot', invalidated_mid_load)
+        assert user_cache.get(user_id).name == 'A'
+        assert user_id not in user_cache._entries
+
+        monkeypatch.setattr(module, 'UserSnapshot', snapshot_of)
+        user_cache.get(user_id)
+        assert user_id in user_cache._entries